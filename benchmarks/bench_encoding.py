@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Benchmark tool response encoding on a large search_logs result.
+
+Compares the previous json.dumps(result, indent=2) output with the compact
+ResponseEncoder backends on a synthetic 1000-message Graylog response, and
+with the result slimmed to the requested fields.
+
+Usage:
+    python benchmarks/bench_encoding.py [--messages 1000] [--repeat 20]
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+import uuid
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from mcp_graylog import encoding
+from mcp_graylog.encoding import ResponseEncoder
+from mcp_graylog.shaping import slim_search_result
+
+
+def make_search_result(count: int) -> dict:
+    """Build a synthetic /api/search/universal/relative response."""
+    messages = []
+    for i in range(count):
+        messages.append(
+            {
+                "highlight_ranges": {},
+                "index": "graylog_42",
+                "decoration_stats": None,
+                "message": {
+                    "_id": str(uuid.uuid4()),
+                    "timestamp": f"2024-01-01T12:{i % 60:02d}:00.000Z",
+                    "source": f"web-{i % 12:02d}",
+                    "level": 3,
+                    "facility": "nginx",
+                    "streams": ["5abb3f2f7bb9fd00011595fe"],
+                    "gl2_message_id": uuid.uuid4().hex.upper(),
+                    "message": (
+                        f"GET /api/v1/orders/{i} 502 upstream timed out "
+                        f"request_id={uuid.uuid4()} client=10.0.{i % 255}.{i % 7}"
+                    ),
+                },
+            }
+        )
+    return {
+        "query": "level:ERROR",
+        "built_query": "{}",
+        "used_indices": [],
+        "messages": messages,
+        "fields": ["timestamp", "source", "level", "message"],
+        "time": 42,
+        "total_results": count,
+        "from": "2024-01-01T11:00:00.000Z",
+        "to": "2024-01-01T12:00:00.000Z",
+    }
+
+
+def bench(name: str, func, result: dict, repeat: int) -> None:
+    """Time func(result) and print size and per-call latency."""
+    output = func(result)
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func(result)
+    elapsed = (time.perf_counter() - start) / repeat
+    print(
+        f"{name:<28} {len(output.encode('utf-8')):>12,} bytes {elapsed * 1000:>9.2f} ms"
+    )
+
+
+def main() -> int:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--messages", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    result = make_search_result(args.messages)
+    print(f"search_logs result with {args.messages} messages, {args.repeat} runs\n")
+
+    bench(
+        "json.dumps(indent=2)", lambda r: json.dumps(r, indent=2), result, args.repeat
+    )
+    backends = ["json"]
+    if encoding.msgspec is not None:
+        backends.append("msgspec")
+    if encoding.orjson is not None:
+        backends.append("orjson")
+    for backend in backends:
+        encoder = ResponseEncoder(backend=backend)
+        bench(f"{backend} compact", encoder.encode, result, args.repeat)
+
+    fields = ["timestamp", "level", "message"]
+    encoder = ResponseEncoder()
+    bench(
+        f"{encoder.backend} compact + slim",
+        lambda r: encoder.encode(slim_search_result(r, fields, 120)),
+        result,
+        args.repeat,
+    )
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
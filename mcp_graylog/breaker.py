@@ -0,0 +1,229 @@
+"""Circuit breakers that fast-fail calls to an unhealthy Graylog backend."""
+
+import logging
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Tuple
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+# Responses counted as backend failures (overload or server error)
+FAILURE_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+# Endpoint classes with independent breakers, by API path prefix
+ENDPOINT_CLASSES = (
+    ("/api/search", "search"),
+    ("/api/views", "search"),
+    ("/api/streams", "streams"),
+)
+
+
+def endpoint_class(endpoint: str) -> str:
+    """
+    Get the breaker class of a Graylog API endpoint.
+
+    Args:
+        endpoint: API path such as "/api/search/universal/relative"
+
+    Returns:
+        "search", "streams" or "system"
+    """
+    for prefix, name in ENDPOINT_CLASSES:
+        if endpoint.startswith(prefix):
+            return name
+    return "system"
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling Graylog while a circuit breaker is open."""
+
+    def __init__(self, name: str, retry_in: float):
+        self.name = name
+        self.retry_in = retry_in
+        super().__init__(
+            f"Graylog {name} endpoints are failing or too slow; "
+            f"not sending requests for {retry_in:.0f}s (circuit breaker open)"
+        )
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker over a sliding window of recent calls.
+
+    The breaker opens once at least min_calls of the last window calls were
+    recorded and either the failure rate reaches failure_rate or the rate
+    of calls slower than slow_call_seconds reaches slow_call_rate. While
+    open, calls fail immediately. After open_seconds it lets up to
+    half_open_probes calls through; if they all succeed it closes again,
+    otherwise it reopens.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_rate: float = 0.5,
+        slow_call_seconds: float = 20.0,
+        slow_call_rate: float = 0.5,
+        window: int = 20,
+        min_calls: int = 10,
+        open_seconds: float = 30.0,
+        half_open_probes: int = 2,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.name = name
+        self.failure_rate = failure_rate
+        self.slow_call_seconds = slow_call_seconds
+        self.slow_call_rate = slow_call_rate
+        self.min_calls = max(1, min_calls)
+        self.open_seconds = open_seconds
+        self.half_open_probes = max(1, half_open_probes)
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._outcomes: Deque[Tuple[bool, bool]] = deque(maxlen=max(1, window))
+        self._state = CLOSED
+        self._opened_at = 0.0
+        self._probes_started = 0
+        self._probes_succeeded = 0
+        self.times_opened = 0
+        self.rejected = 0
+
+    @property
+    def state(self) -> str:
+        """Current state, moving from open to half-open once the wait is over."""
+        with self._lock:
+            self._advance()
+            return self._state
+
+    def _advance(self) -> None:
+        """Move from open to half-open when due. Caller must hold the lock."""
+        if self._state == OPEN and self._clock() - self._opened_at >= self.open_seconds:
+            self._state = HALF_OPEN
+            self._probes_started = 0
+            self._probes_succeeded = 0
+            logger.info(f"Circuit breaker {self.name} half-open, probing Graylog")
+
+    def _open(self) -> None:
+        """Open the breaker. Caller must hold the lock."""
+        self._state = OPEN
+        self._opened_at = self._clock()
+        self._outcomes.clear()
+        self.times_opened += 1
+        logger.warning(
+            f"Circuit breaker {self.name} opened for {self.open_seconds:.0f}s"
+        )
+
+    def before_call(self) -> None:
+        """
+        Ask permission to call Graylog.
+
+        Raises:
+            CircuitOpenError: If the breaker is open, or half-open with all
+                probes already in flight
+        """
+        with self._lock:
+            self._advance()
+            if self._state == CLOSED:
+                return
+            if (
+                self._state == HALF_OPEN
+                and self._probes_started < self.half_open_probes
+            ):
+                self._probes_started += 1
+                return
+            self.rejected += 1
+            if self._state == OPEN:
+                retry_in = self.open_seconds - (self._clock() - self._opened_at)
+            else:
+                retry_in = 0.0
+            raise CircuitOpenError(self.name, max(0.0, retry_in))
+
+    def release(self) -> None:
+        """Give back a permission from before_call that did not lead to a call."""
+        with self._lock:
+            if (
+                self._state == HALF_OPEN
+                and self._probes_started > self._probes_succeeded
+            ):
+                self._probes_started -= 1
+
+    def record(self, success: bool, duration: float) -> None:
+        """
+        Record the outcome of a call permitted by before_call.
+
+        Args:
+            success: False if Graylog failed (connection error, timeout, 5xx)
+            duration: Call duration in seconds
+        """
+        slow = duration >= self.slow_call_seconds
+        with self._lock:
+            if self._state == HALF_OPEN:
+                if not success or slow:
+                    self._open()
+                    return
+                self._probes_succeeded += 1
+                if self._probes_succeeded >= self.half_open_probes:
+                    self._state = CLOSED
+                    self._outcomes.clear()
+                    logger.info(f"Circuit breaker {self.name} closed")
+                return
+            if self._state == OPEN:
+                return
+
+            self._outcomes.append((not success, slow))
+            calls = len(self._outcomes)
+            if calls < self.min_calls:
+                return
+            failures = sum(1 for failed, _ in self._outcomes if failed)
+            slow_calls = sum(1 for _, was_slow in self._outcomes if was_slow)
+            if (
+                failures / calls >= self.failure_rate
+                or slow_calls / calls >= self.slow_call_rate
+            ):
+                self._open()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return state and counters."""
+        with self._lock:
+            self._advance()
+            calls = len(self._outcomes)
+            failures = sum(1 for failed, _ in self._outcomes if failed)
+            slow_calls = sum(1 for _, slow in self._outcomes if slow)
+            return {
+                "state": self._state,
+                "window_calls": calls,
+                "failure_rate": round(failures / calls, 4) if calls else 0.0,
+                "slow_call_rate": round(slow_calls / calls, 4) if calls else 0.0,
+                "times_opened": self.times_opened,
+                "rejected": self.rejected,
+            }
+
+
+class CircuitBreakers:
+    """One CircuitBreaker per endpoint class, created with shared settings."""
+
+    def __init__(self, enabled: bool = True, **settings: Any):
+        self.enabled = enabled
+        self._settings = settings
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    def for_endpoint(self, endpoint: str) -> CircuitBreaker:
+        """Get the breaker guarding an API endpoint."""
+        name = endpoint_class(endpoint)
+        with self._lock:
+            breaker = self._breakers.get(name)
+            if breaker is None:
+                breaker = CircuitBreaker(name, **self._settings)
+                self._breakers[name] = breaker
+            return breaker
+
+    def stats(self) -> Dict[str, Any]:
+        """Return the stats of every breaker used so far, by endpoint class."""
+        with self._lock:
+            breakers = dict(self._breakers)
+        return {name: breaker.stats() for name, breaker in sorted(breakers.items())}
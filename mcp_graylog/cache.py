@@ -0,0 +1,657 @@
+"""Response caching and request coalescing for Graylog API calls."""
+
+import abc
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import struct
+import tempfile
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from concurrent.futures import Future
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import Any, Callable, Dict, List, Optional, Tuple, TypeVar
+
+from .deadline import DeadlineExceeded, time_remaining
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - optional dependency
+    zstandard = None  # type: ignore[assignment]
+
+try:
+    import lz4.frame as lz4_frame
+except ImportError:  # pragma: no cover - optional dependency
+    lz4_frame = None  # type: ignore[assignment]
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+CACHE_BACKENDS = ("memory", "sqlite", "disk")
+COMPRESSIONS = ("auto", "zstd", "lz4", "zlib", "none")
+
+
+def make_cache_key(
+    method: str,
+    endpoint: str,
+    params: Optional[Dict[str, Any]] = None,
+    data: Optional[Dict[str, Any]] = None,
+    bucket_seconds: int = 0,
+    now: Optional[float] = None,
+) -> str:
+    """
+    Build a normalized cache key for a Graylog request.
+
+    Args:
+        method: HTTP method
+        endpoint: API endpoint path
+        params: Query string parameters
+        data: JSON request body
+        bucket_seconds: Alignment bucket for relative time ranges (0 disables)
+        now: Current wall-clock time, defaults to time.time()
+
+    Returns:
+        Deterministic key string. Requests with a relative range (integer
+        "range" in seconds) also carry the current time bucket, so identical
+        relative queries issued within the same bucket share one entry.
+    """
+    payload: Dict[str, Any] = {}
+    for part_name, part in (("params", params), ("data", data)):
+        if not part:
+            continue
+        normalized = {k: v for k, v in part.items() if v is not None}
+        fields = normalized.get("fields")
+        if isinstance(fields, str):
+            normalized["fields"] = ",".join(sorted(fields.split(",")))
+        payload[part_name] = normalized
+
+    bucket = None
+    relative = any(isinstance(part.get("range"), int) for part in payload.values())
+    if relative and bucket_seconds > 0:
+        current = time.time() if now is None else now
+        bucket = int(current // bucket_seconds)
+
+    return json.dumps(
+        [method.upper(), endpoint, payload, bucket],
+        sort_keys=True,
+        separators=(",", ":"),
+        default=str,
+    )
+
+
+def _serialize(value: Any) -> bytes:
+    """Encode a response for a cache shared outside this process."""
+    return json.dumps(value, separators=(",", ":"), default=str).encode("utf-8")
+
+
+def _deserialize(data: bytes) -> Any:
+    """Decode a response written by _serialize."""
+    return json.loads(data.decode("utf-8"))
+
+
+class CacheBackend(abc.ABC):
+    """
+    Storage for cached responses.
+
+    Backends store values with an absolute expiry time and evict entries to
+    stay within their size bound. Expiry and eviction bookkeeping is their
+    own; hit and miss counters live in ResponseCache.
+    """
+
+    name = "base"
+
+    @abc.abstractmethod
+    def get(self, key: str) -> Optional[Any]:
+        """Return the value for key, or None if missing or expired."""
+
+    @abc.abstractmethod
+    def set(self, key: str, value: Any, ttl: float) -> int:
+        """Store a value for ttl seconds and return the number of evictions."""
+
+    @abc.abstractmethod
+    def clear(self) -> None:
+        """Drop all entries."""
+
+    @abc.abstractmethod
+    def stats(self) -> Dict[str, Any]:
+        """Return the number of entries and backend-specific details."""
+
+    def close(self) -> None:
+        """Release files or connections held by the backend."""
+
+
+class MemoryBackend(CacheBackend):
+    """In-process LRU of response objects, private to each worker process."""
+
+    name = "memory"
+
+    def __init__(
+        self, max_entries: int = 256, clock: Callable[[], float] = time.monotonic
+    ):
+        self.max_entries = max_entries
+        self._clock = clock
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+
+            expires_at, value = entry
+            if expires_at <= self._clock():
+                del self._entries[key]
+                return None
+
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any, ttl: float) -> int:
+        evicted = 0
+        with self._lock:
+            self._entries[key] = (self._clock() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                evicted += 1
+        return evicted
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"size": len(self._entries)}
+
+
+class SQLiteBackend(CacheBackend):
+    """
+    LRU cache in a SQLite database shared by all worker processes on a node.
+
+    The database runs in WAL mode, so readers in one process are not blocked
+    by a writer in another. Values are stored as JSON and expiry uses wall
+    clock time, which every process agrees on. A read only writes its
+    use time back when the stored one is older than TOUCH_SECONDS, so the
+    LRU order is coarse but hits stay read-only.
+    """
+
+    name = "sqlite"
+
+    TOUCH_SECONDS = 60.0
+
+    def __init__(
+        self,
+        path: str,
+        max_entries: int = 256,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.path = path
+        self.max_entries = max_entries
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            path, timeout=5.0, isolation_level=None, check_same_thread=False
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, expires_at REAL NOT NULL, "
+            "used_at REAL NOT NULL, value BLOB NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS responses_used_at ON responses (used_at)"
+        )
+
+    def get(self, key: str) -> Optional[Any]:
+        now = self._clock()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT expires_at, value, used_at FROM responses WHERE key = ?",
+                (key,),
+            ).fetchone()
+            if row is None:
+                return None
+            if row[0] <= now:
+                self._conn.execute(
+                    "DELETE FROM responses WHERE key = ? AND expires_at <= ?",
+                    (key, now),
+                )
+                return None
+            if now - row[2] >= self.TOUCH_SECONDS:
+                self._conn.execute(
+                    "UPDATE responses SET used_at = ? WHERE key = ?", (now, key)
+                )
+        return _deserialize(row[1])
+
+    def set(self, key: str, value: Any, ttl: float) -> int:
+        now = self._clock()
+        data = _serialize(value)
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?)",
+                    (key, now + ttl, now, data),
+                )
+                self._conn.execute(
+                    "DELETE FROM responses WHERE expires_at <= ?", (now,)
+                )
+                evicted = self._conn.execute(
+                    "DELETE FROM responses WHERE key IN ("
+                    "SELECT key FROM responses ORDER BY used_at DESC "
+                    "LIMIT -1 OFFSET ?)",
+                    (self.max_entries,),
+                ).rowcount
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        return max(0, evicted)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            (size,) = self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()
+        return {"size": size, "path": self.path}
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+def _zlib_compress(data: bytes) -> bytes:
+    """Compress with zlib at a fast level."""
+    return zlib.compress(data, 1)
+
+
+def resolve_compression(
+    name: str,
+) -> Tuple[str, Callable[[bytes], bytes], Callable[[bytes], bytes]]:
+    """
+    Resolve a compression name to compress and decompress functions.
+
+    Args:
+        name: One of "auto", "zstd", "lz4", "zlib" or "none"
+
+    Returns:
+        Tuple of (resolved name, compress, decompress). "auto" picks zstd,
+        then lz4, then zlib; a requested codec that is not installed falls
+        back to zlib with a warning.
+    """
+    available: Dict[str, Tuple[Callable[[bytes], bytes], Callable[[bytes], bytes]]] = {}
+    if zstandard is not None:
+        available["zstd"] = (
+            zstandard.ZstdCompressor(level=3).compress,
+            zstandard.ZstdDecompressor().decompress,
+        )
+    if lz4_frame is not None:
+        available["lz4"] = (lz4_frame.compress, lz4_frame.decompress)
+    available["zlib"] = (_zlib_compress, zlib.decompress)
+    available["none"] = (bytes, bytes)
+
+    if name == "auto":
+        for candidate in ("zstd", "lz4", "zlib"):
+            if candidate in available:
+                return (candidate, *available[candidate])
+
+    if name not in COMPRESSIONS:
+        raise ValueError(f"Invalid cache compression: {name}. Valid: {COMPRESSIONS}")
+
+    if name not in available:
+        logger.warning(f"Cache compression {name} is not installed, using zlib")
+        name = "zlib"
+
+    return (name, *available[name])
+
+
+class DiskBackend(CacheBackend):
+    """
+    Compressed files on local disk for large result sets, bounded in bytes.
+
+    Each entry is one file named after the hash of its key, holding the codec,
+    the expiry time and the compressed JSON value. Files are written to a
+    temporary name and renamed into place, so processes sharing the
+    directory never read a partial entry. Reads refresh the file's mtime and
+    the least recently used files are removed once the directory exceeds
+    max_bytes. The size of the directory is tracked as entries are written
+    and removed; it is only scanned when that total passes max_bytes, or
+    every RESCAN_SECONDS to pick up entries written by other processes.
+    """
+
+    name = "disk"
+
+    # Entry header: codec name padded to 4 bytes, expiry as a double
+    HEADER = struct.Struct(">4sd")
+
+    RESCAN_SECONDS = 60.0
+
+    def __init__(
+        self,
+        directory: str,
+        max_bytes: int = 256 * 1024 * 1024,
+        compression: str = "auto",
+        clock: Callable[[], float] = time.time,
+    ):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.compression, self._compress, _ = resolve_compression(compression)
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._bytes = 0
+        self._scanned_at: Optional[float] = None
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        """Get the file of an entry."""
+        digest = hashlib.sha256(key.encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, f"{digest}.entry")
+
+    def get(self, key: str) -> Optional[Any]:
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+        except FileNotFoundError:
+            return None
+
+        codec, expires_at = self.HEADER.unpack_from(data)
+        if expires_at <= self._clock():
+            self._discard(path, len(data))
+            return None
+
+        name = codec.rstrip(b"\0").decode("ascii")
+        try:
+            _, _, decompress = resolve_compression(name)
+            value = _deserialize(decompress(data[self.HEADER.size :]))
+        except Exception as e:
+            logger.warning(f"Dropping unreadable cache entry {path}: {e}")
+            self._discard(path, len(data))
+            return None
+
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return value
+
+    def set(self, key: str, value: Any, ttl: float) -> int:
+        header = self.HEADER.pack(self.compression.encode("ascii"), self._clock() + ttl)
+        body = self._compress(_serialize(value))
+        path = self._path(key)
+        try:
+            replaced = os.stat(path).st_size
+        except FileNotFoundError:
+            replaced = 0
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(header)
+                f.write(body)
+            os.replace(tmp_path, path)
+        except BaseException:
+            self._remove(tmp_path)
+            raise
+
+        with self._lock:
+            self._bytes += len(header) + len(body) - replaced
+            due = (
+                self._scanned_at is None
+                or self._bytes > self.max_bytes
+                or self._clock() - self._scanned_at >= self.RESCAN_SECONDS
+            )
+        return self._evict() if due else 0
+
+    def _entries(self) -> List[Tuple[float, int, str]]:
+        """List (mtime, size, path) of the stored entries."""
+        entries = []
+        with os.scandir(self.directory) as it:
+            for entry in it:
+                if not entry.name.endswith(".entry"):
+                    continue
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+        return entries
+
+    def _evict(self) -> int:
+        """Rescan the directory and remove the oldest entries beyond max_bytes."""
+        entries = self._entries()
+        total = sum(size for _, size, _ in entries)
+        evicted = 0
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            if self._remove(path):
+                evicted += 1
+            total -= size
+        with self._lock:
+            self._bytes = total
+            self._scanned_at = self._clock()
+        return evicted
+
+    def _discard(self, path: str, size: int) -> None:
+        """Remove an entry file of a known size from the tracked total."""
+        if self._remove(path):
+            with self._lock:
+                self._bytes = max(0, self._bytes - size)
+
+    @staticmethod
+    def _remove(path: str) -> bool:
+        """Remove a file, returning False if it was already gone."""
+        try:
+            os.remove(path)
+            return True
+        except FileNotFoundError:
+            return False
+
+    def clear(self) -> None:
+        for _, _, path in self._entries():
+            self._remove(path)
+        with self._lock:
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        entries = self._entries()
+        return {
+            "size": len(entries),
+            "bytes": sum(size for _, size, _ in entries),
+            "max_bytes": self.max_bytes,
+            "compression": self.compression,
+            "path": self.directory,
+        }
+
+
+def make_cache_backend(
+    name: str,
+    max_entries: int = 256,
+    path: Optional[str] = None,
+    max_bytes: int = 256 * 1024 * 1024,
+    compression: str = "auto",
+) -> CacheBackend:
+    """
+    Create a cache backend by name.
+
+    Args:
+        name: One of "memory", "sqlite" or "disk"
+        max_entries: Entry bound of the memory and sqlite backends
+        path: Database file (sqlite) or directory (disk); defaults to the
+            system temp directory so workers on a node share it
+        max_bytes: Size bound of the disk backend
+        compression: Codec of the disk backend (see resolve_compression)
+
+    Returns:
+        The backend
+    """
+    if name == "memory":
+        return MemoryBackend(max_entries)
+    if name == "sqlite":
+        path = path or os.path.join(tempfile.gettempdir(), "mcp_graylog_cache.sqlite")
+        return SQLiteBackend(path, max_entries)
+    if name == "disk":
+        path = path or os.path.join(tempfile.gettempdir(), "mcp_graylog_cache")
+        return DiskBackend(path, max_bytes, compression)
+    raise ValueError(f"Invalid cache backend: {name}. Valid: {CACHE_BACKENDS}")
+
+
+class ResponseCache:
+    """
+    Response cache with per-namespace TTLs and hit/miss counters.
+
+    Entries are grouped into named namespaces (e.g. "search", "aggregation"),
+    each with its own TTL. A namespace with a TTL of 0 is not cached. Storage
+    is delegated to a CacheBackend, an in-process LRU by default.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 256,
+        ttls: Optional[Dict[str, float]] = None,
+        clock: Callable[[], float] = time.monotonic,
+        backend: Optional[CacheBackend] = None,
+    ):
+        self.max_entries = max_entries
+        self.ttls = dict(ttls or {})
+        self.backend = backend or MemoryBackend(max_entries, clock)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.errors = 0
+
+    def is_enabled(self, namespace: str) -> bool:
+        """Return True if responses in the namespace should be cached."""
+        return self.max_entries > 0 and self.ttls.get(namespace, 0) > 0
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value for key, or None if missing or expired."""
+        try:
+            value = self.backend.get(key)
+        except Exception as e:
+            logger.warning(f"Cache {self.backend.name} read failed: {e}")
+            value = None
+            with self._lock:
+                self.errors += 1
+
+        with self._lock:
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return value
+
+    def set(self, key: str, value: Any, namespace: str) -> None:
+        """Store a value under key using the namespace TTL."""
+        ttl = self.ttls.get(namespace, 0)
+        if ttl <= 0 or self.max_entries <= 0:
+            return
+
+        try:
+            evicted = self.backend.set(key, value, ttl)
+        except Exception as e:
+            logger.warning(f"Cache {self.backend.name} write failed: {e}")
+            with self._lock:
+                self.errors += 1
+            return
+
+        with self._lock:
+            self.evictions += evicted
+
+    def clear(self) -> None:
+        """Drop all cached entries."""
+        self.backend.clear()
+
+    def close(self) -> None:
+        """Release the backend."""
+        self.backend.close()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return cache counters and backend details."""
+        backend_stats = self.backend.stats()
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "backend": self.backend.name,
+                **backend_stats,
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "errors": self.errors,
+                "hit_ratio": round(self.hits / total, 4) if total else 0.0,
+            }
+
+
+class SingleFlight:
+    """
+    Coalesce concurrent identical calls into a single execution.
+
+    The first caller for a key runs the function; callers arriving while it is
+    still in flight wait for and share its result (or exception). Waiting
+    callers keep their own deadline: they give up when it passes, and run
+    the call again if the first caller only failed by running out of time.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._in_flight: Dict[str, "Future[Any]"] = {}
+        self.executions = 0
+        self.coalesced = 0
+
+    def do(self, key: str, func: Callable[[], T]) -> T:
+        """Run func for key, or wait for the identical call already running."""
+        with self._lock:
+            future = self._in_flight.get(key)
+            if future is not None:
+                self.coalesced += 1
+                leader = False
+            else:
+                future = Future()
+                self._in_flight[key] = future
+                self.executions += 1
+                leader = True
+
+        if not leader:
+            try:
+                shared: T = future.result(timeout=time_remaining())
+                return shared
+            except FutureTimeoutError:
+                raise DeadlineExceeded(
+                    "Deadline exceeded waiting for an identical Graylog request"
+                ) from None
+            except DeadlineExceeded:
+                # The leader ran out of its own time, not necessarily ours
+                return self.do(key, func)
+
+        try:
+            result = func()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                del self._in_flight[key]
+
+    def stats(self) -> Dict[str, Any]:
+        """Return coalescing counters."""
+        with self._lock:
+            return {
+                "in_flight": len(self._in_flight),
+                "executions": self.executions,
+                "coalesced": self.coalesced,
+            }
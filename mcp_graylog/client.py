@@ -1,18 +1,80 @@
 """Graylog API client for MCP server."""
 
+import asyncio
+import contextvars
+import csv
+import functools
+import io
 import json
 import logging
-from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional, Union
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import (
+    Any,
+    AsyncIterator,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    TypeVar,
+    Union,
+)
 from urllib.parse import urljoin
 
 import requests
 from pydantic import BaseModel, Field
 
+from .breaker import FAILURE_STATUSES, CircuitBreakers, endpoint_class
+from .cache import ResponseCache, SingleFlight, make_cache_backend, make_cache_key
+from .clustering import MessageClusterer
 from .config import config
+from .deadline import DeadlineExceeded, deadline_expired, detached, time_remaining
+from .fanout import merge_by_timestamp
+from .histogram import HistogramCache, interval_seconds
+from .pagination import CursorStore, message_time, prefetch
+from .pool import PooledHTTPAdapter
+from .ratelimit import RateLimiter, RateLimiters
+from .retry import RetryBudget, RetryPolicy
+from .sharding import (
+    SHARDABLE_AGGREGATIONS,
+    TERMS_OVERSAMPLE,
+    iter_completed,
+    merge_aggregations,
+    merge_search_results,
+    newest_first_windows,
+    split_window,
+)
+from .streams import StreamCatalog
+from .timerange import (
+    format_epoch,
+    parse_time_range,
+    pin_time_range,
+    range_type,
+    span_seconds,
+    views_timerange,
+)
+from .views import (
+    VIEWS_SEARCH_ENDPOINT,
+    build_views_search,
+    split_views_result,
+    views_total,
+)
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
+EXPORT_ENDPOINT = "/api/views/search/messages"
+STREAM_ID_PATTERN = re.compile(r"^[0-9a-fA-F]{24}$")
+
+DEFAULT_EXPORT_FIELDS = ["timestamp", "source", "message"]
+
+# Elasticsearch rejects offset + limit beyond index.max_result_window
+MAX_RESULT_WINDOW = 10000
+
 
 class TimeRange(BaseModel):
     """Time range for log queries."""
@@ -59,8 +121,8 @@ class AggregationParams(BaseModel):
 class GraylogClient:
     """Client for interacting with Graylog API."""
 
-    def __init__(self):
-        self.base_url = config.graylog.endpoint.rstrip("/")
+    def __init__(self) -> None:
+        self.base_url: str = config.graylog.endpoint.rstrip("/")
         self.session = requests.Session()
 
         # Set up authentication headers
@@ -68,12 +130,100 @@ class GraylogClient:
         logger.debug(f"Setting up authentication headers: {list(auth_headers.keys())}")
 
         self.session.headers.update(auth_headers)
+        # Graylog rejects POST requests without X-Requested-By (CSRF protection)
         self.session.headers.update(
-            {"Content-Type": "application/json", "Accept": "application/json"}
+            {
+                "Content-Type": "application/json",
+                "Accept": "application/json",
+                "X-Requested-By": "mcp-graylog",
+            }
         )
 
         self.session.verify = config.graylog.verify_ssl
         self.timeout = config.graylog.timeout
+        # (connect, read) timeouts per endpoint class
+        self.timeouts = {
+            "search": (config.graylog.connect_timeout, config.graylog.timeout),
+            "streams": (config.graylog.connect_timeout, config.graylog.streams_timeout),
+            "system": (config.graylog.connect_timeout, config.graylog.system_timeout),
+        }
+
+        # Bounded keep-alive pool: callers beyond max_connections wait for a
+        # free connection instead of opening throwaway ones
+        self.adapter = PooledHTTPAdapter(
+            pool_connections=config.graylog.pool_connections,
+            pool_maxsize=config.graylog.max_connections,
+            pool_block=True,
+            keep_alive=config.graylog.keep_alive,
+            idle_timeout=config.graylog.pool_idle_timeout,
+        )
+        self.session.mount("http://", self.adapter)
+        self.session.mount("https://", self.adapter)
+        if not config.graylog.keep_alive:
+            self.session.headers["Connection"] = "close"
+
+        self.cache = ResponseCache(
+            max_entries=config.graylog.cache_max_entries,
+            ttls={
+                "search": config.graylog.cache_search_ttl,
+                "aggregation": config.graylog.cache_aggregation_ttl,
+            },
+            backend=make_cache_backend(
+                config.graylog.cache_backend,
+                max_entries=config.graylog.cache_max_entries,
+                path=config.graylog.cache_path,
+                max_bytes=config.graylog.cache_max_bytes,
+                compression=config.graylog.cache_compression,
+            ),
+        )
+        self.single_flight = SingleFlight()
+        self.retry_policy = RetryPolicy(
+            max_attempts=config.graylog.retry_max_attempts,
+            backoff_base=config.graylog.retry_backoff_base,
+            backoff_max=config.graylog.retry_backoff_max,
+            budget=RetryBudget(
+                capacity=config.graylog.retry_budget,
+                refill_rate=config.graylog.retry_budget_refill,
+            ),
+        )
+        self.breakers = CircuitBreakers(
+            enabled=config.graylog.breaker_enabled,
+            failure_rate=config.graylog.breaker_failure_rate,
+            slow_call_seconds=config.graylog.breaker_slow_call_seconds,
+            slow_call_rate=config.graylog.breaker_slow_call_rate,
+            window=config.graylog.breaker_window,
+            min_calls=config.graylog.breaker_min_calls,
+            open_seconds=config.graylog.breaker_open_seconds,
+            half_open_probes=config.graylog.breaker_half_open_probes,
+        )
+        self.rate_limiters = RateLimiters(
+            heavy=RateLimiter(
+                "heavy",
+                rate=config.graylog.rate_limit_heavy,
+                burst=config.graylog.rate_limit_heavy_burst,
+            ),
+            light=RateLimiter(
+                "light",
+                rate=config.graylog.rate_limit_light,
+                burst=config.graylog.rate_limit_light_burst,
+            ),
+            heavy_range=config.graylog.heavy_range_seconds,
+        )
+        # Windows of long searches run on their own pool, so a split search
+        # running on an AsyncGraylogClient worker cannot starve that pool
+        self.shard_executor = ThreadPoolExecutor(
+            max_workers=max(1, config.graylog.shard_concurrency),
+            thread_name_prefix="graylog-shard",
+        )
+        self.histograms = HistogramCache(
+            retention=config.graylog.histogram_retention,
+            settle_seconds=config.graylog.histogram_settle_seconds,
+        )
+        self.stream_catalog = StreamCatalog(
+            self,
+            ttl=config.graylog.stream_catalog_ttl,
+            refresh_interval=config.graylog.stream_catalog_refresh_interval,
+        )
 
     def _make_request(
         self,
@@ -82,8 +232,100 @@ class GraylogClient:
         params: Optional[Dict] = None,
         data: Optional[Dict] = None,
     ) -> Dict[str, Any]:
-        """Make HTTP request to Graylog API."""
+        """
+        Make HTTP request to Graylog API.
+
+        Identical requests issued while one is already in flight wait for and
+        share that response instead of hitting Graylog again.
+        """
+        if not config.graylog.coalesce_requests:
+            return self._send_request(method, endpoint, params=params, data=data)
+
+        key = make_cache_key(method, endpoint, params=params, data=data)
+        return self.single_flight.do(
+            key,
+            lambda: self._send_request(method, endpoint, params=params, data=data),
+        )
+
+    def _send_request(
+        self,
+        method: str,
+        endpoint: str,
+        params: Optional[Dict] = None,
+        data: Optional[Dict] = None,
+    ) -> Dict[str, Any]:
+        """Send a single HTTP request to Graylog API and decode the JSON body."""
+        response = self._http_request(method, endpoint, params=params, data=data)
+        body: Dict[str, Any] = response.json()
+        return body
+
+    def _http_request(
+        self,
+        method: str,
+        endpoint: str,
+        params: Optional[Dict] = None,
+        data: Optional[Dict] = None,
+        headers: Optional[Dict[str, str]] = None,
+        stream: bool = False,
+    ) -> requests.Response:
+        """
+        Send a single HTTP request to Graylog API and return the raw response.
+
+        With stream=True the body is not downloaded up front; the caller must
+        consume and close the response. Transient failures of idempotent
+        requests are retried by the retry policy. Every attempt first passes
+        the circuit breaker of the endpoint class, which raises
+        CircuitOpenError instead of calling Graylog while it is open, then
+        waits for the heavy or light rate limit. Timeouts are those of the
+        endpoint class, shortened to the time left before the current
+        deadline; DeadlineExceeded is raised once it has passed.
+        """
         url = urljoin(self.base_url, endpoint)
+        breaker = (
+            self.breakers.for_endpoint(endpoint) if self.breakers.enabled else None
+        )
+
+        def send() -> requests.Response:
+            # Check the breaker first so an open circuit fails fast instead of
+            # queueing for (and spending) a rate limit token
+            if breaker is not None:
+                breaker.before_call()
+            try:
+                self.rate_limiters.acquire(endpoint, params, data)
+                timeout = self._request_timeout(endpoint)
+            except Exception:
+                if breaker is not None:
+                    breaker.release()
+                raise
+            started = time.monotonic()
+            try:
+                response = self.session.request(
+                    method=method,
+                    url=url,
+                    params=params,
+                    json=data,
+                    headers=headers,
+                    timeout=timeout,
+                    stream=stream,
+                )
+            except Exception as e:
+                if breaker is not None:
+                    if (
+                        isinstance(e, requests.exceptions.Timeout)
+                        and timeout != self.timeouts[endpoint_class(endpoint)]
+                    ):
+                        # Cut short by the caller's deadline, not a Graylog
+                        # failure: one hurried caller must not open the circuit
+                        breaker.release()
+                    else:
+                        breaker.record(False, time.monotonic() - started)
+                raise
+            if breaker is not None:
+                breaker.record(
+                    response.status_code not in FAILURE_STATUSES,
+                    time.monotonic() - started,
+                )
+            return response
 
         try:
             logger.debug(f"Making {method} request to {url}")
@@ -93,9 +335,7 @@ class GraylogClient:
             if params:
                 logger.debug(f"Request params: {params}")
 
-            response = self.session.request(
-                method=method, url=url, params=params, json=data, timeout=self.timeout
-            )
+            response = self.retry_policy.call(method, send)
 
             logger.debug(f"Response status: {response.status_code}")
             logger.debug(f"Response headers: {dict(response.headers)}")
@@ -109,7 +349,15 @@ class GraylogClient:
                 )
 
             response.raise_for_status()
-            return response.json()
+            return response
+        except requests.exceptions.Timeout as e:
+            if deadline_expired():
+                logger.warning(f"Deadline exceeded waiting for {method} {endpoint}")
+                raise DeadlineExceeded(
+                    f"Deadline exceeded waiting for Graylog ({endpoint})"
+                ) from e
+            logger.error(f"Graylog API request failed: {e}")
+            raise
         except requests.exceptions.RequestException as e:
             logger.error(f"Graylog API request failed: {e}")
             if hasattr(e, "response") and e.response is not None:
@@ -117,36 +365,125 @@ class GraylogClient:
                 logger.error(f"Response text: {e.response.text}")
             raise
 
+    def _request_timeout(self, endpoint: str) -> Tuple[float, float]:
+        """
+        Get the (connect, read) timeout for a request to endpoint.
+
+        Raises DeadlineExceeded if the current deadline has already passed.
+        """
+        connect, read = self.timeouts[endpoint_class(endpoint)]
+        left = time_remaining()
+        if left is None:
+            return connect, read
+        if left <= 0:
+            raise DeadlineExceeded(f"Deadline exceeded before requesting {endpoint}")
+        return min(connect, left), min(read, left)
+
+    def _cached_request(
+        self,
+        namespace: str,
+        method: str,
+        endpoint: str,
+        params: Optional[Dict] = None,
+        data: Optional[Dict] = None,
+    ) -> Dict[str, Any]:
+        """
+        Make a request through the response cache.
+
+        Cached responses are shared between callers and must not be mutated.
+        """
+        if not self.cache.is_enabled(namespace):
+            return self._make_request(method, endpoint, params=params, data=data)
+
+        key = make_cache_key(
+            method,
+            endpoint,
+            params=params,
+            data=data,
+            bucket_seconds=config.graylog.cache_bucket_seconds,
+        )
+        cached: Optional[Dict[str, Any]] = self.cache.get(key)
+        if cached is not None:
+            logger.debug(f"Cache hit for {method} {endpoint}")
+            return cached
+
+        result = self._make_request(method, endpoint, params=params, data=data)
+        self.cache.set(key, result, namespace)
+        return result
+
     def _parse_time_range(self, time_range: str) -> Dict[str, Any]:
         """
         Parse time range string into Graylog format.
 
-        Graylog API expects relative time ranges in seconds for the /relative endpoint.
-        For absolute time ranges, it expects ISO 8601 format.
+        Relative ranges become {"range": seconds} for the /relative endpoints,
+        ISO 8601 "from..to" intervals and start times become {"from", "to"}
+        for the /absolute endpoints, and "keyword:<expression>" becomes
+        {"keyword": expression} for the /keyword endpoints. Unrecognized
+        formats raise ValueError instead of reaching Graylog.
         """
-        if not time_range:
-            return {}
+        return parse_time_range(time_range)
 
-        # Supported units and their conversion to seconds
-        units = {"s": 1, "m": 60, "h": 3600, "d": 86400, "w": 604800}
-        unit = time_range[-1]
-        value = time_range[:-1]
+    @staticmethod
+    def _search_endpoint(search_params: Dict[str, Any], suffix: str = "") -> str:
+        """Get the universal search endpoint matching the range parameters."""
+        return f"/api/search/universal/{range_type(search_params)}{suffix}"
 
-        if unit in units and value.isdigit():
-            # Convert to seconds for Graylog API
-            seconds = int(value) * units[unit]
-            return {"range": seconds}
+    def _shard_windows(
+        self, time_range_parsed: Dict[str, Any]
+    ) -> Optional[List[Tuple[str, str]]]:
+        """
+        Split a long time range into windows aligned to GRAYLOG_SHARD_SECONDS.
 
-        # If not a recognized relative range, assume it's an absolute time range
-        # Graylog expects ISO 8601 format for absolute ranges
-        try:
-            # Try to parse as ISO 8601 format
-            datetime.fromisoformat(time_range.replace("Z", "+00:00"))
-            return {"range": time_range}
-        except ValueError:
-            # If not ISO format, return as-is (Graylog will handle the error)
-            logger.warning(f"Unrecognized time range format: {time_range}")
-            return {"range": time_range}
+        Returns None when the range should run as a single request: sharding
+        is disabled, the range spans less than GRAYLOG_SHARD_THRESHOLD, or it
+        is a keyword range of unknown length. Relative ranges are pinned to
+        the window they cover now.
+        """
+        settings = config.graylog
+        span = span_seconds(time_range_parsed)
+        if (
+            settings.shard_threshold <= 0
+            or settings.shard_seconds <= 0
+            or span is None
+            or span < settings.shard_threshold
+        ):
+            return None
+
+        window = time_range_parsed
+        if "range" in window:
+            window = parse_time_range(pin_time_range(f"{window['range']}s"))
+        windows = split_window(window["from"], window["to"], settings.shard_seconds)
+        return windows if len(windows) > 1 else None
+
+    def _gather_shards(
+        self,
+        windows: List[Tuple[str, str]],
+        func: Callable[[str, str], Dict[str, Any]],
+    ) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+        """
+        Run func over every window concurrently and collect the results.
+
+        Returns the results of the windows that succeeded and a report of the
+        split, with "partial" set and the failed windows listed if any window
+        failed. Raises the first error if every window failed.
+        """
+        results: List[Dict[str, Any]] = []
+        failed: List[Dict[str, Any]] = []
+        first_error: Optional[Exception] = None
+        for (from_, to), result in iter_completed(self.shard_executor, windows, func):
+            if isinstance(result, Exception):
+                logger.warning(f"Window {from_}..{to} failed: {result}")
+                failed.append({"from": from_, "to": to, "error": str(result)})
+                first_error = first_error or result
+            else:
+                results.append(result)
+
+        if not results and first_error is not None:
+            raise first_error
+        report: Dict[str, Any] = {"windows": len(windows), "failed": failed}
+        if failed:
+            report["partial"] = True
+        return results, report
 
     def search_logs(self, params: QueryParams) -> Dict[str, Any]:
         """
@@ -169,7 +506,11 @@ class GraylogClient:
             "highlight": false                        // OPTIONAL: Enable result highlighting
         }
 
-        GRAYLOG API ENDPOINT: /api/search/universal/relative (GET)
+        TIME RANGES: Relative ("15m", "7d"), absolute ISO 8601 intervals ("2024-01-01T10:00:00Z..2024-01-01T10:20:00Z"), a start time until now ("2024-01-01T10:00:00Z"), or Graylog keywords ("keyword:yesterday"). Absolute ranges search only the requested window instead of everything back to its start.
+
+        LONG RANGES: A search sorted by timestamp (the default) spanning at least GRAYLOG_SHARD_THRESHOLD seconds is split into windows aligned to GRAYLOG_SHARD_SECONDS (daily, matching index rotation) that run concurrently. Each window returns offset + limit messages; they are merged by timestamp and total_results is summed. A "shards" report lists the windows and any that failed. Newest-first searches for at most GRAYLOG_TOPN_MAX_LIMIT messages walk back from the newest window instead (see search_newest_first).
+
+        GRAYLOG API ENDPOINT: /api/search/universal/{relative|absolute|keyword} (GET)
 
         OUTPUT: Dictionary containing search results with:
         - messages: Array of log messages with content and metadata
@@ -178,6 +519,191 @@ class GraylogClient:
         - time: Query execution time information
         - query: The executed query string
         """
+        search_params = self._build_search_params(params)
+        logger.debug(f"Search params: {search_params}")
+
+        windows = self._shard_windows(search_params)
+        if windows and params.sort in (None, "timestamp"):
+            if self._walks_newest_first(params):
+                return self._newest_first_search(params, windows[0][0], windows[-1][1])
+            return self._sharded_search(params, windows)
+
+        # Use GET and query parameters for this endpoint
+        return self._cached_request(
+            "search", "GET", self._search_endpoint(search_params), params=search_params
+        )
+
+    def _window_searcher(
+        self, params: QueryParams
+    ) -> Callable[[str, str], Dict[str, Any]]:
+        """Get a function searching one window for the first offset + limit messages."""
+        window_params = params.model_copy(
+            update={
+                "sort": "timestamp",
+                "offset": 0,
+                "limit": params.offset + params.limit,
+            }
+        )
+
+        def search_window(from_: str, to: str) -> Dict[str, Any]:
+            return self.search_logs(
+                window_params.model_copy(update={"time_range": f"{from_}..{to}"})
+            )
+
+        return search_window
+
+    def _sharded_search(
+        self, params: QueryParams, windows: List[Tuple[str, str]]
+    ) -> Dict[str, Any]:
+        """Run a search window by window and merge the results by timestamp."""
+        results, report = self._gather_shards(windows, self._window_searcher(params))
+        merged = merge_search_results(
+            results,
+            offset=params.offset,
+            limit=params.limit,
+            descending=params.sort_direction != "asc",
+        )
+        merged["query"] = params.query
+        merged["shards"] = report
+        if report.get("partial"):
+            merged["partial"] = True
+        return merged
+
+    def search_newest_first(self, params: QueryParams) -> Dict[str, Any]:
+        """
+        Get the newest messages of a range without sorting the whole range.
+
+        PURPOSE: Answer "what are the last N events?" over a long range or a busy stream by only searching the newest indices, instead of having Graylog sort every match of the range.
+
+        INPUT:
+        - params: REQUIRED - QueryParams sorted by timestamp descending (the default) with offset + limit of at most GRAYLOG_TOPN_MAX_LIMIT
+
+        BEHAVIOR:
+        - Searches the newest GRAYLOG_TOPN_FIRST_WINDOW seconds of the range first, then windows 4 times longer each, walking back until offset + limit messages are collected or the range is exhausted
+        - Relative ranges are pinned to the window they cover now
+        - Other searches (ascending, sorted by another field, larger limits, keyword ranges) run through search_logs
+
+        GRAYLOG API ENDPOINT: /api/search/universal/absolute (GET), one request per window walked
+
+        OUTPUT: Search results with the newest messages and a "walk" report:
+        {
+            "messages": [...],
+            "total_results": 42,   // matches in the windows walked only, unless complete
+            "walk": {"windows": 2, "searched_from": "2024-01-01T11:00:00.000Z", "complete": false}
+        }
+        """
+        search_params = self._build_search_params(params)
+        # Keyword ranges have no known end and a range of 0 has no start
+        if (
+            "keyword" in search_params
+            or search_params.get("range") == 0
+            or not self._walks_newest_first(params)
+        ):
+            return self.search_logs(params)
+
+        window = search_params
+        if "range" in window:
+            window = parse_time_range(pin_time_range(f"{window['range']}s"))
+        return self._newest_first_search(params, window["from"], window["to"])
+
+    def _walks_newest_first(self, params: QueryParams) -> bool:
+        """Check whether a search should walk back from its newest window."""
+        settings = config.graylog
+        return (
+            params.sort in (None, "timestamp")
+            and params.sort_direction != "asc"
+            and settings.topn_first_window > 0
+            and 0 < params.offset + params.limit <= settings.topn_max_limit
+        )
+
+    def _newest_first_search(
+        self, params: QueryParams, from_: str, to: str
+    ) -> Dict[str, Any]:
+        """Walk back from the end of an absolute window until enough messages match."""
+        needed = params.offset + params.limit
+        messages: List[Dict[str, Any]] = []
+        total = 0
+        walked = 0
+        searched_from = to
+        for window_from, window_to in newest_first_windows(
+            from_, to, config.graylog.topn_first_window
+        ):
+            window_params = params.model_copy(
+                update={
+                    "time_range": f"{window_from}..{window_to}",
+                    "sort": "timestamp",
+                    "sort_direction": "desc",
+                    "offset": 0,
+                    "limit": needed - len(messages),
+                }
+            )
+            search_params = self._build_search_params(window_params)
+            result = self._cached_request(
+                "search",
+                "GET",
+                self._search_endpoint(search_params),
+                params=search_params,
+            )
+            walked += 1
+            searched_from = window_from
+            messages.extend(result.get("messages", []))
+            total += result.get("total_results") or 0
+            if len(messages) >= needed:
+                break
+
+        return {
+            "messages": messages[params.offset : needed],
+            "total_results": total,
+            "query": params.query,
+            "walk": {
+                "windows": walked,
+                "searched_from": searched_from,
+                "complete": searched_from == from_,
+            },
+        }
+
+    def iter_sharded_search(self, params: QueryParams) -> Iterator[Dict[str, Any]]:
+        """
+        Search a long range window by window, yielding each window as it finishes.
+
+        PURPOSE: Let callers act on the first windows of a long search (e.g. "any errors in the last 30 days?") while the slower ones are still running.
+
+        INPUT:
+        - params: REQUIRED - QueryParams; sort is forced to timestamp and each window returns offset + limit messages
+
+        BEHAVIOR:
+        - The range is split as in search_logs; a range too short to split is searched as one window
+        - Windows run concurrently (GRAYLOG_SHARD_CONCURRENCY) and are yielded in completion order, not time order
+        - A failing window is yielded with an "error" instead of messages
+
+        GRAYLOG API ENDPOINT: /api/search/universal/absolute (GET), one request per window
+
+        OUTPUT: Iterator of {"from": ..., "to": ..., "total_results": 12, "messages": [...]} or {"from": ..., "to": ..., "error": "..."}
+        """
+        windows = self._shard_windows(self._build_search_params(params))
+        if not windows:
+            yield self.search_logs(params)
+            return
+
+        results = iter_completed(
+            self.shard_executor, windows, self._window_searcher(params)
+        )
+        try:
+            for (from_, to), result in results:
+                if isinstance(result, Exception):
+                    yield {"from": from_, "to": to, "error": str(result)}
+                else:
+                    yield {
+                        "from": from_,
+                        "to": to,
+                        "total_results": result.get("total_results"),
+                        "messages": result.get("messages", []),
+                    }
+        finally:
+            results.close()
+
+    def _build_search_params(self, params: QueryParams) -> Dict[str, Any]:
+        """Build query string parameters for a universal search request."""
         # Validate required parameters
         if not params.query:
             raise ValueError("Query parameter is required")
@@ -215,14 +741,121 @@ class GraylogClient:
             search_params["highlight"] = params.highlight
 
         # Remove None values
-        search_params = {k: v for k, v in search_params.items() if v is not None}
+        return {k: v for k, v in search_params.items() if v is not None}
 
-        logger.debug(f"Search params: {search_params}")
+    def iter_pages(
+        self,
+        params: QueryParams,
+        page_size: int = 500,
+        max_messages: Optional[int] = None,
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Page through search results beyond the single-request limit.
 
-        # Use GET and query parameters for this endpoint
-        return self._make_request(
-            "GET", "/api/search/universal/relative", params=search_params
+        PURPOSE: Fetch large result sets page by page (e.g. post-incident exports) without the caller managing offsets.
+
+        INPUT:
+        - params: REQUIRED - QueryParams; limit is ignored, offset is the starting point, sort is forced to timestamp in sort_direction
+        - page_size: OPTIONAL - Messages per Graylog request (1-1000, default: 500)
+        - max_messages: OPTIONAL - Stop after this many messages (default: all)
+
+        BEHAVIOR:
+        - A relative range is pinned to the absolute window it covers when the first page is fetched (a keyword range to the window Graylog reports for it), so later pages do not slide with the clock and skip or repeat messages
+        - Pages are read by time: after each page the far end of the window moves to the last message's timestamp, and the offset only skips the messages already returned at that timestamp. Elasticsearch rejects offset + limit beyond 10000 (max_result_window), so offset paging alone could not go further
+        - "timestamp" is added to the requested fields, since paging needs it
+        - Raises ValueError if more than 10000 messages share one timestamp
+
+        GRAYLOG API ENDPOINT: /api/search/universal/absolute (GET) or /keyword, once per page, bypassing the response cache
+
+        OUTPUT: Iterator of message lists, in the same format as search_logs()["messages"]
+        """
+        page_size = max(1, min(page_size, 1000))
+        update: Dict[str, Any] = {
+            "time_range": pin_time_range(params.time_range),
+            "sort": "timestamp",
+        }
+        if params.fields and "timestamp" not in params.fields:
+            update["fields"] = [*params.fields, "timestamp"]
+        params = params.model_copy(update=update)
+        window = parse_time_range(params.time_range)
+        edge = "from" if params.sort_direction == "asc" else "to"
+        offset = params.offset
+        fetched = 0
+
+        while True:
+            limit = page_size
+            if max_messages is not None:
+                limit = min(limit, max_messages - fetched)
+            if limit <= 0:
+                return
+            if offset >= MAX_RESULT_WINDOW:
+                raise ValueError(
+                    f"Cannot page past {MAX_RESULT_WINDOW} messages without a "
+                    "later timestamp to continue from; narrow the query"
+                )
+            limit = min(limit, MAX_RESULT_WINDOW - offset)
+
+            page_params = params.model_copy(update={"limit": limit, "offset": offset})
+            search_params = self._build_search_params(page_params)
+            result = self._make_request(
+                "GET", self._search_endpoint(search_params), params=search_params
+            )
+            messages = result.get("messages", [])
+            if not messages:
+                return
+
+            yield messages
+
+            fetched += len(messages)
+            total = result.get("total_results")
+            if len(messages) < limit or (
+                total is not None and offset + len(messages) >= total
+            ):
+                return
+
+            if "keyword" in window and result.get("from") and result.get("to"):
+                # Keep later pages on the window the keyword resolved to
+                window = parse_time_range(f"{result['from']}..{result['to']}")
+
+            last = message_time(messages[-1])
+            if (
+                "keyword" in window
+                or not last
+                or not window["from"] < last < window["to"]
+            ):
+                offset += len(messages)
+                continue
+
+            # Continue from the last timestamp, skipping what was returned there
+            window[edge] = last
+            offset = sum(1 for message in messages if message_time(message) == last)
+            params = params.model_copy(
+                update={"time_range": f"{window['from']}..{window['to']}"}
+            )
+
+    def iter_messages(
+        self,
+        params: QueryParams,
+        page_size: int = 500,
+        max_messages: Optional[int] = None,
+        prefetch_pages: Optional[int] = None,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Yield search result messages one by one, prefetching pages ahead.
+
+        Up to prefetch_pages pages (default: GRAYLOG_PAGE_PREFETCH) are fetched
+        on a background thread while the caller consumes the current one, so
+        memory stays bounded regardless of the total result size.
+        """
+        depth = (
+            config.graylog.page_prefetch if prefetch_pages is None else prefetch_pages
         )
+        pages = prefetch(self.iter_pages(params, page_size, max_messages), depth)
+        try:
+            for page in pages:
+                yield from page
+        finally:
+            pages.close()
 
     def get_log_statistics(
         self, query: str, time_range: str, aggregation: AggregationParams
@@ -234,7 +867,7 @@ class GraylogClient:
 
         INPUT FORMAT:
         - query: REQUIRED - Search query to filter logs before aggregation
-        - time_range: REQUIRED - Time range for analysis (e.g., "1h", "24h", "7d")
+        - time_range: REQUIRED - Time range for analysis (e.g., "1h", "24h", "7d", "<from>..<to>", "keyword:yesterday")
         - aggregation: AggregationParams object with:
           {
             "type": "terms",           // REQUIRED: Aggregation type
@@ -250,7 +883,11 @@ class GraylogClient:
         - "stats": Statistical summary (min, max, avg, sum)
         - "min", "max", "avg", "sum": Single statistical value
 
-        GRAYLOG API ENDPOINT: /api/search/universal/relative/{aggregation_type} (POST)
+        INCREMENTAL HISTOGRAMS: For date_histogram over a relative range with a fixed interval (e.g. "5m", "1h", "minute"), closed buckets are cached per query, field and interval. A repeated poll only fetches the open tail since the last cached bucket and returns every bucket starting inside the range, plus an "incremental" report.
+
+        LONG RANGES: terms, date_histogram and stats over at least GRAYLOG_SHARD_THRESHOLD seconds run as concurrent windows aligned to GRAYLOG_SHARD_SECONDS and are merged: histogram buckets and stats (count, sum, min, max, count-weighted mean and variance) exactly, terms by summing the counts of each window's top size x 3 terms ("exact" is true when no window had other terms). cardinality, min, max, avg and sum run as one request.
+
+        GRAYLOG API ENDPOINT: /api/search/universal/{relative|absolute|keyword}/{aggregation_type} (POST)
 
         OUTPUT: Dictionary containing aggregation results with:
         - aggregation: Aggregation results with buckets and counts
@@ -272,7 +909,7 @@ class GraylogClient:
         # Build request body according to Graylog API specification
         request_body = {
             "query": query,
-            "range": time_range_parsed["range"],
+            **time_range_parsed,
             "field": aggregation.field,
             "size": aggregation.size,
         }
@@ -286,8 +923,185 @@ class GraylogClient:
 
         logger.debug(f"Aggregation request body: {request_body}")
 
-        endpoint = f"/api/search/universal/relative/{aggregation.type}"
-        return self._make_request("POST", endpoint, data=request_body)
+        endpoint = self._search_endpoint(time_range_parsed, f"/{aggregation.type}")
+
+        interval = interval_seconds(aggregation.interval)
+        if (
+            aggregation.type == "date_histogram"
+            and interval
+            and isinstance(request_body.get("range"), int)
+            # A range of 0 searches all messages and has no closed buckets to reuse
+            and request_body["range"] > 0
+            and self.histograms.enabled
+        ):
+            series_body = {k: v for k, v in request_body.items() if k != "range"}
+            series_key = make_cache_key("POST", endpoint, data=series_body)
+            return self.histograms.fetch(
+                series_key,
+                request_body["range"],
+                interval,
+                lambda from_, to: self._aggregate(
+                    aggregation,
+                    dict(
+                        series_body,
+                        to=format_epoch(to),
+                        **{"from": format_epoch(from_)},
+                    ),
+                    cached=False,
+                ),
+            )
+
+        return self._aggregate(aggregation, request_body)
+
+    def _aggregate(
+        self,
+        aggregation: AggregationParams,
+        request_body: Dict[str, Any],
+        cached: bool = True,
+    ) -> Dict[str, Any]:
+        """Run an aggregation request, split into windows if its range is long."""
+        time_range_parsed: Dict[str, Any] = {
+            k: request_body[k]
+            for k in ("range", "from", "to", "keyword")
+            if k in request_body
+        }
+        suffix = f"/{aggregation.type}"
+
+        def request(body: Dict[str, Any]) -> Dict[str, Any]:
+            endpoint = self._search_endpoint(body, suffix)
+            if cached:
+                return self._cached_request("aggregation", "POST", endpoint, data=body)
+            return self._make_request("POST", endpoint, data=body)
+
+        windows = None
+        if aggregation.type in SHARDABLE_AGGREGATIONS:
+            windows = self._shard_windows(time_range_parsed)
+        if not windows:
+            return request(request_body)
+
+        window_body = {
+            k: v for k, v in request_body.items() if k not in time_range_parsed
+        }
+        if aggregation.type == "terms":
+            window_body["size"] = aggregation.size * TERMS_OVERSAMPLE
+
+        results, report = self._gather_shards(
+            windows,
+            lambda from_, to: request(dict(window_body, to=to, **{"from": from_})),
+        )
+        merged = merge_aggregations(aggregation.type, results, aggregation.size)
+        merged["shards"] = report
+        if report.get("partial"):
+            merged["partial"] = True
+            # Counts are missing the failed windows
+            if "exact" in merged:
+                merged["exact"] = False
+        return merged
+
+    def get_composite_statistics(
+        self,
+        query: str,
+        time_range: str,
+        metrics: Dict[str, AggregationParams],
+        stream_ids: Optional[List[str]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Compute several aggregations with one Graylog search execution.
+
+        PURPOSE: Build a dashboard-like summary (count by level, top sources, unique hosts, histogram) from one backend search instead of one get_log_statistics call per field.
+
+        INPUT FORMAT:
+        - query: REQUIRED - Search query to filter logs before aggregation
+        - time_range: REQUIRED - Time range (e.g., "24h", "<from>..<to>", "keyword:yesterday")
+        - metrics: REQUIRED - Mapping of result name to AggregationParams (same types as get_log_statistics)
+        - stream_ids: OPTIONAL - Restrict the aggregations to these streams
+
+        BEHAVIOR:
+        - terms and date_histogram each become a pivot; metric-only types share one pivot
+        - All pivots run in a single Views search execution over the same time range
+        - A pivot Graylog fails to compute yields an "error" for its metrics only
+
+        GRAYLOG API ENDPOINT: /api/views/search/sync (POST)
+
+        OUTPUT: Dictionary with:
+        {
+            "query": "*",
+            "time_range": "24h",
+            "total_results": 152340,
+            "metrics": {
+                "by_level": {"type": "terms", "field": "level", "terms": {"6": 150000, "3": 2340}, "total": 152340},
+                "hosts": {"type": "cardinality", "field": "source", "cardinality": 42}
+            }
+        }
+        """
+        if not query:
+            raise ValueError("Query parameter is required")
+        if not metrics:
+            raise ValueError("At least one metric is required")
+
+        timerange = views_timerange(self._parse_time_range(time_range or "1h"))
+        request_body, plan = build_views_search(query, timerange, metrics, stream_ids)
+        logger.debug(f"Views search request body: {request_body}")
+
+        response = self._cached_request(
+            "aggregation", "POST", VIEWS_SEARCH_ENDPOINT, data=request_body
+        )
+        return {
+            "query": query,
+            "time_range": time_range,
+            "total_results": views_total(response),
+            "metrics": split_views_result(response, metrics, plan),
+        }
+
+    def probe_search(
+        self, params: QueryParams, field: str = "source", size: int = 10
+    ) -> Dict[str, Any]:
+        """
+        Count the matches of a search and break them down without fetching messages.
+
+        PURPOSE: Answer "did anything match, and where?" before paying for message bodies.
+
+        INPUT:
+        - params: REQUIRED - QueryParams of the search (limit, offset, sort and fields are ignored)
+        - field: OPTIONAL - Field to break the matches down by (default: "source")
+        - size: OPTIONAL - Number of breakdown buckets (default: 10)
+
+        BEHAVIOR: Runs a single Views search with a terms pivot on field, which returns the total and the breakdown and no messages
+
+        GRAYLOG API ENDPOINT: /api/views/search/sync (POST)
+
+        OUTPUT: Dictionary with:
+        {
+            "query": "level:ERROR",
+            "time_range": "1h",
+            "total_results": 42,
+            "breakdown": {"field": "source", "terms": {"nginx": 40, "api": 2}}
+        }
+        """
+        if not params.query:
+            raise ValueError("Query parameter is required")
+
+        time_range = params.time_range or "1h"
+        result = self.get_composite_statistics(
+            params.query,
+            time_range,
+            {"breakdown": AggregationParams(type="terms", field=field, size=size)},
+            [params.stream_id] if params.stream_id else None,
+        )
+        metric = result["metrics"]["breakdown"]
+        breakdown = {"field": field, "terms": metric.get("terms", {})}
+        if "error" in metric:
+            breakdown["error"] = metric["error"]
+        total = result["total_results"]
+        if total is None:
+            total = metric.get("total")
+
+        return {
+            "query": params.query,
+            "time_range": time_range,
+            "total_results": total,
+            "breakdown": breakdown,
+        }
 
     def list_streams(self) -> List[Dict[str, Any]]:
         """
@@ -347,8 +1161,72 @@ class GraylogClient:
         """
         if not stream_id:
             raise ValueError("Stream ID is required")
+
+        # Serve from the stream catalog when it is fresh
+        cached = self.stream_catalog.get(stream_id)
+        if cached is not None:
+            return cached
+
         return self._make_request("GET", f"/api/streams/{stream_id}")
 
+    def search_streams_by_name(self, stream_name: str) -> List[Dict[str, Any]]:
+        """
+        Find streams by name or partial name.
+
+        PURPOSE: Case-insensitive partial matching on stream titles, served from the cached stream catalog and its title index.
+
+        INPUT:
+        - stream_name: REQUIRED - Partial or full stream name (e.g., "nginx")
+
+        GRAYLOG API ENDPOINT: /api/streams (GET), only when the catalog is stale
+
+        OUTPUT: List of matching stream dictionaries (same shape as list_streams)
+        """
+        if not stream_name or not stream_name.strip():
+            raise ValueError("Stream name is required")
+        return self.stream_catalog.search(stream_name.strip())
+
+    def resolve_streams(self, streams: List[str]) -> Tuple[List[str], List[str]]:
+        """
+        Resolve stream IDs and stream-name patterns to stream IDs.
+
+        PURPOSE: Let callers name streams the way they think of them ("nginx-*", "payments") when fanning a search out over several streams.
+
+        INPUT:
+        - streams: REQUIRED - Stream IDs (24 hex characters), shell-style title patterns ("nginx-*", "*-prod"), or partial titles ("payments")
+
+        BEHAVIOR:
+        - Stream IDs are used as given
+        - Patterns containing *, ? or [ match whole titles, case-insensitively
+        - Anything else matches titles containing it, case-insensitively
+        - Duplicates are dropped, keeping the first occurrence
+
+        GRAYLOG API ENDPOINT: /api/streams (GET), only when the stream catalog is stale
+
+        OUTPUT: Tuple of (stream IDs, entries that matched no stream)
+        """
+        resolved: List[str] = []
+        unmatched: List[str] = []
+        for entry in streams:
+            entry = entry.strip()
+            if not entry:
+                continue
+            if STREAM_ID_PATTERN.match(entry):
+                ids = [entry]
+            elif any(c in entry for c in "*?["):
+                ids = [s["id"] for s in self.stream_catalog.match(entry) if s.get("id")]
+            else:
+                ids = [
+                    s["id"] for s in self.stream_catalog.search(entry) if s.get("id")
+                ]
+
+            if not ids:
+                unmatched.append(entry)
+            for stream_id in ids:
+                if stream_id not in resolved:
+                    resolved.append(stream_id)
+        return resolved, unmatched
+
     def search_stream_logs(self, stream_id: str, params: QueryParams) -> Dict[str, Any]:
         """
         Search logs within a specific stream.
@@ -365,7 +1243,7 @@ class GraylogClient:
         - If query is empty, defaults to "*" (all logs in stream)
         - Limits results to maximum of 100 logs per request
 
-        GRAYLOG API ENDPOINT: /api/search/universal/relative (GET) with stream filter
+        GRAYLOG API ENDPOINT: /api/search/universal/{relative|absolute|keyword} (GET) with stream filter
 
         OUTPUT: Dictionary containing search results from the specified stream:
         {
@@ -396,6 +1274,206 @@ class GraylogClient:
         logger.debug(f"Searching stream {stream_id} with query: {params.query}")
         return self.search_logs(params)
 
+    def cluster_messages(
+        self,
+        params: QueryParams,
+        max_messages: int = 10000,
+        top: Optional[int] = 50,
+        max_clusters: int = 1000,
+    ) -> Dict[str, Any]:
+        """
+        Group matching messages by template instead of returning them verbatim.
+
+        PURPOSE: Collapse large result sets dominated by the same message with different IDs (e.g. one stack trace repeated with new request IDs) into a short list of distinct problems.
+
+        INPUT:
+        - params: REQUIRED - QueryParams for the search (limit and offset are ignored)
+        - max_messages: OPTIONAL - Maximum messages to scan (default: 10000)
+        - top: OPTIONAL - Number of largest clusters to return (default: 50)
+        - max_clusters: OPTIONAL - Maximum distinct templates tracked (default: 1000)
+
+        BEHAVIOR:
+        - Numbers, UUIDs, IPs, hex values and timestamps are masked to form a message template
+        - Messages are streamed through the paginated search, which pages by time, so the scan is not limited by Elasticsearch's 10000-message result window and memory is bounded by the number of clusters
+        - If the deadline passes or a later page fails mid-scan, the clusters found so far are returned with "partial": true (and the page "error")
+
+        GRAYLOG API ENDPOINT: /api/search/universal/absolute (GET), one request per 1000 messages over the pinned window
+
+        OUTPUT: Dictionary with:
+        {
+            "total_messages": 100000,
+            "total_clusters": 12,
+            "unclustered_messages": 0,
+            "clusters": [
+                {
+                    "template": "timeout after <NUM>ms request_id=<UUID>",
+                    "count": 81234,
+                    "exemplar": {...},
+                    "first_timestamp": "...",
+                    "last_timestamp": "...",
+                    "sources": ["web-01", "web-02"]
+                }
+            ]
+        }
+        """
+        if not params.fields:
+            params = params.model_copy(
+                update={"fields": ["message", "level", "source", "timestamp"]}
+            )
+
+        clusterer = MessageClusterer(max_clusters=max_clusters)
+        try:
+            clusterer.add_all(
+                self.iter_messages(params, page_size=1000, max_messages=max_messages)
+            )
+        except DeadlineExceeded:
+            logger.warning(
+                f"Clustering stopped at the deadline after {clusterer.total} messages"
+            )
+            return dict(clusterer.result(top), partial=True)
+        except requests.exceptions.RequestException as e:
+            if not clusterer.total:
+                raise
+            logger.warning(f"Clustering stopped after {clusterer.total} messages: {e}")
+            return dict(clusterer.result(top), partial=True, error=str(e))
+        return clusterer.result(top)
+
+    def _build_export_request(
+        self,
+        query: str,
+        time_range: str,
+        fields: Optional[List[str]] = None,
+        stream_ids: Optional[List[str]] = None,
+        limit: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """Build the request body for a Views messages export."""
+        if not query:
+            raise ValueError("Query parameter is required")
+
+        request_body: Dict[str, Any] = {
+            "query_string": {"type": "elasticsearch", "query_string": query},
+            "timerange": views_timerange(self._parse_time_range(time_range or "1h")),
+            "fields_in_order": list(fields or DEFAULT_EXPORT_FIELDS),
+        }
+        if stream_ids:
+            request_body["streams"] = list(stream_ids)
+        if limit:
+            request_body["limit"] = limit
+
+        return request_body
+
+    def _open_export(self, request_body: Dict[str, Any]) -> requests.Response:
+        """Start a streamed CSV export."""
+        logger.debug(f"Export request body: {request_body}")
+        return self._http_request(
+            "POST",
+            EXPORT_ENDPOINT,
+            data=request_body,
+            headers={"Accept": "text/csv"},
+            stream=True,
+        )
+
+    def iter_export_rows(
+        self,
+        query: str,
+        time_range: str = "1h",
+        fields: Optional[List[str]] = None,
+        stream_ids: Optional[List[str]] = None,
+        limit: Optional[int] = None,
+        batch_size: int = 1000,
+    ) -> Iterator[List[Dict[str, str]]]:
+        """
+        Bulk-export messages as batches of CSV rows.
+
+        PURPOSE: Extract large volumes of messages (e.g. a full day of a noisy stream) without offset paging, which degrades and times out on deep offsets.
+
+        INPUT:
+        - query: REQUIRED - Search query
+        - time_range: OPTIONAL - Time range, relative, "<from>..<to>" or "keyword:..." (default: "1h")
+        - fields: OPTIONAL - Columns to export, in order (default: timestamp, source, message)
+        - stream_ids: OPTIONAL - Streams to export from
+        - limit: OPTIONAL - Maximum number of messages (default: all)
+        - batch_size: OPTIONAL - Rows per yielded batch (default: 1000)
+
+        GRAYLOG API ENDPOINT: /api/views/search/messages (POST, text/csv)
+
+        OUTPUT: Iterator of row batches, each a list of {field: value} dictionaries. The CSV response is parsed as it streams, so memory use is bounded by batch_size.
+        """
+        request_body = self._build_export_request(
+            query, time_range, fields, stream_ids, limit
+        )
+        response = self._open_export(request_body)
+        try:
+            response.raw.decode_content = True
+            text = io.TextIOWrapper(response.raw, encoding="utf-8", newline="")
+            batch: List[Dict[str, str]] = []
+            for row in csv.DictReader(text):
+                batch.append(row)
+                if len(batch) >= batch_size:
+                    yield batch
+                    batch = []
+            if batch:
+                yield batch
+        finally:
+            response.close()
+
+    def export_to_file(
+        self,
+        path: str,
+        query: str,
+        time_range: str = "1h",
+        fields: Optional[List[str]] = None,
+        stream_ids: Optional[List[str]] = None,
+        limit: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """
+        Bulk-export messages straight to a CSV file.
+
+        Same request as iter_export_rows, but the response body is copied to
+        path in fixed-size chunks without being parsed. If the deadline passes
+        mid-download the file is left with the rows received so far.
+
+        OUTPUT: {"path": path, "bytes": bytes written}, plus "partial": true if
+        the export was cut off at the deadline
+        """
+        request_body = self._build_export_request(
+            query, time_range, fields, stream_ids, limit
+        )
+        response = self._open_export(request_body)
+        written = 0
+        partial = False
+        try:
+            with open(path, "wb") as f:
+                for chunk in response.iter_content(chunk_size=64 * 1024):
+                    f.write(chunk)
+                    written += len(chunk)
+                    if deadline_expired():
+                        partial = True
+                        break
+        finally:
+            response.close()
+
+        logger.info(f"Exported {written} bytes to {path}")
+        if partial:
+            logger.warning(f"Export to {path} cut off at the deadline")
+            return {"path": path, "bytes": written, "partial": True}
+        return {"path": path, "bytes": written}
+
+    def warm_pool(self, count: int) -> int:
+        """
+        Open connections to Graylog ahead of the first requests.
+
+        PURPOSE: Pay the TCP and TLS handshakes at startup instead of on the first concurrent tool calls.
+
+        INPUT:
+        - count: REQUIRED - Connections to open (capped at GRAYLOG_MAX_CONNECTIONS)
+
+        OUTPUT: Number of connections opened
+        """
+        opened = self.adapter.warm(self.session, self.base_url, count)
+        logger.info(f"Pre-warmed {opened} connections to {self.base_url}")
+        return opened
+
     def get_system_info(self) -> Dict[str, Any]:
         """
         Get Graylog system information.
@@ -450,7 +1528,7 @@ class GraylogClient:
         """
         try:
             # First test basic connectivity
-            response = self.session.get(self.base_url, timeout=self.timeout)
+            response = self.session.get(self.base_url, timeout=self.timeouts["system"])
             logger.debug(f"Basic connectivity test: {response.status_code}")
 
             # Then test API authentication
@@ -488,3 +1566,286 @@ class GraylogClient:
             else:
                 logger.error(f"Connection test failed: {e}")
                 return False
+
+
+class AsyncGraylogClient:
+    """
+    Asynchronous Graylog client for use from async MCP tool handlers.
+
+    Wraps a GraylogClient and runs its calls on a bounded worker pool sized to
+    the HTTP connection pool, so concurrent tool calls share keep-alive
+    connections to Graylog without blocking the event loop.
+    """
+
+    def __init__(
+        self,
+        client: Optional[GraylogClient] = None,
+        max_concurrency: Optional[int] = None,
+    ):
+        self.client = client or GraylogClient()
+        self.max_concurrency = max_concurrency or config.graylog.max_connections
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_concurrency, thread_name_prefix="graylog"
+        )
+        self.cursors = CursorStore(
+            ttl=config.graylog.cursor_ttl, max_cursors=config.graylog.max_open_cursors
+        )
+
+    @property
+    def base_url(self) -> str:
+        """Graylog base URL of the wrapped client."""
+        return self.client.base_url
+
+    async def _run(self, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """Run a blocking client call on the worker pool, keeping the deadline."""
+        loop = asyncio.get_running_loop()
+        context = contextvars.copy_context()
+        return await loop.run_in_executor(
+            self._executor, functools.partial(context.run, func, *args, **kwargs)
+        )
+
+    async def search_logs(self, params: QueryParams) -> Dict[str, Any]:
+        """Search logs. See GraylogClient.search_logs."""
+        return await self._run(self.client.search_logs, params)
+
+    async def get_log_statistics(
+        self, query: str, time_range: str, aggregation: AggregationParams
+    ) -> Dict[str, Any]:
+        """Get log statistics. See GraylogClient.get_log_statistics."""
+        return await self._run(
+            self.client.get_log_statistics, query, time_range, aggregation
+        )
+
+    async def get_composite_statistics(
+        self,
+        query: str,
+        time_range: str,
+        metrics: Dict[str, AggregationParams],
+        stream_ids: Optional[List[str]] = None,
+    ) -> Dict[str, Any]:
+        """Compute several aggregations at once. See GraylogClient.get_composite_statistics."""
+        return await self._run(
+            self.client.get_composite_statistics,
+            query,
+            time_range,
+            metrics,
+            stream_ids,
+        )
+
+    async def probe_search(
+        self, params: QueryParams, field: str = "source", size: int = 10
+    ) -> Dict[str, Any]:
+        """Count and break down matches. See GraylogClient.probe_search."""
+        return await self._run(self.client.probe_search, params, field, size)
+
+    async def list_streams(self) -> List[Dict[str, Any]]:
+        """List all streams. See GraylogClient.list_streams."""
+        return await self._run(self.client.list_streams)
+
+    async def get_stream_info(self, stream_id: str) -> Dict[str, Any]:
+        """Get stream details. See GraylogClient.get_stream_info."""
+        return await self._run(self.client.get_stream_info, stream_id)
+
+    async def search_streams_by_name(self, stream_name: str) -> List[Dict[str, Any]]:
+        """Find streams by name. See GraylogClient.search_streams_by_name."""
+        return await self._run(self.client.search_streams_by_name, stream_name)
+
+    async def search_newest_first(self, params: QueryParams) -> Dict[str, Any]:
+        """Get the newest messages of a range. See GraylogClient.search_newest_first."""
+        return await self._run(self.client.search_newest_first, params)
+
+    async def search_stream_logs(
+        self, stream_id: str, params: QueryParams
+    ) -> Dict[str, Any]:
+        """Search logs in a stream. See GraylogClient.search_stream_logs."""
+        return await self._run(self.client.search_stream_logs, stream_id, params)
+
+    async def search_streams_parallel(
+        self,
+        params: QueryParams,
+        streams: List[str],
+        max_concurrency: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """
+        Run the same search over several streams concurrently.
+
+        PURPOSE: Replace a series of per-stream searches with one call whose latency is that of the slowest stream rather than the sum of all of them.
+
+        INPUT:
+        - params: REQUIRED - QueryParams applied to every stream (stream_id is ignored)
+        - streams: REQUIRED - Stream IDs or stream-name patterns (see GraylogClient.resolve_streams)
+        - max_concurrency: OPTIONAL - Streams searched at once (default: GRAYLOG_FANOUT_CONCURRENCY, capped at the worker pool size)
+
+        BEHAVIOR:
+        - Each stream is asked for params.limit messages sorted by timestamp
+        - Per-stream results are k-way merged by timestamp and cut to params.limit
+        - A failing stream is reported in its summary entry and does not fail the call
+        - Streams not answered before the deadline are reported as failed and the result is marked "partial"
+
+        GRAYLOG API ENDPOINT: /api/search/universal/{relative|absolute|keyword} (GET), one request per stream
+
+        OUTPUT: Dictionary with:
+        {
+            "query": "level:ERROR",
+            "total_results": 420,
+            "streams": [
+                {"stream_id": "...", "total_results": 400, "returned": 50},
+                {"stream_id": "...", "error": "500 Server Error"}
+            ],
+            "failed_streams": 1,
+            "partial": true,  // only present if some streams hit the deadline
+            "unmatched": ["nginx-*"],
+            "messages": [...]  // Graylog message envelopes with an added "stream_id"
+        }
+        """
+        stream_ids, unmatched = await self._run(self.client.resolve_streams, streams)
+        limit = max_concurrency or config.graylog.fanout_concurrency
+        semaphore = asyncio.Semaphore(max(1, min(limit, self.max_concurrency)))
+        base = params.model_copy(update={"sort": "timestamp", "offset": 0})
+
+        async def search_one(stream_id: str) -> Dict[str, Any]:
+            async with semaphore:
+                return await self.search_logs(
+                    base.model_copy(update={"stream_id": stream_id})
+                )
+
+        results = await asyncio.gather(
+            *(search_one(stream_id) for stream_id in stream_ids),
+            return_exceptions=True,
+        )
+
+        summaries: List[Dict[str, Any]] = []
+        message_lists: List[List[Dict[str, Any]]] = []
+        total = 0
+        partial = False
+        for stream_id, result in zip(stream_ids, results):
+            if isinstance(result, DeadlineExceeded):
+                partial = True
+            if isinstance(result, BaseException):
+                logger.warning(f"Search in stream {stream_id} failed: {result}")
+                summaries.append({"stream_id": stream_id, "error": str(result)})
+                continue
+            messages = result.get("messages", [])
+            total += result.get("total_results", 0) or 0
+            summaries.append(
+                {
+                    "stream_id": stream_id,
+                    "total_results": result.get("total_results", 0),
+                    "returned": len(messages),
+                }
+            )
+            message_lists.append(
+                [dict(message, stream_id=stream_id) for message in messages]
+            )
+
+        merged: Dict[str, Any] = {
+            "query": params.query,
+            "total_results": total,
+            "streams": summaries,
+            "failed_streams": sum(1 for s in summaries if "error" in s),
+            "unmatched": unmatched,
+            "messages": merge_by_timestamp(
+                message_lists,
+                descending=params.sort_direction != "asc",
+                limit=params.limit,
+            ),
+        }
+        if partial:
+            merged["partial"] = True
+        return merged
+
+    async def iter_pages(
+        self,
+        params: QueryParams,
+        page_size: int = 500,
+        max_messages: Optional[int] = None,
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        """Asynchronously page through search results. See GraylogClient.iter_pages."""
+        pages = prefetch(
+            self.client.iter_pages(params, page_size, max_messages),
+            config.graylog.page_prefetch,
+        )
+        try:
+            while True:
+                page = await self._run(next, pages, None)
+                if page is None:
+                    return
+                yield page
+        finally:
+            pages.close()
+
+    def open_search_cursor(
+        self,
+        params: QueryParams,
+        page_size: int = 500,
+        max_messages: Optional[int] = None,
+    ) -> str:
+        """
+        Open a resumable server-side cursor over a search.
+
+        No request is sent until the cursor is read. Returns the cursor token.
+        Pages are fetched outside of any tool call deadline, since the cursor
+        outlives the call that opened it.
+        """
+        return self.cursors.open(
+            detached(self.client.iter_messages(params, page_size, max_messages))
+        )
+
+    async def read_search_cursor(
+        self, token: str, count: int
+    ) -> Tuple[List[Dict[str, Any]], Optional[str], int]:
+        """
+        Read the next messages from a search cursor.
+
+        Returns (messages, next token or None when exhausted, total read).
+        Raises KeyError for unknown or expired cursors.
+        """
+        return await self._run(self.cursors.take, token, count)
+
+    async def cluster_messages(
+        self,
+        params: QueryParams,
+        max_messages: int = 10000,
+        top: Optional[int] = 50,
+        max_clusters: int = 1000,
+    ) -> Dict[str, Any]:
+        """Cluster messages by template. See GraylogClient.cluster_messages."""
+        return await self._run(
+            self.client.cluster_messages, params, max_messages, top, max_clusters
+        )
+
+    async def export_to_file(
+        self,
+        path: str,
+        query: str,
+        time_range: str = "1h",
+        fields: Optional[List[str]] = None,
+        stream_ids: Optional[List[str]] = None,
+        limit: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """Export messages to a CSV file. See GraylogClient.export_to_file."""
+        return await self._run(
+            self.client.export_to_file,
+            path,
+            query,
+            time_range,
+            fields,
+            stream_ids,
+            limit,
+        )
+
+    async def get_system_info(self) -> Dict[str, Any]:
+        """Get system information. See GraylogClient.get_system_info."""
+        return await self._run(self.client.get_system_info)
+
+    async def test_connection(self) -> bool:
+        """Test the Graylog connection. See GraylogClient.test_connection."""
+        return await self._run(self.client.test_connection)
+
+    def close(self) -> None:
+        """Shut down the worker pool and close pooled connections."""
+        self.client.stream_catalog.stop()
+        self._executor.shutdown(wait=False)
+        self.client.shard_executor.shutdown(wait=False)
+        self.client.session.close()
+        self.client.cache.close()
@@ -0,0 +1,145 @@
+"""Message template clustering for collapsing repetitive log messages."""
+
+import re
+from typing import Any, Dict, Iterable, List, Optional, Pattern, Tuple
+
+# Variable-token masks, applied in order (more specific patterns first)
+MASKS: List[Tuple[Pattern[str], str]] = [
+    (
+        re.compile(
+            r"\b\d{4}-\d{2}-\d{2}[T ]\d{2}:\d{2}:\d{2}(?:[.,]\d+)?"
+            r"(?:Z|[+-]\d{2}:?\d{2})?"
+        ),
+        "<TS>",
+    ),
+    (
+        re.compile(
+            r"\b[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-"
+            r"[0-9a-fA-F]{4}-[0-9a-fA-F]{12}\b"
+        ),
+        "<UUID>",
+    ),
+    (re.compile(r"\b(?:\d{1,3}\.){3}\d{1,3}\b"), "<IP>"),
+    (
+        re.compile(
+            r"\b(?:[0-9a-fA-F]{1,4}:){7}[0-9a-fA-F]{1,4}\b"
+            r"|\b[0-9a-fA-F]{1,4}(?::[0-9a-fA-F]{1,4})*::"
+            r"(?:[0-9a-fA-F]{1,4}(?::[0-9a-fA-F]{1,4})*\b)?"
+        ),
+        "<IP>",
+    ),
+    # 0x-prefixed values, or 8+ hex characters mixing letters and digits
+    (
+        re.compile(
+            r"\b0[xX][0-9a-fA-F]+\b"
+            r"|\b(?=[0-9a-fA-F]*\d)(?=[0-9a-fA-F]*[a-fA-F])[0-9a-fA-F]{8,}\b"
+        ),
+        "<HEX>",
+    ),
+    (re.compile(r"\d+"), "<NUM>"),
+]
+
+
+def mask_message(text: str, max_chars: int = 500) -> str:
+    """
+    Replace variable tokens in a log message with placeholders.
+
+    Args:
+        text: Raw log message
+        max_chars: Only the first max_chars characters form the template
+
+    Returns:
+        Message template, e.g. "timeout after <NUM>ms request_id=<UUID>"
+    """
+    template = text[:max_chars]
+    for pattern, placeholder in MASKS:
+        template = pattern.sub(placeholder, template)
+    return template
+
+
+class MessageClusterer:
+    """
+    Group log messages by masked template in a single streaming pass.
+
+    Memory is bounded by max_clusters: once reached, messages with new
+    templates are only counted as unclustered. Each cluster keeps its first
+    message as exemplar, the occurrence count, the first/last timestamp and
+    up to max_sources distinct sources.
+    """
+
+    def __init__(
+        self,
+        max_clusters: int = 1000,
+        max_sources: int = 10,
+        template_chars: int = 500,
+    ):
+        self.max_clusters = max_clusters
+        self.max_sources = max_sources
+        self.template_chars = template_chars
+        self.total = 0
+        self.unclustered = 0
+        self._clusters: Dict[str, Dict[str, Any]] = {}
+
+    def add(self, message: Dict[str, Any]) -> None:
+        """Add one message (flat fields or a Graylog envelope)."""
+        if isinstance(message.get("message"), dict):
+            message = message["message"]
+
+        self.total += 1
+        template = mask_message(str(message.get("message", "")), self.template_chars)
+        timestamp = message.get("timestamp")
+        source = message.get("source")
+
+        cluster = self._clusters.get(template)
+        if cluster is None:
+            if len(self._clusters) >= self.max_clusters:
+                self.unclustered += 1
+                return
+            cluster = {
+                "template": template,
+                "count": 0,
+                "exemplar": message,
+                "first_timestamp": timestamp,
+                "last_timestamp": timestamp,
+                "sources": set(),
+            }
+            self._clusters[template] = cluster
+
+        cluster["count"] += 1
+        if timestamp:
+            if not cluster["first_timestamp"] or timestamp < cluster["first_timestamp"]:
+                cluster["first_timestamp"] = timestamp
+            if not cluster["last_timestamp"] or timestamp > cluster["last_timestamp"]:
+                cluster["last_timestamp"] = timestamp
+        if source and len(cluster["sources"]) < self.max_sources:
+            cluster["sources"].add(source)
+
+    def add_all(self, messages: Iterable[Dict[str, Any]]) -> "MessageClusterer":
+        """Add every message from an iterable and return self."""
+        for message in messages:
+            self.add(message)
+        return self
+
+    def result(self, top: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Summarize the clusters, largest first.
+
+        Args:
+            top: Only return the top clusters by count (default: all)
+
+        Returns:
+            Dictionary with totals and the cluster list
+        """
+        clusters = sorted(self._clusters.values(), key=lambda c: -c["count"])
+        if top is not None:
+            clusters = clusters[:top]
+
+        return {
+            "total_messages": self.total,
+            "total_clusters": len(self._clusters),
+            "unclustered_messages": self.unclustered,
+            "clusters": [
+                dict(cluster, sources=sorted(cluster["sources"]))
+                for cluster in clusters
+            ],
+        }
@@ -2,7 +2,7 @@
 
 import os
 import logging
-from typing import Optional
+from typing import Literal, Optional
 from pydantic import Field, ConfigDict
 from pydantic_settings import BaseSettings
 
@@ -18,7 +18,181 @@ class GraylogConfig(BaseSettings):
     username: str = Field("admin", description="Graylog username")
     password: str = Field("admin", description="Graylog password")
     verify_ssl: bool = Field(True, description="Verify SSL certificates")
-    timeout: int = Field(60, description="Request timeout in seconds")
+    timeout: int = Field(
+        60, description="Read timeout for searches and aggregations in seconds"
+    )
+    connect_timeout: float = Field(
+        5.0, description="Timeout for opening a connection to Graylog in seconds"
+    )
+    streams_timeout: float = Field(
+        15.0, description="Read timeout for stream lookups in seconds"
+    )
+    system_timeout: float = Field(
+        10.0, description="Read timeout for system endpoints in seconds"
+    )
+    tool_deadline: float = Field(
+        120.0, description="Total time budget of one tool call in seconds (0 disables)"
+    )
+    max_connections: int = Field(
+        20,
+        description="Maximum pooled keep-alive connections per host (and concurrent requests)",
+    )
+    pool_connections: int = Field(
+        1, description="Number of per-host connection pools to keep"
+    )
+    keep_alive: bool = Field(
+        True, description="Reuse connections and enable TCP keep-alive probes"
+    )
+    pool_idle_timeout: float = Field(
+        50.0,
+        description="Close pooled connections idle for longer than this (0 disables)",
+    )
+    pool_prewarm: int = Field(
+        0, description="Connections opened to Graylog at server startup"
+    )
+    retry_max_attempts: int = Field(
+        3,
+        description="Attempts per idempotent request, including the first (1 disables retries)",
+    )
+    retry_backoff_base: float = Field(
+        0.2, description="Base of the exponential retry backoff in seconds"
+    )
+    retry_backoff_max: float = Field(
+        5.0, description="Maximum retry backoff, and longest Retry-After waited for"
+    )
+    retry_budget: float = Field(
+        10.0, description="Retries allowed in a burst across all requests"
+    )
+    retry_budget_refill: float = Field(
+        1.0, description="Retry budget tokens regained per second"
+    )
+    breaker_enabled: bool = Field(
+        True, description="Fast-fail calls to Graylog endpoints that keep failing"
+    )
+    breaker_failure_rate: float = Field(
+        0.5, description="Failure rate over the window that opens a circuit breaker"
+    )
+    breaker_slow_call_seconds: float = Field(
+        20.0, description="Calls taking at least this many seconds count as slow"
+    )
+    breaker_slow_call_rate: float = Field(
+        0.5, description="Slow call rate over the window that opens a circuit breaker"
+    )
+    breaker_window: int = Field(20, description="Recent calls considered per breaker")
+    breaker_min_calls: int = Field(
+        10, description="Calls in the window before a breaker can open"
+    )
+    breaker_open_seconds: float = Field(
+        30.0, description="Seconds a breaker stays open before probing Graylog"
+    )
+    breaker_half_open_probes: int = Field(
+        2, description="Successful probes needed to close a breaker"
+    )
+    rate_limit_heavy: float = Field(
+        2.0, description="Heavy Graylog requests per second (0 disables the limit)"
+    )
+    rate_limit_heavy_burst: float = Field(
+        4.0, description="Heavy requests allowed in a burst"
+    )
+    rate_limit_light: float = Field(
+        20.0, description="Light Graylog requests per second (0 disables the limit)"
+    )
+    rate_limit_light_burst: float = Field(
+        40.0, description="Light requests allowed in a burst"
+    )
+    heavy_range_seconds: int = Field(
+        21600, description="Searches over at least this range count as heavy"
+    )
+    query_cost_warn: float = Field(
+        2000.0, description="Estimated search cost above which results carry a warning"
+    )
+    query_cost_max: float = Field(
+        20000.0,
+        description="Estimated search cost above which query_cost_action applies",
+    )
+    query_cost_action: Literal["warn", "reject", "rewrite", "probe"] = Field(
+        "rewrite",
+        description="What to do with searches above query_cost_max: warn, "
+        "reject, rewrite or probe",
+    )
+    probe_fetch_threshold: int = Field(
+        50, description="Probing searches fetch messages only up to this many matches"
+    )
+    shard_threshold: int = Field(
+        172800,
+        description="Searches spanning at least this many seconds are split into windows (0 disables)",
+    )
+    shard_seconds: int = Field(
+        86400, description="Length in seconds of split windows, aligned to UTC"
+    )
+    shard_concurrency: int = Field(
+        4, description="Windows of one split search run at once"
+    )
+    topn_max_limit: int = Field(
+        100,
+        description="Newest-first searches walk back window by window when "
+        "returning at most this many messages (0 disables)",
+    )
+    topn_first_window: int = Field(
+        900, description="Seconds covered by the first window of a newest-first walk"
+    )
+    coalesce_requests: bool = Field(
+        True, description="Share one Graylog request between identical concurrent calls"
+    )
+    cache_max_entries: int = Field(
+        256, description="Maximum cached responses (0 disables the cache)"
+    )
+    cache_search_ttl: float = Field(
+        30.0, description="TTL in seconds for cached search responses"
+    )
+    cache_aggregation_ttl: float = Field(
+        60.0, description="TTL in seconds for cached aggregation responses"
+    )
+    cache_bucket_seconds: int = Field(
+        30, description="Alignment bucket in seconds for relative time range keys"
+    )
+    cache_backend: Literal["memory", "sqlite", "disk"] = Field(
+        "memory",
+        description="Response cache storage: memory (per process), sqlite or disk (shared)",
+    )
+    cache_path: Optional[str] = Field(
+        None,
+        description="SQLite file or disk cache directory (default: system temp dir)",
+    )
+    cache_max_bytes: int = Field(
+        256 * 1024 * 1024, description="Maximum size in bytes of the disk cache"
+    )
+    cache_compression: Literal["auto", "zstd", "lz4", "zlib", "none"] = Field(
+        "auto", description="Disk cache compression (auto prefers zstd, then lz4)"
+    )
+    page_prefetch: int = Field(
+        2, description="Search result pages fetched ahead of the consumer"
+    )
+    cursor_ttl: float = Field(
+        300.0, description="Seconds an idle search cursor stays open"
+    )
+    max_open_cursors: int = Field(64, description="Maximum open search cursors")
+    export_dir: Optional[str] = Field(
+        None,
+        description="Directory for export_logs CSV files (unset disables the tool)",
+    )
+    stream_catalog_ttl: float = Field(
+        120.0, description="Seconds the cached stream catalog is considered fresh"
+    )
+    stream_catalog_refresh_interval: float = Field(
+        60.0, description="Background stream catalog refresh interval (0 disables)"
+    )
+    histogram_retention: float = Field(
+        604800.0,
+        description="Seconds closed date_histogram buckets are cached (0 disables)",
+    )
+    histogram_settle_seconds: float = Field(
+        60.0, description="Seconds after a histogram bucket ends before it is cached"
+    )
+    fanout_concurrency: int = Field(
+        8,
+        description="Concurrent Graylog calls per search_streams_parallel or batch call",
+    )
 
     model_config = ConfigDict(env_prefix="GRAYLOG_", case_sensitive=False)
 
@@ -30,6 +204,12 @@ class ServerConfig(BaseSettings):
     port: int = Field(8000, description="Server port")
     log_level: str = Field("INFO", description="Logging level")
     log_format: str = Field("json", description="Log format")
+    json_backend: str = Field(
+        "auto", description="Tool response JSON encoder (auto, orjson, msgspec, json)"
+    )
+    pretty_json: bool = Field(
+        False, description="Indent tool responses (for debugging)"
+    )
 
     model_config = ConfigDict(env_prefix="MCP_SERVER_", case_sensitive=False)
 
@@ -37,7 +217,7 @@ class ServerConfig(BaseSettings):
 class Config:
     """Main configuration class."""
 
-    def __init__(self):
+    def __init__(self) -> None:
         self.graylog = GraylogConfig()
         self.server = ServerConfig()
 
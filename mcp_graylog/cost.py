@@ -0,0 +1,194 @@
+"""Estimate the cost of a Graylog search before sending it."""
+
+import math
+import re
+from typing import List, Optional, Tuple
+
+from pydantic import BaseModel, Field
+
+from .timerange import RELATIVE_PATTERN, RELATIVE_UNITS, parse_time_range, span_seconds
+
+# Query multipliers for expensive Lucene constructs
+LEADING_WILDCARD_WEIGHT = 20.0
+REGEX_WEIGHT = 20.0
+MATCH_ALL_WEIGHT = 3.0
+FUZZY_WEIGHT = 3.0
+WILDCARD_WEIGHT = 2.0
+
+# Result limit at which the limit stops being free
+BASE_LIMIT = 100
+
+# Default range when a search has none, matching the client default
+DEFAULT_RANGE_SECONDS = 3600
+
+# A relative range of 0 searches all messages; score it as a year
+UNBOUNDED_RANGE_SECONDS = 365 * 86400
+
+OPERATORS = {"AND", "OR", "NOT", "TO", "&&", "||"}
+
+TERM_PATTERN = re.compile(
+    r'(?P<field>[^\s():"\[\]{}]+:)?'
+    r"(?P<value>"
+    r'"(?:[^"\\]|\\.)*"'  # phrase
+    r"|/(?:[^/\\]|\\.)+/"  # regular expression
+    r"|[\[{][^\]}]*[\]}]"  # range
+    r'|[^\s()"]+'  # term
+    r")"
+)
+
+
+class QueryCost(BaseModel):
+    """Estimated cost of a search and what drives it."""
+
+    score: float = Field(..., description="Estimated cost (hours x query x limit)")
+    range_seconds: int = Field(..., description="Time span searched")
+    query_weight: float = Field(..., description="Multiplier from the query terms")
+    limit_weight: float = Field(..., description="Multiplier from the result limit")
+    reasons: List[str] = Field(default_factory=list)
+
+
+def range_seconds(time_range: Optional[str]) -> Optional[int]:
+    """
+    Get the length of a time range.
+
+    Args:
+        time_range: Relative range such as "7d" or absolute "from..to" range
+
+    Returns:
+        Seconds, or None for keyword or unrecognized ranges
+    """
+    try:
+        return span_seconds(parse_time_range(time_range))
+    except ValueError:
+        return None
+
+
+def format_range(seconds: int) -> str:
+    """Format seconds as the largest whole relative range unit, e.g. "6h"."""
+    for unit in ("w", "d", "h", "m"):
+        if seconds >= RELATIVE_UNITS[unit] and seconds % RELATIVE_UNITS[unit] == 0:
+            return f"{seconds // RELATIVE_UNITS[unit]}{unit}"
+    return f"{seconds}s"
+
+
+def query_weight(query: str) -> Tuple[float, List[str]]:
+    """
+    Score the Lucene constructs of a query.
+
+    Args:
+        query: Elasticsearch query string
+
+    Returns:
+        Tuple of (multiplier of the most expensive clause, reasons)
+    """
+    stripped = (query or "").strip()
+    if stripped in ("", "*", "*:*"):
+        return MATCH_ALL_WEIGHT, ["unbounded '*' query matches every message"]
+
+    weight = 1.0
+    reasons: List[str] = []
+    for match in TERM_PATTERN.finditer(stripped):
+        value = match.group("value").lstrip("+-!")
+        if not value or value in OPERATORS:
+            continue
+        term = match.group(0)
+
+        if value.startswith("/") and value.endswith("/") and len(value) > 2:
+            clause_weight, reason = REGEX_WEIGHT, f"regular expression {term}"
+        elif value[0] in '"[{':
+            continue
+        elif value[0] in "*?" and value != "*":
+            clause_weight, reason = LEADING_WILDCARD_WEIGHT, f"leading wildcard {term}"
+        elif "*" in value or "?" in value:
+            if value == "*" and match.group("field"):
+                # field:* is an exists query
+                continue
+            clause_weight, reason = WILDCARD_WEIGHT, f"wildcard {term}"
+        elif re.search(r"~\d*$", value):
+            clause_weight, reason = FUZZY_WEIGHT, f"fuzzy term {term}"
+        else:
+            continue
+
+        weight = max(weight, clause_weight)
+        reasons.append(reason)
+
+    return weight, reasons
+
+
+def estimate_query_cost(
+    query: str, time_range: Optional[str], limit: Optional[int]
+) -> QueryCost:
+    """
+    Estimate how expensive a search is for Graylog.
+
+    The score is the number of hours searched, multiplied by the weight of
+    the most expensive query clause (leading wildcards and regular
+    expressions scan every term of the index) and by limit / 100 for limits
+    above 100. A selective 1 hour search with the default limit scores 1.
+
+    Args:
+        query: Elasticsearch query string
+        time_range: Time range (keyword ranges count as 1 hour, a relative
+            range of 0 as a year)
+        limit: Number of messages requested
+
+    Returns:
+        QueryCost with the score and the reasons behind it
+    """
+    seconds = range_seconds(time_range)
+    weight, reasons = query_weight(query)
+    limit_weight = max(1.0, (limit or 0) / BASE_LIMIT)
+
+    if seconds == 0:
+        seconds = UNBOUNDED_RANGE_SECONDS
+        reasons.append("time range of 0 searches all messages")
+    elif seconds is None:
+        seconds = DEFAULT_RANGE_SECONDS
+    elif seconds > 86400:
+        reasons.append(f"time range of {format_range(seconds)}")
+    if limit_weight > 1:
+        reasons.append(f"limit of {limit}")
+
+    return QueryCost(
+        score=round(seconds / 3600 * weight * limit_weight, 2),
+        range_seconds=seconds,
+        query_weight=weight,
+        limit_weight=limit_weight,
+        reasons=reasons,
+    )
+
+
+def rewrite_within_budget(
+    cost: QueryCost,
+    time_range: Optional[str],
+    limit: Optional[int],
+    max_score: float,
+) -> Tuple[Optional[str], Optional[int]]:
+    """
+    Reduce the limit and then the time range until the cost fits max_score.
+
+    Args:
+        cost: Estimate of the original search
+        time_range: Original time range (absolute ranges are kept)
+        limit: Original limit
+        max_score: Highest acceptable score
+
+    Returns:
+        Tuple of (time range, limit) for the rewritten search
+    """
+    new_limit = limit
+    limit_weight = cost.limit_weight
+    score = cost.score
+    if score > max_score and limit is not None and limit_weight > 1:
+        new_limit = max(BASE_LIMIT, int(limit * max_score / score))
+        limit_weight = max(1.0, new_limit / BASE_LIMIT)
+        score = cost.range_seconds / 3600 * cost.query_weight * limit_weight
+
+    if score <= max_score or not RELATIVE_PATTERN.match(time_range or ""):
+        return time_range, new_limit
+
+    seconds = max_score * 3600 / (cost.query_weight * limit_weight)
+    # Round down to whole minutes, and to whole hours beyond a day
+    step = 3600 if seconds >= 86400 else 60
+    seconds = max(60, int(math.floor(seconds / step)) * step)
+    return format_range(seconds), new_limit
@@ -0,0 +1,110 @@
+"""Per-call deadlines shared by every Graylog request made for one tool call."""
+
+import contextvars
+import functools
+import time
+from contextlib import contextmanager
+from typing import Any, Awaitable, Callable, Iterator, Optional, TypeVar
+
+T = TypeVar("T")
+
+# Absolute time.monotonic() deadline of the current tool call, if any
+_deadline: contextvars.ContextVar[Optional[float]] = contextvars.ContextVar(
+    "graylog_deadline", default=None
+)
+
+
+class DeadlineExceeded(Exception):
+    """Raised when the time budget of a tool call is used up."""
+
+    def __init__(self, message: str = "Deadline exceeded before Graylog answered"):
+        super().__init__(message)
+
+
+@contextmanager
+def deadline(seconds: Optional[float]) -> Iterator[None]:
+    """
+    Limit the Graylog requests made inside the block to a total time budget.
+
+    A nested deadline can shorten the budget but never extend it. None or a
+    non-positive value leaves the current deadline in place.
+
+    Args:
+        seconds: Time budget in seconds from now
+    """
+    if not seconds or seconds <= 0:
+        yield
+        return
+
+    current = _deadline.get()
+    at = time.monotonic() + seconds
+    token = _deadline.set(at if current is None else min(current, at))
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def time_remaining() -> Optional[float]:
+    """
+    Get the time left until the current deadline.
+
+    Returns:
+        Seconds left (never negative), or None if no deadline is set
+    """
+    at = _deadline.get()
+    if at is None:
+        return None
+    return max(0.0, at - time.monotonic())
+
+
+def deadline_expired() -> bool:
+    """Return True if a deadline is set and has passed."""
+    left = time_remaining()
+    return left is not None and left <= 0
+
+
+def with_deadline(
+    seconds: Callable[[], Optional[float]],
+) -> Callable[[Callable[..., Awaitable[T]]], Callable[..., Awaitable[T]]]:
+    """
+    Decorate an async function so each call runs under its own deadline.
+
+    Args:
+        seconds: Function returning the budget in seconds, read on each call
+
+    Returns:
+        Decorator preserving the wrapped function's signature
+    """
+
+    def decorate(func: Callable[..., Awaitable[T]]) -> Callable[..., Awaitable[T]]:
+        @functools.wraps(func)
+        async def wrapper(*args: Any, **kwargs: Any) -> T:
+            with deadline(seconds()):
+                return await func(*args, **kwargs)
+
+        return wrapper
+
+    return decorate
+
+
+def detached(items: Iterator[T]) -> Iterator[T]:
+    """
+    Iterate items outside of any deadline.
+
+    Used for iterators that outlive the tool call creating them, such as
+    search cursors read over several calls: each step runs in a context
+    without a deadline, and so does any prefetch thread it starts.
+    """
+    context = contextvars.Context()
+    try:
+        while True:
+            try:
+                item = context.run(next, items)
+            except StopIteration:
+                return
+            yield item
+    finally:
+        close = getattr(items, "close", None)
+        if close is not None:
+            context.run(close)
@@ -0,0 +1,100 @@
+"""JSON encoding for MCP tool responses."""
+
+import json
+import logging
+from typing import Any, Callable, Dict, Tuple
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None  # type: ignore[assignment]
+
+try:
+    import msgspec
+except ImportError:  # pragma: no cover - optional dependency
+    msgspec = None  # type: ignore[assignment]
+
+logger = logging.getLogger(__name__)
+
+JSON_BACKENDS = ("auto", "orjson", "msgspec", "json")
+
+
+def _json_dumps(obj: Any, pretty: bool) -> str:
+    """Encode with the standard library."""
+    if pretty:
+        return json.dumps(obj, indent=2, ensure_ascii=False, default=str)
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False, default=str)
+
+
+def _orjson_dumps(obj: Any, pretty: bool) -> str:
+    """Encode with orjson."""
+    option = orjson.OPT_NON_STR_KEYS
+    if pretty:
+        option |= orjson.OPT_INDENT_2
+    return orjson.dumps(obj, default=str, option=option).decode("utf-8")
+
+
+def _msgspec_dumps(obj: Any, pretty: bool) -> str:
+    """Encode with msgspec."""
+    data = msgspec.json.encode(obj, enc_hook=str)
+    if pretty:
+        data = msgspec.json.format(data, indent=2)
+    text: str = data.decode("utf-8")
+    return text
+
+
+def resolve_backend(name: str) -> Tuple[str, Callable[[Any, bool], str]]:
+    """
+    Resolve a JSON backend name to an encoder function.
+
+    Args:
+        name: One of "auto", "orjson", "msgspec" or "json"
+
+    Returns:
+        Tuple of (resolved backend name, encoder function). "auto" picks the
+        fastest installed backend; a requested backend that is not installed
+        falls back to the standard library with a warning.
+    """
+    available: Dict[str, Callable[[Any, bool], str]] = {}
+    if orjson is not None:
+        available["orjson"] = _orjson_dumps
+    if msgspec is not None:
+        available["msgspec"] = _msgspec_dumps
+    available["json"] = _json_dumps
+
+    if name == "auto":
+        for candidate in ("orjson", "msgspec", "json"):
+            if candidate in available:
+                return candidate, available[candidate]
+
+    if name not in JSON_BACKENDS:
+        raise ValueError(f"Invalid JSON backend: {name}. Valid: {JSON_BACKENDS}")
+
+    if name not in available:
+        logger.warning(f"JSON backend {name} is not installed, using json")
+        return "json", _json_dumps
+
+    return name, available[name]
+
+
+class ResponseEncoder:
+    """
+    Serialize tool results to JSON strings.
+
+    Output is compact by default; pretty=True restores 2-space indentation for
+    debugging. Values the selected backend cannot encode fall back to the
+    standard library encoder.
+    """
+
+    def __init__(self, backend: str = "auto", pretty: bool = False):
+        self.backend, self._dumps = resolve_backend(backend)
+        self.pretty = pretty
+
+    def encode(self, obj: Any) -> str:
+        """Encode obj as a JSON string."""
+        if self._dumps is not _json_dumps:
+            try:
+                return self._dumps(obj, self.pretty)
+            except (TypeError, ValueError) as e:
+                logger.debug(f"{self.backend} encoding failed, using json: {e}")
+        return _json_dumps(obj, self.pretty)
@@ -0,0 +1,44 @@
+"""Merging of search results fetched concurrently from several sources."""
+
+import heapq
+from typing import Any, Dict, Iterable, List, Optional
+
+
+def message_timestamp(message: Dict[str, Any]) -> str:
+    """
+    Get the timestamp of a message for ordering.
+
+    Args:
+        message: Message fields, or a Graylog envelope ({"message": {...}, ...})
+
+    Returns:
+        ISO 8601 timestamp string, or "" if the message has none
+    """
+    if isinstance(message.get("message"), dict):
+        message = message["message"]
+    return message.get("timestamp") or ""
+
+
+def merge_by_timestamp(
+    message_lists: Iterable[List[Dict[str, Any]]],
+    descending: bool = True,
+    limit: Optional[int] = None,
+) -> List[Dict[str, Any]]:
+    """
+    K-way merge of message lists that are each already sorted by timestamp.
+
+    Graylog returns timestamps in one ISO 8601 format, so they order
+    correctly as strings. Only the first limit messages are produced.
+
+    Args:
+        message_lists: Lists sorted by timestamp in the given direction
+        descending: True for newest first
+        limit: Maximum number of merged messages (default: all)
+
+    Returns:
+        Merged list in timestamp order
+    """
+    merged = heapq.merge(*message_lists, key=message_timestamp, reverse=descending)
+    if limit is None:
+        return list(merged)
+    return [message for _, message in zip(range(limit), merged)]
@@ -0,0 +1,223 @@
+"""Incremental date histograms that reuse cached closed buckets."""
+
+import logging
+import math
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Legacy Graylog histogram interval names with a fixed length
+INTERVAL_NAMES = {"minute": 60, "hour": 3600, "day": 86400, "week": 604800}
+
+INTERVAL_UNITS = {"s": 1, "m": 60, "h": 3600, "d": 86400, "w": 604800}
+
+
+def interval_seconds(interval: Optional[str]) -> Optional[int]:
+    """
+    Get the length of a histogram interval in seconds.
+
+    Args:
+        interval: Interval such as "5m", "1h" or "minute"
+
+    Returns:
+        Seconds, or None for calendar intervals (month, year) and unknown values
+    """
+    if not interval:
+        return None
+    if interval in INTERVAL_NAMES:
+        return INTERVAL_NAMES[interval]
+    unit, value = interval[-1], interval[:-1]
+    if unit in INTERVAL_UNITS and value.isdigit() and int(value) > 0:
+        return int(value) * INTERVAL_UNITS[unit]
+    return None
+
+
+def bucket_epoch(key: str) -> Optional[int]:
+    """
+    Get the start of a histogram bucket in epoch seconds.
+
+    Args:
+        key: Bucket key as returned by Graylog (epoch seconds or ISO 8601)
+
+    Returns:
+        Epoch seconds, or None if the key cannot be parsed
+    """
+    if key.isdigit():
+        return int(key)
+    try:
+        return int(datetime.fromisoformat(key.replace("Z", "+00:00")).timestamp())
+    except ValueError:
+        return None
+
+
+class _Series:
+    """Closed buckets of one histogram covering [covered_from, covered_to)."""
+
+    def __init__(self, start: int):
+        self.covered_from = start
+        self.covered_to = start
+        self.buckets: Dict[int, Tuple[str, Any]] = {}
+
+
+class HistogramCache:
+    """
+    Cache of closed date histogram buckets per (query, field, interval).
+
+    A bucket is closed once it ended more than settle_seconds ago, so late
+    ingested messages are still counted. Each series remembers the
+    contiguous range it has complete counts for (empty buckets included);
+    a poll over a relative range is answered from that range plus a fetch
+    of only the open tail. Buckets older than retention seconds are dropped,
+    and the least recently used series is evicted beyond max_series.
+    """
+
+    def __init__(
+        self,
+        retention: float = 604800.0,
+        settle_seconds: float = 60.0,
+        max_series: int = 128,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.retention = retention
+        self.settle_seconds = settle_seconds
+        self.max_series = max_series
+        self._clock = clock
+        self._series: "OrderedDict[str, _Series]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.full_fetches = 0
+        self.tail_fetches = 0
+        self.reused_buckets = 0
+
+    @property
+    def enabled(self) -> bool:
+        """Return True if closed buckets are cached."""
+        return self.retention > 0 and self.max_series > 0
+
+    def fetch(
+        self,
+        key: str,
+        range_seconds: int,
+        interval: int,
+        fetch: Callable[[float, float], Dict[str, Any]],
+    ) -> Dict[str, Any]:
+        """
+        Get a histogram over the last range_seconds, fetching only what is missing.
+
+        Args:
+            key: Series key (query, field and interval, without the range)
+            range_seconds: Relative time range in seconds
+            interval: Bucket length in seconds
+            fetch: Function fetching a histogram over an absolute window,
+                called with its start and end in epoch seconds
+
+        Returns:
+            Histogram response whose "results" hold every bucket that starts
+            inside the range, oldest first, plus an "incremental" report
+        """
+        now = self._clock()
+        first = math.ceil((now - range_seconds) / interval) * interval
+        closed_end = math.floor((now - self.settle_seconds) / interval) * interval
+
+        with self._lock:
+            self._evict(now)
+            series = self._series.get(key)
+            if series is not None and series.covered_from <= first < series.covered_to:
+                fetch_from = series.covered_to
+                self._series.move_to_end(key)
+            else:
+                fetch_from = first
+
+        # Fetch an absolute window: a relative range starts wherever Graylog's
+        # clock says when the request arrives, so latency or clock skew would
+        # leave the first fetched buckets partial while they are cached as closed
+        start_at = now - range_seconds if fetch_from == first else fetch_from
+        seconds = math.ceil(now - start_at)
+        response = fetch(start_at, now)
+
+        fetched: Dict[int, Tuple[str, Any]] = {}
+        for bucket_key, count in (response.get("results") or {}).items():
+            start = bucket_epoch(str(bucket_key))
+            if start is None:
+                logger.debug(f"Unparseable histogram bucket {bucket_key}, not caching")
+                return response
+            # The bucket straddling the range start is partial, leave it out
+            if start >= fetch_from:
+                fetched[start] = (str(bucket_key), count)
+
+        with self._lock:
+            series = self._series.get(key)
+            if series is None or not (
+                series.covered_from <= fetch_from <= series.covered_to
+            ):
+                series = _Series(fetch_from)
+                self._series[key] = series
+            reused = {
+                start: bucket
+                for start, bucket in series.buckets.items()
+                if first <= start < fetch_from
+            }
+
+            for start, bucket in fetched.items():
+                if start + interval <= closed_end:
+                    series.buckets[start] = bucket
+            series.covered_to = max(series.covered_to, closed_end)
+
+            self._series.move_to_end(key)
+            while len(self._series) > self.max_series:
+                self._series.popitem(last=False)
+
+            if fetch_from > first:
+                self.tail_fetches += 1
+                self.reused_buckets += len(reused)
+            else:
+                self.full_fetches += 1
+
+        merged = dict(reused)
+        merged.update(fetched)
+        results = {
+            bucket_key: count for _, (bucket_key, count) in sorted(merged.items())
+        }
+
+        shaped = dict(response)
+        shaped["results"] = results
+        shaped["incremental"] = {
+            "reused_buckets": len(reused),
+            "fetched_seconds": seconds,
+        }
+        return shaped
+
+    def _evict(self, now: float) -> None:
+        """Drop buckets past the retention horizon. Caller must hold the lock."""
+        horizon = now - self.retention
+        for key in list(self._series):
+            series = self._series[key]
+            if series.covered_from >= horizon:
+                continue
+            series.buckets = {
+                start: bucket
+                for start, bucket in series.buckets.items()
+                if start >= horizon
+            }
+            series.covered_from = math.ceil(horizon)
+            if series.covered_from >= series.covered_to:
+                del self._series[key]
+
+    def clear(self) -> None:
+        """Drop all cached buckets."""
+        with self._lock:
+            self._series.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return cache state and counters."""
+        with self._lock:
+            return {
+                "series": len(self._series),
+                "buckets": sum(len(s.buckets) for s in self._series.values()),
+                "full_fetches": self.full_fetches,
+                "tail_fetches": self.tail_fetches,
+                "reused_buckets": self.reused_buckets,
+            }
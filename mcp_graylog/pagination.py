@@ -0,0 +1,266 @@
+"""Prefetching iterators and resumable cursors for paginated searches."""
+
+import contextvars
+import queue
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Generator,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+)
+
+from .deadline import time_remaining
+from .fanout import message_timestamp
+from .timerange import format_timestamp, parse_timestamp
+
+_DONE = object()
+
+
+def message_time(message: Dict[str, Any]) -> Optional[str]:
+    """
+    Get a message's timestamp in the format Graylog range bounds use.
+
+    Args:
+        message: Message fields, or a Graylog envelope ({"message": {...}, ...})
+
+    Returns:
+        Normalized UTC timestamp, or None if the message has no valid one
+    """
+    try:
+        return format_timestamp(parse_timestamp(message_timestamp(message)))
+    except (TypeError, ValueError):
+        return None
+
+
+def prefetch(items: Iterable[Any], depth: int = 2) -> Generator[Any, None, None]:
+    """
+    Iterate over items while a background thread produces up to depth ahead.
+
+    Args:
+        items: Source iterable (typically a page fetcher)
+        depth: Maximum number of items buffered ahead of the consumer
+
+    Returns:
+        Iterator yielding the same items in order. Exceptions raised by the
+        source are re-raised to the consumer. Closing the iterator early stops
+        the producer thread. The producer runs in a copy of the caller's
+        context, so it shares the caller's deadline.
+    """
+    if depth <= 0:
+        yield from items
+        return
+
+    buffer: "queue.Queue[Any]" = queue.Queue(maxsize=depth)
+    stop = threading.Event()
+
+    def put(item: Any) -> bool:
+        while not stop.is_set():
+            try:
+                buffer.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce() -> None:
+        try:
+            for item in items:
+                if not put(item):
+                    return
+        except BaseException as e:
+            put(e)
+            return
+        put(_DONE)
+
+    producer = threading.Thread(
+        target=contextvars.copy_context().run,
+        args=(produce,),
+        name="search-prefetch",
+        daemon=True,
+    )
+    producer.start()
+    try:
+        while True:
+            item = buffer.get()
+            if item is _DONE:
+                return
+            if isinstance(item, BaseException):
+                raise item
+            yield item
+    finally:
+        stop.set()
+
+
+class _Feed:
+    """
+    Iterator drained by a background thread, so reads can give up in time.
+
+    The thread starts on the first read and stays at most one item ahead.
+    Closing the feed stops the thread, which then closes the source.
+    """
+
+    def __init__(self, items: Iterator[Any]):
+        self._items = items
+        self._buffer: "queue.Queue[Any]" = queue.Queue(maxsize=1)
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def get(self, timeout: Optional[float]) -> Any:
+        """
+        Get the next item, or _DONE once the source is exhausted.
+
+        Raises:
+            queue.Empty: If no item arrived within timeout seconds
+        """
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._produce, name="search-cursor", daemon=True
+            )
+            self._thread.start()
+        item = self._buffer.get(timeout=timeout)
+        if isinstance(item, BaseException):
+            raise item
+        return item
+
+    def close(self) -> None:
+        """Stop reading the source."""
+        self._stop.set()
+        if self._thread is None:
+            CursorStore._close(self._items)
+
+    def _produce(self) -> None:
+        try:
+            for item in self._items:
+                if not self._put(item):
+                    return
+        except BaseException as e:
+            self._put(e)
+            return
+        finally:
+            CursorStore._close(self._items)
+        self._put(_DONE)
+
+    def _put(self, item: Any) -> bool:
+        while not self._stop.is_set():
+            try:
+                self._buffer.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+
+class CursorStore:
+    """
+    Server-side registry of open search iterators addressed by opaque tokens.
+
+    Callers resume a cursor to read the next messages from the same live
+    iterator, so pages already fetched (or prefetched) are never re-requested.
+    Idle cursors expire after ttl seconds; the oldest cursor is dropped when
+    max_cursors is exceeded.
+    """
+
+    def __init__(
+        self,
+        ttl: float = 300.0,
+        max_cursors: int = 64,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.ttl = ttl
+        self.max_cursors = max_cursors
+        self._clock = clock
+        self._cursors: "OrderedDict[str, Tuple[float, _Feed, int]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def open(self, items: Iterator[Any]) -> str:
+        """Register an iterator and return its cursor token."""
+        token = secrets.token_urlsafe(16)
+        with self._lock:
+            self._expire()
+            self._cursors[token] = (self._clock(), _Feed(items), 0)
+            while len(self._cursors) > self.max_cursors:
+                _, (_, dropped, _) = self._cursors.popitem(last=False)
+                self._close(dropped)
+        return token
+
+    def take(self, token: str, count: int) -> Tuple[List[Any], Optional[str], int]:
+        """
+        Read up to count items from an open cursor.
+
+        Reading stops early, leaving the cursor open, once the current
+        deadline has passed, including while waiting for a page to arrive.
+
+        Args:
+            token: Cursor token returned by open()
+            count: Maximum number of items to read
+
+        Returns:
+            Tuple of (items, token or None when exhausted, items read so far)
+
+        Raises:
+            KeyError: If the cursor is unknown or expired
+        """
+        with self._lock:
+            self._expire()
+            entry = self._cursors.pop(token, None)
+        if entry is None:
+            raise KeyError(f"Unknown or expired cursor: {token}")
+
+        _, items, consumed = entry
+        batch: List[Any] = []
+        try:
+            while len(batch) < count:
+                left = time_remaining()
+                if left is not None and left <= 0:
+                    break
+                try:
+                    item = items.get(timeout=left)
+                except queue.Empty:
+                    break
+                if item is _DONE:
+                    return batch, None, consumed + len(batch)
+                batch.append(item)
+        except BaseException:
+            self._close(items)
+            raise
+
+        with self._lock:
+            self._cursors[token] = (self._clock(), items, consumed + len(batch))
+        return batch, token, consumed + len(batch)
+
+    def close(self, token: str) -> None:
+        """Close a cursor before it is exhausted."""
+        with self._lock:
+            entry = self._cursors.pop(token, None)
+        if entry is not None:
+            self._close(entry[1])
+
+    def _expire(self) -> None:
+        """Drop idle cursors. Caller must hold the lock."""
+        deadline = self._clock() - self.ttl
+        for token in [
+            t for t, (seen, _, _) in self._cursors.items() if seen < deadline
+        ]:
+            _, items, _ = self._cursors.pop(token)
+            self._close(items)
+
+    @staticmethod
+    def _close(items: Any) -> None:
+        """Close a feed or generator so its reading threads stop."""
+        close = getattr(items, "close", None)
+        if close is not None:
+            close()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return cursor registry state."""
+        with self._lock:
+            return {"open_cursors": len(self._cursors), "max_cursors": self.max_cursors}
@@ -0,0 +1,224 @@
+"""Instrumented HTTP connection pool for the Graylog session."""
+
+import logging
+import socket
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.poolmanager import PoolManager
+
+logger = logging.getLogger(__name__)
+
+# TCP keep-alive probes let idle pooled connections notice a vanished peer
+KEEPALIVE_SOCKET_OPTIONS = HTTPConnection.default_socket_options + [
+    (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+]
+
+
+class PoolTracker:
+    """Connection counters shared by every pool of one adapter."""
+
+    def __init__(self, idle_timeout: float = 0.0):
+        self.idle_timeout = idle_timeout
+        self.in_use = 0
+        self.created = 0
+        self.reused = 0
+        self.evicted = 0
+        self._lock = threading.Lock()
+
+    def checkout(self, conn: Any) -> None:
+        """Record a connection handed to a request, evicting it if idle too long."""
+        last_used = getattr(conn, "_last_used", None)
+        connected = getattr(conn, "sock", None) is not None
+        evict = (
+            connected
+            and self.idle_timeout > 0
+            and last_used is not None
+            and time.monotonic() - last_used > self.idle_timeout
+        )
+        if evict:
+            conn.close()
+            connected = False
+
+        with self._lock:
+            self.in_use += 1
+            if evict:
+                self.evicted += 1
+            if connected:
+                self.reused += 1
+            else:
+                self.created += 1
+
+    def checkin(self, conn: Any) -> None:
+        """Record a connection returned to its pool."""
+        if conn is not None:
+            conn._last_used = time.monotonic()
+        with self._lock:
+            self.in_use -= 1
+
+
+class _TrackedPool(HTTPConnectionPool):
+    """
+    Report connection checkouts and checkins to a PoolTracker.
+
+    urllib3 has no public hook for checkouts, so this overrides the
+    _get_conn/_put_conn pair every request goes through.
+    """
+
+    tracker: Optional[PoolTracker] = None
+
+    def _get_conn(self, timeout: Optional[float] = None) -> Any:
+        conn = super()._get_conn(timeout)
+        if self.tracker is not None:
+            self.tracker.checkout(conn)
+        return conn
+
+    def _put_conn(self, conn: Any) -> None:
+        if self.tracker is not None:
+            self.tracker.checkin(conn)
+        super()._put_conn(conn)
+
+
+class TrackedHTTPConnectionPool(_TrackedPool):
+    """HTTPConnectionPool reporting to a PoolTracker."""
+
+
+class TrackedHTTPSConnectionPool(_TrackedPool, HTTPSConnectionPool):
+    """HTTPSConnectionPool reporting to a PoolTracker."""
+
+
+class TrackedPoolManager(PoolManager):
+    """PoolManager whose pools report to a shared PoolTracker."""
+
+    def __init__(self, *args: Any, tracker: PoolTracker, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self.tracker = tracker
+        self.pool_classes_by_scheme = {
+            "http": TrackedHTTPConnectionPool,
+            "https": TrackedHTTPSConnectionPool,
+        }
+
+    def _new_pool(self, *args: Any, **kwargs: Any) -> HTTPConnectionPool:
+        pool = super()._new_pool(*args, **kwargs)
+        if isinstance(pool, _TrackedPool):
+            pool.tracker = self.tracker
+        return pool
+
+
+class PooledHTTPAdapter(HTTPAdapter):
+    """
+    HTTPAdapter with connection reuse statistics, idle eviction and pre-warming.
+
+    Connections idle for longer than idle_timeout are closed when next
+    checked out instead of being reused, so a connection the server already
+    dropped is not used for a request. With keep_alive, pooled sockets
+    enable TCP keep-alive probes.
+    """
+
+    def __init__(
+        self,
+        pool_connections: int = 1,
+        pool_maxsize: int = 20,
+        pool_block: bool = True,
+        keep_alive: bool = True,
+        idle_timeout: float = 0.0,
+    ):
+        self.tracker = PoolTracker(idle_timeout=idle_timeout)
+        self.keep_alive = keep_alive
+        super().__init__(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            pool_block=pool_block,
+        )
+
+    def init_poolmanager(
+        self, connections: int, maxsize: int, block: bool = False, **pool_kwargs: Any
+    ) -> None:
+        self._pool_connections = connections
+        self._pool_maxsize = maxsize
+        self._pool_block = block
+        if self.keep_alive:
+            pool_kwargs.setdefault("socket_options", KEEPALIVE_SOCKET_OPTIONS)
+        self.poolmanager = TrackedPoolManager(
+            num_pools=connections,
+            maxsize=maxsize,
+            block=block,
+            tracker=self.tracker,
+            **pool_kwargs,
+        )
+
+    def warm(
+        self,
+        session: requests.Session,
+        url: str,
+        count: int,
+        timeout: float = 10.0,
+    ) -> int:
+        """
+        Open up to count connections to url and leave them idle in the pool.
+
+        Args:
+            session: Session the adapter is mounted on; its TLS settings
+                select the pool that its requests use
+            url: Any URL on the target host
+            count: Number of connections to open (capped at the pool size)
+            timeout: Connect timeout per connection in seconds
+
+        Returns:
+            Number of connections opened
+        """
+        settings = session.merge_environment_settings(
+            url, {}, None, session.verify, session.cert
+        )
+        request = requests.Request("GET", url).prepare()
+        pool = self.get_connection_with_tls_context(
+            request, settings["verify"], settings["proxies"], settings["cert"]
+        )
+        count = min(count, self._pool_maxsize)
+        conns: List[Any] = []
+        opened = 0
+        try:
+            for _ in range(count):
+                conn = pool._get_conn(timeout=timeout)
+                conns.append(conn)
+                if getattr(conn, "sock", None) is None:
+                    conn.timeout = timeout
+                    conn.connect()
+                    opened += 1
+        except Exception as e:
+            logger.warning(f"Connection pool pre-warm stopped after {opened}: {e}")
+        finally:
+            for conn in conns:
+                pool._put_conn(conn)
+        return opened
+
+    def stats(self) -> Dict[str, Any]:
+        """Return pool size and connection counters."""
+        idle = 0
+        pools = self.poolmanager.pools
+        for key in pools.keys():
+            pool = pools.get(key)
+            queue = getattr(pool, "pool", None) if pool is not None else None
+            if queue is not None:
+                idle += sum(
+                    1
+                    for conn in list(queue.queue)
+                    if conn is not None and getattr(conn, "sock", None) is not None
+                )
+
+        tracker = self.tracker
+        checkouts = tracker.created + tracker.reused
+        return {
+            "max_connections": self._pool_maxsize,
+            "in_use": tracker.in_use,
+            "idle": idle,
+            "created": tracker.created,
+            "reused": tracker.reused,
+            "evicted_idle": tracker.evicted,
+            "reuse_ratio": round(tracker.reused / checkouts, 4) if checkouts else 0.0,
+        }
@@ -0,0 +1,237 @@
+"""Client-side rate limiting of Graylog requests with priority queueing."""
+
+import contextvars
+import functools
+import heapq
+import itertools
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Awaitable, Callable, Dict, Iterator, List, Optional, Tuple
+
+from .breaker import endpoint_class
+from .deadline import DeadlineExceeded, time_remaining
+from .timerange import span_seconds
+
+logger = logging.getLogger(__name__)
+
+# Request priorities, lower is served first
+INTERACTIVE = 0
+NORMAL = 1
+
+_priority: contextvars.ContextVar[int] = contextvars.ContextVar(
+    "graylog_priority", default=NORMAL
+)
+
+
+@contextmanager
+def request_priority(level: int) -> Iterator[None]:
+    """Queue the Graylog requests made inside the block at the given priority."""
+    token = _priority.set(level)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+def with_priority(
+    level: int,
+) -> Callable[[Callable[..., Awaitable[Any]]], Callable[..., Awaitable[Any]]]:
+    """Decorate an async function so its Graylog requests use the given priority."""
+
+    def decorate(func: Callable[..., Awaitable[Any]]) -> Callable[..., Awaitable[Any]]:
+        @functools.wraps(func)
+        async def wrapper(*args: Any, **kwargs: Any) -> Any:
+            with request_priority(level):
+                return await func(*args, **kwargs)
+
+        return wrapper
+
+    return decorate
+
+
+def request_range(params: Optional[Dict], data: Optional[Dict]) -> Optional[int]:
+    """
+    Get the time span of a search request.
+
+    Args:
+        params: Query parameters (legacy search API, "range" or "from"/"to")
+        data: JSON body (legacy aggregations, or Views single query or
+            "queries" list with a "timerange")
+
+    Returns:
+        Span in seconds, or None if the request has no relative or absolute
+        range (e.g. a keyword range)
+    """
+    seconds = span_seconds(params)
+    if seconds is not None:
+        return seconds
+    if data:
+        bodies = data.get("queries") or [data]
+        spans = []
+        for body in bodies:
+            if isinstance(body, dict):
+                span = span_seconds(body.get("timerange") or body)
+                if span is not None:
+                    spans.append(span)
+        if spans:
+            return max(spans)
+    return None
+
+
+class RateLimiter:
+    """
+    Token bucket whose waiters are served in priority order.
+
+    Up to burst requests pass at once; after that one request is admitted
+    every 1/rate seconds. Waiting requests form a priority queue, so an
+    interactive request queued behind bulk searches is admitted next. A
+    request still queued when its deadline passes raises DeadlineExceeded.
+    A rate of 0 disables limiting.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        rate: float,
+        burst: float = 1.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.name = name
+        self.rate = rate
+        self.burst = max(1.0, burst)
+        self._clock = clock
+        self._tokens = self.burst
+        self._updated = clock()
+        self._cond = threading.Condition()
+        self._waiters: List[Tuple[int, int]] = []
+        self._seq = itertools.count()
+        self.acquired = 0
+        self.delayed = 0
+        self.max_queued = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def _refill(self) -> None:
+        """Add tokens for the time elapsed. Caller must hold the lock."""
+        now = self._clock()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self, priority: int = NORMAL) -> float:
+        """
+        Wait for a token.
+
+        Args:
+            priority: Queue priority, lower is served first
+
+        Returns:
+            Seconds spent waiting
+
+        Raises:
+            DeadlineExceeded: If the deadline passes while queued
+        """
+        if self.rate <= 0:
+            return 0.0
+
+        started = self._clock()
+        with self._cond:
+            entry = (priority, next(self._seq))
+            heapq.heappush(self._waiters, entry)
+            self.max_queued = max(self.max_queued, len(self._waiters))
+            blocked = False
+            try:
+                while True:
+                    self._refill()
+                    at_head = self._waiters[0] == entry
+                    if at_head and self._tokens >= 1:
+                        heapq.heappop(self._waiters)
+                        self._tokens -= 1
+                        break
+
+                    left = time_remaining()
+                    if left is not None and left <= 0:
+                        raise DeadlineExceeded(
+                            f"Deadline exceeded while queued for the {self.name} "
+                            f"Graylog rate limit"
+                        )
+                    timeout = (1 - self._tokens) / self.rate if at_head else None
+                    if left is not None:
+                        timeout = left if timeout is None else min(timeout, left)
+                    blocked = True
+                    self._cond.wait(timeout)
+            except BaseException:
+                if entry in self._waiters:
+                    self._waiters.remove(entry)
+                    heapq.heapify(self._waiters)
+                raise
+            finally:
+                # The next waiter may now be at the head of the queue
+                self._cond.notify_all()
+
+            self.acquired += 1
+            if not blocked:
+                return 0.0
+            waited = self._clock() - started
+            self.delayed += 1
+            self.total_wait += waited
+            self.max_wait = max(self.max_wait, waited)
+
+        logger.debug(f"Waited {waited:.3f}s for the {self.name} rate limit")
+        return waited
+
+    def stats(self) -> Dict[str, Any]:
+        """Return queue depth and wait time statistics."""
+        with self._cond:
+            return {
+                "rate": self.rate,
+                "queued": len(self._waiters),
+                "max_queued": self.max_queued,
+                "acquired": self.acquired,
+                "delayed": self.delayed,
+                "avg_wait_ms": (
+                    round(self.total_wait / self.delayed * 1000, 1)
+                    if self.delayed
+                    else 0.0
+                ),
+                "max_wait_ms": round(self.max_wait * 1000, 1),
+            }
+
+
+class RateLimiters:
+    """
+    Heavy and light rate limits for Graylog requests.
+
+    Searches and aggregations spanning at least heavy_range seconds (or
+    with a keyword range) are heavy; shorter searches and stream and system
+    calls are light.
+    """
+
+    def __init__(self, heavy: RateLimiter, light: RateLimiter, heavy_range: int):
+        self.heavy = heavy
+        self.light = light
+        self.heavy_range = heavy_range
+
+    def for_request(
+        self, endpoint: str, params: Optional[Dict], data: Optional[Dict]
+    ) -> RateLimiter:
+        """Get the limiter for a request."""
+        if endpoint_class(endpoint) != "search":
+            return self.light
+        seconds = request_range(params, data)
+        # A relative range of 0 searches all messages
+        if seconds is None or seconds == 0 or seconds >= self.heavy_range:
+            return self.heavy
+        return self.light
+
+    def acquire(
+        self, endpoint: str, params: Optional[Dict], data: Optional[Dict]
+    ) -> float:
+        """Wait for a token for a request at the current priority."""
+        limiter = self.for_request(endpoint, params, data)
+        return limiter.acquire(_priority.get())
+
+    def stats(self) -> Dict[str, Any]:
+        """Return the stats of both limiters."""
+        return {"heavy": self.heavy.stats(), "light": self.light.stats()}
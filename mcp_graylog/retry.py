@@ -0,0 +1,224 @@
+"""Retry policy with exponential backoff, full jitter and a shared retry budget."""
+
+import logging
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Callable, Dict, Optional, Union
+
+import requests
+
+from .deadline import time_remaining
+
+logger = logging.getLogger(__name__)
+
+# Only requests that can be repeated without side effects are retried
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+RETRYABLE_STATUSES = frozenset({429, 502, 503, 504})
+
+RETRYABLE_EXCEPTIONS = (
+    requests.exceptions.ConnectionError,
+    requests.exceptions.Timeout,
+)
+
+
+def parse_retry_after(
+    value: Optional[str], now: Optional[float] = None
+) -> Optional[float]:
+    """
+    Parse a Retry-After header.
+
+    Args:
+        value: Header value, either delay seconds or an HTTP date
+        now: Current wall-clock time, defaults to time.time()
+
+    Returns:
+        Seconds to wait (never negative), or None if absent or unparseable
+    """
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    current = datetime.fromtimestamp(time.time() if now is None else now, timezone.utc)
+    return max(0.0, (retry_at - current).total_seconds())
+
+
+class RetryBudget:
+    """
+    Token bucket limiting retries across all requests.
+
+    Every retry takes one token; tokens refill at refill_rate per second up
+    to capacity. When Graylog browns out and most requests fail, retries
+    stop once the bucket is empty instead of multiplying the load.
+    """
+
+    def __init__(
+        self,
+        capacity: float = 10.0,
+        refill_rate: float = 1.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.capacity = capacity
+        self.refill_rate = refill_rate
+        self._clock = clock
+        self._tokens = capacity
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def try_acquire(self) -> bool:
+        """Take one token if available."""
+        with self._lock:
+            now = self._clock()
+            self._tokens = min(
+                self.capacity, self._tokens + (now - self._updated) * self.refill_rate
+            )
+            self._updated = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return True
+            return False
+
+    @property
+    def tokens(self) -> float:
+        """Tokens available at the last acquisition."""
+        return self._tokens
+
+
+class RetryPolicy:
+    """
+    Retry transient Graylog failures for idempotent requests.
+
+    Connection errors, timeouts and 429/502/503/504 responses are retried up
+    to max_attempts total attempts. The delay before retry n is drawn
+    uniformly from [0, min(backoff_max, backoff_base * 2**n)] (full jitter),
+    unless the response carries Retry-After, which is honored as given; a
+    Retry-After longer than backoff_max is not waited for, and neither is a
+    delay that would end past the current deadline. Each retry needs a token
+    from the shared RetryBudget.
+    """
+
+    def __init__(
+        self,
+        max_attempts: int = 3,
+        backoff_base: float = 0.2,
+        backoff_max: float = 5.0,
+        budget: Optional[RetryBudget] = None,
+        sleep: Callable[[float], None] = time.sleep,
+        rng: Callable[[], float] = random.random,
+    ):
+        self.max_attempts = max(1, max_attempts)
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.budget = budget or RetryBudget()
+        self._sleep = sleep
+        self._rng = rng
+        self._lock = threading.Lock()
+        self._counters: Dict[str, int] = {
+            "retries": 0,
+            "recovered": 0,
+            "exhausted": 0,
+            "budget_denied": 0,
+            "retry_after_honored": 0,
+        }
+
+    def backoff(self, attempt: int) -> float:
+        """Get the full-jitter delay before retry number attempt (1-based)."""
+        ceiling = min(self.backoff_max, self.backoff_base * (2.0**attempt))
+        return self._rng() * ceiling
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self._counters[name] += 1
+
+    def call(
+        self, method: str, send: Callable[[], requests.Response]
+    ) -> requests.Response:
+        """
+        Send a request, retrying transient failures.
+
+        Args:
+            method: HTTP method, non-idempotent methods are sent once
+            send: Function performing one attempt
+
+        Returns:
+            The first non-retryable response, or the last response once
+            retries are exhausted
+
+        Raises:
+            The last connection error or timeout once retries are exhausted
+        """
+        if method.upper() not in IDEMPOTENT_METHODS or self.max_attempts == 1:
+            return send()
+
+        attempt = 1
+        while True:
+            retry_after = None
+            try:
+                response = send()
+            except RETRYABLE_EXCEPTIONS as e:
+                failure: Union[requests.Response, Exception] = e
+                reason = type(e).__name__
+            else:
+                if response.status_code not in RETRYABLE_STATUSES:
+                    if attempt > 1:
+                        self._count("recovered")
+                    return response
+                failure = response
+                reason = f"HTTP {response.status_code}"
+                retry_after = parse_retry_after(response.headers.get("Retry-After"))
+
+            delay = self._next_delay(attempt, retry_after)
+            if delay is None:
+                if isinstance(failure, Exception):
+                    raise failure
+                return failure
+
+            logger.warning(
+                f"Retrying {method} after {reason} "
+                f"(attempt {attempt + 1}/{self.max_attempts}) in {delay:.2f}s"
+            )
+            if not isinstance(failure, Exception):
+                failure.close()
+            self._sleep(delay)
+            attempt += 1
+
+    def _next_delay(
+        self, attempt: int, retry_after: Optional[float]
+    ) -> Optional[float]:
+        """Get the delay before the next attempt, or None to give up."""
+        if attempt >= self.max_attempts:
+            self._count("exhausted")
+            return None
+        if retry_after is not None and retry_after > self.backoff_max:
+            self._count("exhausted")
+            return None
+        delay = self.backoff(attempt) if retry_after is None else retry_after
+        left = time_remaining()
+        if left is not None and delay >= left:
+            self._count("exhausted")
+            return None
+        if not self.budget.try_acquire():
+            self._count("budget_denied")
+            return None
+
+        self._count("retries")
+        if retry_after is not None:
+            self._count("retry_after_honored")
+        return delay
+
+    def stats(self) -> Dict[str, Any]:
+        """Return retry counters and the remaining budget."""
+        with self._lock:
+            counters: Dict[str, Any] = dict(self._counters)
+        counters["budget_tokens"] = round(self.budget.tokens, 2)
+        return counters
@@ -1,17 +1,25 @@
 """MCP server for Graylog integration."""
 
+import asyncio
 import json
 import logging
 import os
-from typing import Any, Dict, List, Optional
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
 
 from fastapi import FastAPI, HTTPException
 from fastapi.responses import JSONResponse
 from fastmcp import FastMCP
 from pydantic import BaseModel, Field, validator
 
-from .client import GraylogClient, QueryParams, AggregationParams
+from .client import AggregationParams, AsyncGraylogClient, QueryParams
 from .config import config
+from .cost import estimate_query_cost, rewrite_within_budget
+from .deadline import with_deadline
+from .encoding import ResponseEncoder
+from .ratelimit import INTERACTIVE, request_priority, with_priority
+from .shaping import apply_budget, project_message, slim_search_result
+from .timerange import check_time_range
 
 # Configure logging
 logging.basicConfig(
@@ -26,8 +34,19 @@ app = FastAPI(title="MCP Graylog Server", version="1.0.0")
 # Initialize FastMCP server
 mcp_server = FastMCP("graylog")
 
+# Every Graylog request made for one tool call shares this time budget
+tool_deadline = with_deadline(lambda: config.graylog.tool_deadline)
+
+# Quick lookups queued ahead of bulk searches under the rate limits
+interactive = with_priority(INTERACTIVE)
+
 # Initialize Graylog client
-graylog_client = GraylogClient()
+graylog_client = AsyncGraylogClient()
+
+# Serializer for tool responses (compact unless MCP_SERVER_PRETTY_JSON is set)
+response_encoder = ResponseEncoder(
+    backend=config.server.json_backend, pretty=config.server.pretty_json
+)
 
 
 class SearchLogsRequest(BaseModel):
@@ -36,7 +55,7 @@ class SearchLogsRequest(BaseModel):
     query: str = Field(..., description="Search query (Elasticsearch syntax)")
     time_range: Optional[str] = Field(
         "1h",  # <-- Set default to 1h
-        description="Time range (e.g., '1h', '24h', '7d'). Defaults to '1h' if not specified.",
+        description="Time range: relative ('1h', '7d'), ISO 8601 'from..to' or 'keyword:yesterday'. Defaults to '1h'.",
     )
     fields: Optional[List[str]] = Field(None, description="Fields to return")
     limit: int = Field(50, description="Maximum number of results")
@@ -44,6 +63,27 @@ class SearchLogsRequest(BaseModel):
     sort: Optional[str] = Field(None, description="Sort field")
     sort_direction: str = Field("desc", description="Sort direction (asc/desc)")
     stream_id: Optional[str] = Field(None, description="Stream ID to search in")
+    max_message_bytes: Optional[int] = Field(
+        None, description="Truncate message bodies longer than this many bytes"
+    )
+    raw: bool = Field(
+        False, description="Return the unmodified Graylog response (no slimming)"
+    )
+    max_output_bytes: Optional[int] = Field(
+        None,
+        description="Output budget for messages in bytes (dedupes, truncates, omits)",
+    )
+    max_tokens: Optional[int] = Field(
+        None, description="Output budget for messages in LLM tokens"
+    )
+    probe: bool = Field(
+        False, description="Count and break down matches before fetching messages"
+    )
+    probe_field: str = Field("source", description="Field to break matches down by")
+    fetch_threshold: Optional[int] = Field(
+        None,
+        description="With probe, fetch messages only if at most this many match",
+    )
 
     @validator("query")
     def validate_query(cls, v):
@@ -61,29 +101,26 @@ class SearchLogsRequest(BaseModel):
             raise ValueError("Limit cannot exceed 1000")
         return v
 
+    @validator("max_message_bytes", "max_output_bytes", "max_tokens")
+    def validate_max_message_bytes(cls, v):
+        """Validate size limits are positive."""
+        if v is not None and v < 1:
+            raise ValueError("Size limits must be at least 1")
+        return v
+
+    @validator("fetch_threshold")
+    def validate_fetch_threshold(cls, v):
+        """Validate the fetch threshold is not negative."""
+        if v is not None and v < 0:
+            raise ValueError("Fetch threshold cannot be negative")
+        return v
+
     @validator("time_range")
     def validate_time_range(cls, v):
         """Validate time range format."""
         if v is None:
             return v
-
-        # Check for relative time ranges (e.g., '1h', '24h', '7d')
-        import re
-
-        relative_pattern = r"^\d+[smhdw]$"
-        if re.match(relative_pattern, v):
-            return v
-
-        # Check for ISO 8601 format (absolute time ranges)
-        try:
-            from datetime import datetime
-
-            datetime.fromisoformat(v.replace("Z", "+00:00"))
-            return v
-        except ValueError:
-            raise ValueError(
-                f"Invalid time range format: {v}. Use relative (e.g., '1h') or ISO 8601 format"
-            )
+        return check_time_range(v)
 
 
 class AggregationRequest(BaseModel):
@@ -92,7 +129,7 @@ class AggregationRequest(BaseModel):
     query: str = Field(..., description="Search query")
     time_range: str = Field(
         "1h",
-        description="Time range (e.g., '1h', '24h', '7d'). Defaults to '1h' if not specified.",
+        description="Time range: relative ('1h', '7d'), ISO 8601 'from..to' or 'keyword:yesterday'. Defaults to '1h'.",
     )
     aggregation_type: str = Field(
         ..., description="Aggregation type (terms, date_histogram, etc.)"
@@ -150,24 +187,100 @@ class AggregationRequest(BaseModel):
         """Validate time range format."""
         if not v or not v.strip():
             raise ValueError("Time range is required")
+        return check_time_range(v)
 
-        # Check for relative time ranges (e.g., '1h', '24h', '7d')
-        import re
 
-        relative_pattern = r"^\d+[smhdw]$"
-        if re.match(relative_pattern, v):
-            return v
+class MetricRequest(BaseModel):
+    """One aggregation of a composite statistics request."""
 
-        # Check for ISO 8601 format (absolute time ranges)
-        try:
-            from datetime import datetime
+    name: Optional[str] = Field(
+        None, description="Result key (default: '<aggregation_type>_<field>')"
+    )
+    aggregation_type: str = Field(
+        ..., description="Aggregation type (terms, date_histogram, etc.)"
+    )
+    field: str = Field(..., description="Field to aggregate on")
+    size: int = Field(10, description="Number of buckets")
+    interval: Optional[str] = Field(
+        None, description="Time interval for date histograms"
+    )
 
-            datetime.fromisoformat(v.replace("Z", "+00:00"))
-            return v
-        except ValueError:
+    @validator("aggregation_type")
+    def validate_aggregation_type(cls, v):
+        """Validate aggregation type."""
+        valid_types = [
+            "terms",
+            "date_histogram",
+            "cardinality",
+            "stats",
+            "min",
+            "max",
+            "avg",
+            "sum",
+        ]
+        if v not in valid_types:
             raise ValueError(
-                f"Invalid time range format: {v}. Use relative (e.g., '1h') or ISO 8601 format"
+                f"Invalid aggregation type: {v}. Valid types: {valid_types}"
             )
+        return v
+
+    @validator("field")
+    def validate_field(cls, v):
+        """Validate that field is not empty."""
+        if not v or not v.strip():
+            raise ValueError("Field cannot be empty")
+        return v.strip()
+
+    @validator("size")
+    def validate_size(cls, v):
+        """Validate size is within reasonable bounds."""
+        if v < 1:
+            raise ValueError("Size must be at least 1")
+        if v > 100:
+            raise ValueError("Size cannot exceed 100")
+        return v
+
+
+class CompositeAggregationRequest(BaseModel):
+    """Request model for several aggregations computed in one search."""
+
+    query: str = Field(..., description="Search query")
+    time_range: str = Field(
+        "1h",
+        description="Time range: relative ('24h'), ISO 8601 'from..to' or 'keyword:yesterday'",
+    )
+    metrics: List[MetricRequest] = Field(
+        ..., description="Aggregations to compute (1-20)"
+    )
+    stream_ids: Optional[List[str]] = Field(
+        None, description="Restrict the aggregations to these streams"
+    )
+
+    @validator("query")
+    def validate_query(cls, v):
+        """Validate that query is not empty."""
+        if not v or not v.strip():
+            raise ValueError("Query cannot be empty")
+        return v.strip()
+
+    @validator("metrics")
+    def validate_metrics(cls, v):
+        """Validate the number of metrics and that their names are unique."""
+        if not v:
+            raise ValueError("At least one metric is required")
+        if len(v) > 20:
+            raise ValueError("Cannot compute more than 20 metrics at once")
+        names = [m.name or f"{m.aggregation_type}_{m.field}" for m in v]
+        if len(set(names)) != len(names):
+            raise ValueError(f"Metric names must be unique: {names}")
+        return v
+
+    @validator("time_range")
+    def validate_time_range(cls, v):
+        """Validate time range format."""
+        if not v or not v.strip():
+            raise ValueError("Time range is required")
+        return check_time_range(v)
 
 
 class StreamSearchRequest(BaseModel):
@@ -182,12 +295,32 @@ class StreamSearchRequest(BaseModel):
     )
     time_range: Optional[str] = Field(
         "1h",
-        description="Time range (e.g., '1h', '24h', '7d'). Defaults to '1h' if not specified.",
+        description="Time range: relative ('1h', '7d'), ISO 8601 'from..to' or 'keyword:yesterday'. Defaults to '1h'.",
     )
     fields: Optional[List[str]] = Field(
         None, description="Fields to return (e.g., ['message', 'level', 'source'])"
     )
     limit: int = Field(50, description="Maximum number of results (1-100)")
+    max_message_bytes: Optional[int] = Field(
+        None, description="Truncate message bodies longer than this many bytes"
+    )
+    raw: bool = Field(
+        False, description="Return the unmodified Graylog response (no slimming)"
+    )
+    max_output_bytes: Optional[int] = Field(
+        None,
+        description="Output budget for messages in bytes (dedupes, truncates, omits)",
+    )
+    max_tokens: Optional[int] = Field(
+        None, description="Output budget for messages in LLM tokens"
+    )
+
+    @validator("max_message_bytes", "max_output_bytes", "max_tokens")
+    def validate_max_message_bytes(cls, v):
+        """Validate size limits are positive."""
+        if v is not None and v < 1:
+            raise ValueError("Size limits must be at least 1")
+        return v
 
     @validator("stream_id")
     def validate_stream_id(cls, v):
@@ -217,24 +350,500 @@ class StreamSearchRequest(BaseModel):
         """Validate time range format."""
         if v is None:
             return v
+        return check_time_range(v)
+
+
+class ParallelStreamSearchRequest(BaseModel):
+    """Request model for searching several streams concurrently."""
+
+    streams: List[str] = Field(
+        ...,
+        description="Stream IDs or stream-name patterns (e.g., ['nginx-*', 'payments'])",
+    )
+    query: str = Field(
+        ...,
+        description="Search query (e.g., '*' for all messages, 'level:ERROR' for errors)",
+    )
+    time_range: Optional[str] = Field(
+        "1h",
+        description="Time range: relative ('1h', '7d'), ISO 8601 'from..to' or 'keyword:yesterday'. Defaults to '1h'.",
+    )
+    fields: Optional[List[str]] = Field(
+        None, description="Fields to return (e.g., ['message', 'level', 'source'])"
+    )
+    limit: int = Field(100, description="Maximum number of merged results (1-1000)")
+    sort_direction: str = Field(
+        "desc", description="Timestamp order: 'desc' (newest first) or 'asc'"
+    )
+    max_concurrency: Optional[int] = Field(
+        None, description="Streams searched at once (default: server setting)"
+    )
+    max_message_bytes: Optional[int] = Field(
+        None, description="Truncate message bodies longer than this many bytes"
+    )
+    max_output_bytes: Optional[int] = Field(
+        None,
+        description="Output budget for messages in bytes (dedupes, truncates, omits)",
+    )
+    max_tokens: Optional[int] = Field(
+        None, description="Output budget for messages in LLM tokens"
+    )
 
-        # Check for relative time ranges (e.g., '1h', '24h', '7d')
-        import re
+    @validator("max_message_bytes", "max_output_bytes", "max_tokens")
+    def validate_max_message_bytes(cls, v):
+        """Validate size limits are positive."""
+        if v is not None and v < 1:
+            raise ValueError("Size limits must be at least 1")
+        return v
 
-        relative_pattern = r"^\d+[smhdw]$"
-        if re.match(relative_pattern, v):
+    @validator("streams")
+    def validate_streams(cls, v):
+        """Validate that at least one stream is given."""
+        v = [stream.strip() for stream in v if stream and stream.strip()]
+        if not v:
+            raise ValueError("At least one stream is required")
+        if len(v) > 100:
+            raise ValueError("Cannot search more than 100 streams at once")
+        return v
+
+    @validator("query")
+    def validate_query(cls, v):
+        """Validate that query is not empty."""
+        if not v or not v.strip():
+            raise ValueError("Query cannot be empty")
+        return v.strip()
+
+    @validator("limit")
+    def validate_limit(cls, v):
+        """Validate limit is within reasonable bounds."""
+        if v < 1:
+            raise ValueError("Limit must be at least 1")
+        if v > 1000:
+            raise ValueError("Limit cannot exceed 1000")
+        return v
+
+    @validator("sort_direction")
+    def validate_sort_direction(cls, v):
+        """Validate sort direction."""
+        if v not in ("asc", "desc"):
+            raise ValueError("Sort direction must be 'asc' or 'desc'")
+        return v
+
+    @validator("max_concurrency")
+    def validate_max_concurrency(cls, v):
+        """Validate concurrency is positive."""
+        if v is not None and v < 1:
+            raise ValueError("Max concurrency must be at least 1")
+        return v
+
+    @validator("time_range")
+    def validate_time_range(cls, v):
+        """Validate time range format."""
+        if v is None:
             return v
+        return check_time_range(v)
 
-        # Check for ISO 8601 format (absolute time ranges)
-        try:
-            from datetime import datetime
 
-            datetime.fromisoformat(v.replace("Z", "+00:00"))
+class PagedSearchRequest(BaseModel):
+    """Request model for cursor-based paginated log searches."""
+
+    query: Optional[str] = Field(
+        None, description="Search query (required unless resuming a cursor)"
+    )
+    time_range: Optional[str] = Field(
+        "1h",
+        description="Time range: relative ('1h', '7d'), ISO 8601 'from..to' or 'keyword:yesterday'. Defaults to '1h'.",
+    )
+    fields: Optional[List[str]] = Field(None, description="Fields to return")
+    sort_direction: str = Field(
+        "desc", description="Timestamp sort direction (asc/desc)"
+    )
+    stream_id: Optional[str] = Field(None, description="Stream ID to search in")
+    page_size: int = Field(500, description="Messages returned per call (1-1000)")
+    max_messages: Optional[int] = Field(
+        None, description="Total messages to return across all pages (default: all)"
+    )
+    cursor: Optional[str] = Field(
+        None, description="Cursor token from a previous call to resume from"
+    )
+    max_message_bytes: Optional[int] = Field(
+        None, description="Truncate message bodies longer than this many bytes"
+    )
+
+    @validator("page_size")
+    def validate_page_size(cls, v):
+        """Validate page size is within reasonable bounds."""
+        if v < 1:
+            raise ValueError("Page size must be at least 1")
+        if v > 1000:
+            raise ValueError("Page size cannot exceed 1000")
+        return v
+
+    @validator("max_messages", "max_message_bytes")
+    def validate_positive(cls, v):
+        """Validate optional counts are positive."""
+        if v is not None and v < 1:
+            raise ValueError("Value must be at least 1")
+        return v
+
+    @validator("time_range")
+    def validate_time_range(cls, v):
+        """Validate time range format."""
+        if v is None:
             return v
-        except ValueError:
-            raise ValueError(
-                f"Invalid time range format: {v}. Use relative (e.g., '1h') or ISO 8601 format"
-            )
+        return check_time_range(v)
+
+
+class ExportLogsRequest(BaseModel):
+    """Request model for bulk CSV exports."""
+
+    query: str = Field(..., description="Search query (Elasticsearch syntax)")
+    time_range: str = Field(
+        "1h",
+        description="Time range: relative ('24h'), ISO 8601 'from..to' or 'keyword:yesterday'. Defaults to '1h'.",
+    )
+    fields: Optional[List[str]] = Field(
+        None,
+        description="Columns to export, in order (default: timestamp, source, message)",
+    )
+    stream_ids: Optional[List[str]] = Field(None, description="Streams to export from")
+    limit: Optional[int] = Field(
+        None, description="Maximum number of messages (default: all)"
+    )
+    filename: Optional[str] = Field(
+        None, description="Output file name inside the export directory"
+    )
+
+    @validator("query")
+    def validate_query(cls, v):
+        """Validate that query is not empty."""
+        if not v or not v.strip():
+            raise ValueError("Query cannot be empty")
+        return v.strip()
+
+    @validator("limit")
+    def validate_limit(cls, v):
+        """Validate limit is positive."""
+        if v is not None and v < 1:
+            raise ValueError("Limit must be at least 1")
+        return v
+
+    @validator("time_range")
+    def validate_time_range(cls, v):
+        """Validate time range format."""
+        if not v or not v.strip():
+            raise ValueError("Time range is required")
+        return check_time_range(v)
+
+
+class StreamInfoRequest(BaseModel):
+    """Request model for looking up a single stream."""
+
+    stream_id: str = Field(..., description="Stream ID")
+
+    @validator("stream_id")
+    def validate_stream_id(cls, v):
+        """Validate that stream_id is not empty."""
+        if not v or not v.strip():
+            raise ValueError("Stream ID cannot be empty")
+        return v.strip()
+
+
+class StreamNameRequest(BaseModel):
+    """Request model for finding streams by name."""
+
+    stream_name: str = Field(..., description="Partial or full stream name")
+
+    @validator("stream_name")
+    def validate_stream_name(cls, v):
+        """Validate that stream_name is not empty."""
+        if not v or not v.strip():
+            raise ValueError("Stream name cannot be empty")
+        return v.strip()
+
+
+class BatchOperation(BaseModel):
+    """One operation of a batch request."""
+
+    op: str = Field(..., description="Operation name (e.g., 'search_logs')")
+    params: Dict[str, Any] = Field(
+        default_factory=dict, description="Parameters for the operation"
+    )
+
+
+class BatchRequest(BaseModel):
+    """Request model for running several operations in one call."""
+
+    operations: List[BatchOperation] = Field(
+        ..., description="Operations to run (1-50), results are returned in order"
+    )
+    max_concurrency: Optional[int] = Field(
+        None, description="Operations run at once (default: server setting)"
+    )
+
+    @validator("operations")
+    def validate_operations(cls, v):
+        """Validate the number of operations."""
+        if not v:
+            raise ValueError("At least one operation is required")
+        if len(v) > 50:
+            raise ValueError("Cannot run more than 50 operations in one batch")
+        return v
+
+    @validator("max_concurrency")
+    def validate_max_concurrency(cls, v):
+        """Validate concurrency is positive."""
+        if v is not None and v < 1:
+            raise ValueError("Max concurrency must be at least 1")
+        return v
+
+
+def _gate_query_cost(request: Any) -> Tuple[Any, Optional[Dict[str, Any]]]:
+    """
+    Apply the query cost thresholds to a search request.
+
+    Returns the request to run, with a narrower time range or lower limit if
+    it was rewritten or with probe set if it is counted first, and a cost
+    report to add to the result (None for cheap searches). Raises ValueError
+    if the search is rejected.
+    """
+    settings = config.graylog
+    cost = estimate_query_cost(request.query, request.time_range, request.limit)
+    if cost.score <= settings.query_cost_warn:
+        return request, None
+
+    report: Dict[str, Any] = {"score": cost.score, "reasons": cost.reasons}
+    if cost.score <= settings.query_cost_max or settings.query_cost_action == "warn":
+        report["warning"] = (
+            "Expensive search: narrow the time range, avoid leading wildcards "
+            "and regular expressions, or lower the limit"
+        )
+        return request, report
+
+    if settings.query_cost_action == "reject":
+        raise ValueError(
+            f"Search rejected as too expensive (estimated cost {cost.score}, "
+            f"maximum {settings.query_cost_max}): {', '.join(cost.reasons)}. "
+            "Narrow the time range, avoid leading wildcards and regular "
+            "expressions, or lower the limit"
+        )
+
+    if settings.query_cost_action == "probe" and "probe" in type(request).model_fields:
+        report["probed"] = True
+        report["warning"] = (
+            "Expensive search: counted the matches first, messages are only "
+            "fetched if few match"
+        )
+        logger.warning(f"Probing expensive search (cost {cost.score}) first")
+        return request.model_copy(update={"probe": True}), report
+
+    # Searches without a probe mode are rewritten
+    time_range, limit = rewrite_within_budget(
+        cost, request.time_range, request.limit, settings.query_cost_max
+    )
+    rewritten: Dict[str, Any] = {}
+    if time_range != request.time_range:
+        rewritten["time_range"] = {"from": request.time_range, "to": time_range}
+    if limit != request.limit:
+        rewritten["limit"] = {"from": request.limit, "to": limit}
+    report["rewritten"] = rewritten
+    logger.warning(f"Rewrote expensive search (cost {cost.score}): {rewritten}")
+    return request.model_copy(update={"time_range": time_range, "limit": limit}), report
+
+
+async def _search_logs(request: SearchLogsRequest) -> Dict[str, Any]:
+    """Run a validated search_logs request and shape the result."""
+    request, cost_report = _gate_query_cost(request)
+    params = QueryParams(
+        query=request.query,
+        time_range=request.time_range,
+        fields=request.fields,
+        limit=request.limit,
+        offset=request.offset,
+        sort=request.sort,
+        sort_direction=request.sort_direction,
+        stream_id=request.stream_id,
+    )
+
+    probe = None
+    if request.probe:
+        probe = await graylog_client.probe_search(params, request.probe_field)
+        threshold = request.fetch_threshold
+        if threshold is None:
+            threshold = config.graylog.probe_fetch_threshold
+        total = probe["total_results"]
+        if total is not None and (total == 0 or total > threshold):
+            result = dict(probe, messages=[], messages_fetched=False)
+            if total:
+                result["hint"] = (
+                    f"{total} messages match, more than the fetch threshold of "
+                    f"{threshold}. Narrow the query using the breakdown, or set "
+                    "probe to false to fetch them"
+                )
+            if cost_report:
+                result["query_cost"] = cost_report
+            return result
+
+    result = await graylog_client.search_logs(params)
+    if not request.raw:
+        result = slim_search_result(result, request.fields, request.max_message_bytes)
+        result = apply_budget(result, request.max_output_bytes, request.max_tokens)
+    if probe:
+        result = dict(result, breakdown=probe["breakdown"], messages_fetched=True)
+    if cost_report:
+        result = dict(result, query_cost=cost_report)
+    return result
+
+
+async def _get_log_statistics(request: AggregationRequest) -> Dict[str, Any]:
+    """Run a validated get_log_statistics request."""
+    aggregation = AggregationParams(
+        type=request.aggregation_type,
+        field=request.field,
+        size=request.size,
+        interval=request.interval,
+    )
+
+    return await graylog_client.get_log_statistics(
+        query=request.query, time_range=request.time_range, aggregation=aggregation
+    )
+
+
+async def _get_composite_statistics(
+    request: CompositeAggregationRequest,
+) -> Dict[str, Any]:
+    """Run a validated get_composite_statistics request."""
+    metrics = {}
+    for metric in request.metrics:
+        name = metric.name or f"{metric.aggregation_type}_{metric.field}"
+        metrics[name] = AggregationParams(
+            type=metric.aggregation_type,
+            field=metric.field,
+            size=metric.size,
+            interval=metric.interval,
+        )
+
+    return await graylog_client.get_composite_statistics(
+        query=request.query,
+        time_range=request.time_range,
+        metrics=metrics,
+        stream_ids=request.stream_ids,
+    )
+
+
+async def _search_stream_logs(request: StreamSearchRequest) -> Dict[str, Any]:
+    """Run a validated search_stream_logs request and shape the result."""
+    request, cost_report = _gate_query_cost(request)
+    params = QueryParams(
+        query=request.query,
+        time_range=request.time_range,
+        fields=request.fields,
+        limit=request.limit,
+        stream_id=request.stream_id,
+    )
+
+    result = await graylog_client.search_stream_logs(request.stream_id, params)
+    if not request.raw:
+        result = slim_search_result(result, request.fields, request.max_message_bytes)
+        result = apply_budget(result, request.max_output_bytes, request.max_tokens)
+    if cost_report:
+        result = dict(result, query_cost=cost_report)
+    return result
+
+
+async def _search_streams_parallel(
+    request: ParallelStreamSearchRequest,
+) -> Dict[str, Any]:
+    """Run a validated search_streams_parallel request and shape the result."""
+    request, cost_report = _gate_query_cost(request)
+    params = QueryParams(
+        query=request.query,
+        time_range=request.time_range,
+        fields=request.fields,
+        limit=request.limit,
+        sort_direction=request.sort_direction,
+    )
+
+    result = await graylog_client.search_streams_parallel(
+        params, request.streams, request.max_concurrency
+    )
+    result["messages"] = [
+        dict(
+            project_message(message, request.fields, request.max_message_bytes),
+            stream_id=message["stream_id"],
+        )
+        for message in result["messages"]
+    ]
+    result = apply_budget(result, request.max_output_bytes, request.max_tokens)
+    if cost_report:
+        result = dict(result, query_cost=cost_report)
+    return result
+
+
+async def _get_stream_info(request: StreamInfoRequest) -> Dict[str, Any]:
+    """Run a validated get_stream_info request."""
+    return await graylog_client.get_stream_info(request.stream_id)
+
+
+async def _search_streams_by_name(request: StreamNameRequest) -> Dict[str, Any]:
+    """Find streams whose title contains the requested name."""
+    # Served from the cached stream catalog's title index
+    matches = await graylog_client.search_streams_by_name(request.stream_name)
+
+    matching_streams = [
+        {
+            "id": stream.get("id"),
+            "title": stream.get("title"),
+            "description": stream.get("description"),
+            "disabled": stream.get("disabled", False),
+        }
+        for stream in matches
+    ]
+
+    return {
+        "search_term": request.stream_name,
+        "matches": matching_streams,
+        "total_matches": len(matching_streams),
+    }
+
+
+async def _list_streams(request: Optional[BaseModel]) -> Dict[str, Any]:
+    """List all streams."""
+    return {"streams": await graylog_client.list_streams()}
+
+
+# Operations accepted by the batch tool: name -> (request model, runner)
+BATCH_OPERATIONS: Dict[
+    str, Tuple[Optional[type], Callable[[Any], Awaitable[Dict[str, Any]]]]
+] = {
+    "search_logs": (SearchLogsRequest, _search_logs),
+    "search_stream_logs": (StreamSearchRequest, _search_stream_logs),
+    "search_streams_parallel": (ParallelStreamSearchRequest, _search_streams_parallel),
+    "get_log_statistics": (AggregationRequest, _get_log_statistics),
+    "get_composite_statistics": (
+        CompositeAggregationRequest,
+        _get_composite_statistics,
+    ),
+    "get_stream_info": (StreamInfoRequest, _get_stream_info),
+    "search_streams_by_name": (StreamNameRequest, _search_streams_by_name),
+    "list_streams": (None, _list_streams),
+}
+
+
+def component_stats() -> Dict[str, Any]:
+    """Collect counters from the Graylog client components."""
+    client = graylog_client.client
+    return {
+        "connection_pool": client.adapter.stats(),
+        "retries": client.retry_policy.stats(),
+        "circuit_breakers": client.breakers.stats(),
+        "rate_limits": client.rate_limiters.stats(),
+        "cache": client.cache.stats(),
+        "coalescing": client.single_flight.stats(),
+        "histograms": client.histograms.stats(),
+        "stream_catalog": client.stream_catalog.stats(),
+        "search_cursors": graylog_client.cursors.stats(),
+    }
 
 
 # Health check endpoint
@@ -242,12 +851,25 @@ class StreamSearchRequest(BaseModel):
 async def health_check():
     """Basic health check endpoint."""
     try:
-        is_connected = graylog_client.test_connection()
+        with request_priority(INTERACTIVE):
+            is_connected = await graylog_client.test_connection()
+        stats = component_stats()
+        breakers_open = any(
+            breaker["state"] != "closed"
+            for breaker in stats["circuit_breakers"].values()
+        )
+        if not is_connected:
+            status = "unhealthy"
+        elif breakers_open:
+            status = "degraded"
+        else:
+            status = "healthy"
 
         health_status = {
-            "status": "healthy" if is_connected else "unhealthy",
+            "status": status,
             "graylog_connected": is_connected,
             "graylog_endpoint": config.graylog.endpoint,
+            **stats,
             "server_config": {"host": config.server.host, "port": config.server.port},
         }
 
@@ -265,6 +887,12 @@ async def health_check():
         )
 
 
+@app.get("/metrics")
+async def metrics() -> JSONResponse:
+    """Connection pool, cache and request counters, without contacting Graylog."""
+    return JSONResponse(content=component_stats())
+
+
 @app.get("/")
 async def root():
     """Root endpoint with server information."""
@@ -273,13 +901,15 @@ async def root():
         "version": "1.0.0",
         "endpoints": {
             "health_check": "/health_check",
+            "metrics": "/metrics",
             "mcp_server": "Available via MCP protocol",
         },
     }
 
 
 @mcp_server.tool()
-def search_logs(request: SearchLogsRequest) -> str:
+@tool_deadline
+async def search_logs(request: SearchLogsRequest) -> str:
     """
     Search logs in Graylog using Elasticsearch query syntax.
 
@@ -288,15 +918,28 @@ def search_logs(request: SearchLogsRequest) -> str:
     INPUT FORMAT: JSON object with the following structure:
     {
         "query": "level:ERROR AND source:nginx",  // REQUIRED: Elasticsearch query syntax
-        "time_range": "1h",                       // OPTIONAL: Time range (1h, 24h, 7d, etc.)
+        "time_range": "1h",                       // OPTIONAL: Time range (1h, 7d, "<from>..<to>", "keyword:yesterday")
         "fields": ["message", "level", "source"], // OPTIONAL: Specific fields to return
         "limit": 50,                              // OPTIONAL: Max results (1-1000, default: 50)
         "offset": 0,                              // OPTIONAL: Pagination offset
         "sort": "timestamp",                      // OPTIONAL: Sort field
         "sort_direction": "desc",                 // OPTIONAL: asc/desc
-        "stream_id": "stream_123"                 // OPTIONAL: Filter by specific stream
+        "stream_id": "stream_123",                // OPTIONAL: Filter by specific stream
+        "max_message_bytes": 2000,                // OPTIONAL: Truncate long message bodies
+        "max_tokens": 8000,                       // OPTIONAL: Output budget in LLM tokens
+        "max_output_bytes": 32000,                // OPTIONAL: Output budget in bytes
+        "raw": false,                             // OPTIONAL: Return the unmodified Graylog response
+        "probe": true,                            // OPTIONAL: Count and break down matches first
+        "probe_field": "source",                  // OPTIONAL: Breakdown field for probe (default: source)
+        "fetch_threshold": 50                     // OPTIONAL: With probe, fetch only up to this many matches
     }
 
+    PROBE MODE: With probe, one count query returns total_results and a breakdown of the matches by probe_field without any message bodies. Messages are fetched only when at most fetch_threshold (default GRAYLOG_PROBE_FETCH_THRESHOLD) match; otherwise "messages" is empty, "messages_fetched" is false and a hint explains how to fetch them. Use it to answer "is anything broken?" cheaply.
+
+    BUDGETED OUTPUT: With max_tokens or max_output_bytes, repeated messages are collapsed into one with a "_count", long bodies are truncated to a share of the budget, and messages beyond the budget are omitted; the "budget" key reports what was dropped.
+
+    TIME RANGES: "15m", "24h", "7d" (relative); "2024-01-01T10:00:00Z..2024-01-01T10:20:00Z" (absolute window, searches only those 20 minutes); "2024-01-01T10:00:00Z" (from then until now); "keyword:yesterday" (Graylog keyword). Prefer an absolute window over a wide relative range when investigating a past incident.
+
     QUERY EXAMPLES:
     - "*" (all logs)
     - "level:ERROR" (error logs only)
@@ -304,7 +947,7 @@ def search_logs(request: SearchLogsRequest) -> str:
     - "message:*error*" (logs containing "error")
     - "timestamp:[2024-01-01 TO 2024-01-02]" (date range)
 
-    OUTPUT: JSON string with search results including messages, metadata, and pagination info.
+    OUTPUT: JSON string with total_results, query, time and from/to, plus messages reduced to the requested fields (Graylog envelope metadata such as index and highlight_ranges is stripped unless raw is true).
     """
     # --- BEGIN PATCH ---
     # Accept both dict and string input for request
@@ -313,42 +956,179 @@ def search_logs(request: SearchLogsRequest) -> str:
             request_dict = json.loads(request)
             request = SearchLogsRequest(**request_dict)
         except Exception as e:
-            return json.dumps(
+            return response_encoder.encode(
                 {
                     "error": f"Request must be a JSON object or a JSON string that can be parsed into an object. Error: {str(e)}"
-                },
-                indent=2,
+                }
             )
     # --- END PATCH ---
     try:
         # Validate request
         if not request.query:
-            return json.dumps({"error": "Query parameter is required"}, indent=2)
+            return response_encoder.encode({"error": "Query parameter is required"})
 
-        params = QueryParams(
+        return response_encoder.encode(await _search_logs(request))
+
+    except ValueError as e:
+        logger.error(f"Validation error in search_logs: {e}")
+        return response_encoder.encode({"error": f"Validation error: {str(e)}"})
+    except Exception as e:
+        logger.error(f"Search logs failed: {e}")
+        return response_encoder.encode({"error": str(e)})
+
+
+@mcp_server.tool()
+@tool_deadline
+async def search_logs_paged(request: PagedSearchRequest) -> str:
+    """
+    Page through large search results using resumable cursor tokens.
+
+    PURPOSE: Retrieve result sets larger than the 1000-message search_logs cap (e.g. post-incident exports) without re-running the query from the start for every page.
+
+    INPUT FORMAT: JSON object with the following structure:
+    {
+        "query": "level:ERROR",                   // REQUIRED on first call: Elasticsearch query syntax
+        "time_range": "24h",                      // OPTIONAL: Time range (default: 1h)
+        "fields": ["message", "level", "source"], // OPTIONAL: Specific fields to return
+        "sort_direction": "desc",                 // OPTIONAL: Timestamp order, asc/desc
+        "stream_id": "stream_123",                // OPTIONAL: Filter by specific stream
+        "page_size": 500,                         // OPTIONAL: Messages per call (1-1000, default: 500)
+        "max_messages": 50000,                    // OPTIONAL: Total messages across all calls
+        "cursor": "token",                        // OPTIONAL: Resume from a previous call
+        "max_message_bytes": 2000                 // OPTIONAL: Truncate long message bodies
+    }
+
+    BEHAVIOR:
+    - The first call opens a server-side cursor and returns the first page
+    - Pass "next_cursor" back as "cursor" to get the next page; search fields other than fields and max_message_bytes are then ignored
+    - Messages are returned without the Graylog envelope, reduced to the requested fields
+    - Messages come in timestamp order and are paged by time, so results are not capped at Elasticsearch's 10000-message result window
+    - Following pages are prefetched in the background while you process the current one
+    - Cursors expire after a period of inactivity
+
+    OUTPUT: JSON string with:
+    {
+        "messages": [...],
+        "returned": 500,
+        "total_returned": 1000,
+        "next_cursor": "token" or null when the results are exhausted
+    }
+    """
+    if isinstance(request, str):
+        return response_encoder.encode(
+            {"error": "Request must be a JSON object, not a string."}
+        )
+    try:
+        token = request.cursor
+        if not token:
+            if not request.query or not request.query.strip():
+                return response_encoder.encode(
+                    {"error": "Query is required when no cursor is given"}
+                )
+
+            params = QueryParams(
+                query=request.query.strip(),
+                time_range=request.time_range,
+                fields=request.fields,
+                sort="timestamp",
+                sort_direction=request.sort_direction,
+                stream_id=request.stream_id,
+            )
+            token = graylog_client.open_search_cursor(
+                params, page_size=request.page_size, max_messages=request.max_messages
+            )
+
+        messages, next_cursor, total_returned = await graylog_client.read_search_cursor(
+            token, request.page_size
+        )
+        messages = [
+            project_message(message, request.fields, request.max_message_bytes)
+            for message in messages
+        ]
+        return response_encoder.encode(
+            {
+                "messages": messages,
+                "returned": len(messages),
+                "total_returned": total_returned,
+                "next_cursor": next_cursor,
+            }
+        )
+
+    except KeyError as e:
+        logger.error(f"Cursor error in search_logs_paged: {e}")
+        return response_encoder.encode({"error": str(e).strip("'")})
+    except ValueError as e:
+        logger.error(f"Validation error in search_logs_paged: {e}")
+        return response_encoder.encode({"error": f"Validation error: {str(e)}"})
+    except Exception as e:
+        logger.error(f"Search logs paged failed: {e}")
+        return response_encoder.encode({"error": str(e)})
+
+
+@mcp_server.tool()
+@tool_deadline
+async def export_logs(request: ExportLogsRequest) -> str:
+    """
+    Bulk-export log messages to a CSV file on the server.
+
+    PURPOSE: Pull large volumes of messages (e.g. a full day of a noisy stream) using Graylog's streaming export instead of offset paging, which slows down and times out on deep offsets.
+
+    INPUT FORMAT: JSON object with the following structure:
+    {
+        "query": "source:payments",                  // REQUIRED: Elasticsearch query syntax
+        "time_range": "24h",                         // OPTIONAL: Time range, relative or "<from>..<to>" (default: 1h)
+        "fields": ["timestamp", "source", "message"], // OPTIONAL: Columns in order
+        "stream_ids": ["5abb3f2f7bb9fd00011595fe"],  // OPTIONAL: Streams to export from
+        "limit": 1000000,                            // OPTIONAL: Maximum messages (default: all)
+        "filename": "payments.csv"                   // OPTIONAL: Output file name
+    }
+
+    REQUIREMENTS: The server must be started with GRAYLOG_EXPORT_DIR set; files are written inside that directory only.
+
+    OUTPUT: JSON string with the written file path and size:
+    {
+        "path": "/exports/payments.csv",
+        "bytes": 104857600
+    }
+    """
+    if isinstance(request, str):
+        return response_encoder.encode(
+            {"error": "Request must be a JSON object, not a string."}
+        )
+    try:
+        export_dir = config.graylog.export_dir
+        if not export_dir:
+            return response_encoder.encode(
+                {"error": "Exports are disabled - set GRAYLOG_EXPORT_DIR"}
+            )
+
+        filename = os.path.basename(request.filename or "")
+        if not filename:
+            filename = f"graylog-export-{int(time.time())}.csv"
+        os.makedirs(export_dir, exist_ok=True)
+        path = os.path.join(export_dir, filename)
+
+        result = await graylog_client.export_to_file(
+            path,
             query=request.query,
             time_range=request.time_range,
             fields=request.fields,
+            stream_ids=request.stream_ids,
             limit=request.limit,
-            offset=request.offset,
-            sort=request.sort,
-            sort_direction=request.sort_direction,
-            stream_id=request.stream_id,
         )
-
-        result = graylog_client.search_logs(params)
-        return json.dumps(result, indent=2)
+        return response_encoder.encode(result)
 
     except ValueError as e:
-        logger.error(f"Validation error in search_logs: {e}")
-        return json.dumps({"error": f"Validation error: {str(e)}"}, indent=2)
+        logger.error(f"Validation error in export_logs: {e}")
+        return response_encoder.encode({"error": f"Validation error: {str(e)}"})
     except Exception as e:
-        logger.error(f"Search logs failed: {e}")
-        return json.dumps({"error": str(e)}, indent=2)
+        logger.error(f"Export logs failed: {e}")
+        return response_encoder.encode({"error": str(e)})
 
 
 @mcp_server.tool()
-def get_log_statistics(request: AggregationRequest) -> str:
+@tool_deadline
+async def get_log_statistics(request: AggregationRequest) -> str:
     """
     Get log statistics and aggregations from Graylog.
 
@@ -380,40 +1160,79 @@ def get_log_statistics(request: AggregationRequest) -> str:
     OUTPUT: JSON string with aggregation results including buckets, counts, and statistics.
     """
     if isinstance(request, str):
-        return json.dumps(
-            {"error": "Request must be a JSON object, not a string."}, indent=2
+        return response_encoder.encode(
+            {"error": "Request must be a JSON object, not a string."}
         )
     try:
         # Validate request
         if not request.query:
-            return json.dumps({"error": "Query parameter is required"}, indent=2)
+            return response_encoder.encode({"error": "Query parameter is required"})
         if not request.field:
-            return json.dumps({"error": "Field parameter is required"}, indent=2)
+            return response_encoder.encode({"error": "Field parameter is required"})
         if not request.time_range:
-            return json.dumps({"error": "Time range parameter is required"}, indent=2)
-
-        aggregation = AggregationParams(
-            type=request.aggregation_type,
-            field=request.field,
-            size=request.size,
-            interval=request.interval,
-        )
+            return response_encoder.encode(
+                {"error": "Time range parameter is required"}
+            )
 
-        result = graylog_client.get_log_statistics(
-            query=request.query, time_range=request.time_range, aggregation=aggregation
-        )
-        return json.dumps(result, indent=2)
+        return response_encoder.encode(await _get_log_statistics(request))
 
     except ValueError as e:
         logger.error(f"Validation error in get_log_statistics: {e}")
-        return json.dumps({"error": f"Validation error: {str(e)}"}, indent=2)
+        return response_encoder.encode({"error": f"Validation error: {str(e)}"})
     except Exception as e:
         logger.error(f"Get log statistics failed: {e}")
-        return json.dumps({"error": str(e)}, indent=2)
+        return response_encoder.encode({"error": str(e)})
 
 
 @mcp_server.tool()
-def list_streams() -> str:
+@tool_deadline
+async def get_composite_statistics(request: CompositeAggregationRequest) -> str:
+    """
+    Compute several aggregations from one Graylog search.
+
+    PURPOSE: Build a dashboard-like summary (count by level, top sources, unique hosts, histogram) in one call. All metrics are compiled into a single Graylog Views search, so Graylog scans the matching logs once instead of once per get_log_statistics call.
+
+    INPUT FORMAT: JSON object with the following structure:
+    {
+        "query": "*",                          // REQUIRED: Search query to filter logs
+        "time_range": "24h",                   // OPTIONAL: Time range, relative or "<from>..<to>" (default: 1h)
+        "metrics": [                           // REQUIRED: 1-20 aggregations
+            {"name": "by_level", "aggregation_type": "terms", "field": "level"},
+            {"name": "top_sources", "aggregation_type": "terms", "field": "source", "size": 5},
+            {"name": "hosts", "aggregation_type": "cardinality", "field": "source"},
+            {"name": "per_hour", "aggregation_type": "date_histogram", "field": "timestamp", "interval": "1h"}
+        ],
+        "stream_ids": ["5abb3f2f7bb9fd00011595fe"]  // OPTIONAL: Restrict to streams
+    }
+
+    AGGREGATION TYPES: Same as get_log_statistics (terms, date_histogram, cardinality, stats, min, max, avg, sum). Names default to "<aggregation_type>_<field>".
+
+    OUTPUT: JSON string with total_results and a "metrics" object keyed by name:
+    - terms: {"terms": {"value": count, ...}, "total": N}
+    - date_histogram: {"results": {"bucket start": count, ...}, "interval": "1h"}
+    - cardinality: {"cardinality": N}
+    - stats: {"count", "min", "max", "avg", "sum"}
+    - min/max/avg/sum: {"value": X}
+    A metric Graylog could not compute carries an "error" instead.
+    """
+    if isinstance(request, str):
+        return response_encoder.encode(
+            {"error": "Request must be a JSON object, not a string."}
+        )
+    try:
+        return response_encoder.encode(await _get_composite_statistics(request))
+
+    except ValueError as e:
+        logger.error(f"Validation error in get_composite_statistics: {e}")
+        return response_encoder.encode({"error": f"Validation error: {str(e)}"})
+    except Exception as e:
+        logger.error(f"Get composite statistics failed: {e}")
+        return response_encoder.encode({"error": str(e)})
+
+
+@mcp_server.tool()
+@tool_deadline
+async def list_streams() -> str:
     """
     List all available Graylog streams.
 
@@ -431,16 +1250,17 @@ def list_streams() -> str:
     - updated_at: Last update timestamp
     """
     try:
-        streams = graylog_client.list_streams()
-        return json.dumps({"streams": streams}, indent=2)
+        streams = await graylog_client.list_streams()
+        return response_encoder.encode({"streams": streams})
 
     except Exception as e:
         logger.error(f"List streams failed: {e}")
-        return json.dumps({"error": str(e)}, indent=2)
+        return response_encoder.encode({"error": str(e)})
 
 
 @mcp_server.tool()
-def get_stream_info(stream_id: str) -> str:
+@tool_deadline
+async def get_stream_info(stream_id: str) -> str:
     """
     Get detailed information about a specific Graylog stream.
 
@@ -458,21 +1278,22 @@ def get_stream_info(stream_id: str) -> str:
     """
     try:
         if not stream_id or not stream_id.strip():
-            return json.dumps({"error": "Stream ID is required"}, indent=2)
+            return response_encoder.encode({"error": "Stream ID is required"})
 
-        stream_info = graylog_client.get_stream_info(stream_id.strip())
-        return json.dumps(stream_info, indent=2)
+        stream_info = await graylog_client.get_stream_info(stream_id.strip())
+        return response_encoder.encode(stream_info)
 
     except ValueError as e:
         logger.error(f"Validation error in get_stream_info: {e}")
-        return json.dumps({"error": f"Validation error: {str(e)}"}, indent=2)
+        return response_encoder.encode({"error": f"Validation error: {str(e)}"})
     except Exception as e:
         logger.error(f"Get stream info failed: {e}")
-        return json.dumps({"error": str(e)}, indent=2)
+        return response_encoder.encode({"error": str(e)})
 
 
 @mcp_server.tool()
-def search_stream_logs(request: StreamSearchRequest) -> str:
+@tool_deadline
+async def search_stream_logs(request: StreamSearchRequest) -> str:
     """
     Search logs within a specific Graylog stream.
 
@@ -484,7 +1305,11 @@ def search_stream_logs(request: StreamSearchRequest) -> str:
         "query": "level:ERROR",                     // REQUIRED: Search query
         "time_range": "1h",                         // OPTIONAL: Time range (default: 1h)
         "fields": ["message", "level", "source"],   // OPTIONAL: Fields to return
-        "limit": 50                                 // OPTIONAL: Max results (1-100, default: 50)
+        "limit": 50,                                // OPTIONAL: Max results (1-100, default: 50)
+        "max_message_bytes": 2000,                  // OPTIONAL: Truncate long message bodies
+        "max_tokens": 8000,                         // OPTIONAL: Output budget in LLM tokens (see search_logs)
+        "max_output_bytes": 32000,                  // OPTIONAL: Output budget in bytes
+        "raw": false                                // OPTIONAL: Return the unmodified Graylog response
     }
 
     QUERY EXAMPLES:
@@ -493,42 +1318,168 @@ def search_stream_logs(request: StreamSearchRequest) -> str:
     - "source:application" (logs from specific source)
     - "message:*exception*" (logs containing "exception")
 
-    OUTPUT: JSON string with search results from the specified stream only.
+    OUTPUT: JSON string with search results from the specified stream only, slimmed like search_logs.
     """
     if isinstance(request, str):
-        return json.dumps(
-            {"error": "Request must be a JSON object, not a string."}, indent=2
+        return response_encoder.encode(
+            {"error": "Request must be a JSON object, not a string."}
         )
     try:
         # Validate request
         if not request.stream_id or not request.stream_id.strip():
-            return json.dumps({"error": "Stream ID is required"}, indent=2)
+            return response_encoder.encode({"error": "Stream ID is required"})
         if not request.query or not request.query.strip():
-            return json.dumps({"error": "Query is required"}, indent=2)
-
-        # Create query parameters for stream search
-        params = QueryParams(
-            query=request.query,
-            time_range=request.time_range,
-            fields=request.fields,
-            limit=request.limit,
-            stream_id=request.stream_id,
-        )
+            return response_encoder.encode({"error": "Query is required"})
 
-        # Use the client's search_stream_logs method
-        result = graylog_client.search_stream_logs(request.stream_id, params)
-        return json.dumps(result, indent=2)
+        return response_encoder.encode(await _search_stream_logs(request))
 
     except ValueError as e:
         logger.error(f"Validation error in search_stream_logs: {e}")
-        return json.dumps({"error": f"Validation error: {str(e)}"}, indent=2)
+        return response_encoder.encode({"error": f"Validation error: {str(e)}"})
     except Exception as e:
         logger.error(f"Search stream logs failed: {e}")
-        return json.dumps({"error": str(e)}, indent=2)
+        return response_encoder.encode({"error": str(e)})
 
 
 @mcp_server.tool()
-def get_system_info() -> str:
+@tool_deadline
+async def search_streams_parallel(request: ParallelStreamSearchRequest) -> str:
+    """
+    Run the same search across several Graylog streams at once.
+
+    PURPOSE: Search 10-30 streams in one call instead of one search_stream_logs call per stream. Streams are searched concurrently and the results merged into a single timeline.
+
+    INPUT FORMAT: JSON object with the following structure:
+    {
+        "streams": ["nginx-*", "payments", "5abb3f2f7bb9fd00011595fe"],  // REQUIRED: IDs or name patterns
+        "query": "level:ERROR",                     // REQUIRED: Search query
+        "time_range": "1h",                         // OPTIONAL: Time range (default: 1h)
+        "fields": ["message", "level", "source"],   // OPTIONAL: Fields to return
+        "limit": 100,                               // OPTIONAL: Max merged results (1-1000, default: 100)
+        "sort_direction": "desc",                   // OPTIONAL: Newest first (desc) or oldest first (asc)
+        "max_concurrency": 8,                       // OPTIONAL: Streams searched at once
+        "max_message_bytes": 2000,                  // OPTIONAL: Truncate long message bodies
+        "max_tokens": 8000,                         // OPTIONAL: Output budget in LLM tokens (see search_logs)
+        "max_output_bytes": 32000                   // OPTIONAL: Output budget in bytes
+    }
+
+    STREAM SELECTION:
+    - 24-character hex strings are used as stream IDs
+    - Patterns with *, ? or [ match whole stream titles ("nginx-*")
+    - Other strings match titles containing them ("payments")
+
+    OUTPUT: JSON string with:
+    - messages: Merged messages ordered by timestamp, each with the "stream_id" it came from
+    - total_results: Sum of matches over all streams
+    - streams: Per-stream summary (total_results and returned, or error)
+    - failed_streams: Number of streams whose search failed
+    - unmatched: Entries in "streams" that matched no stream
+    """
+    if isinstance(request, str):
+        return response_encoder.encode(
+            {"error": "Request must be a JSON object, not a string."}
+        )
+    try:
+        return response_encoder.encode(await _search_streams_parallel(request))
+
+    except ValueError as e:
+        logger.error(f"Validation error in search_streams_parallel: {e}")
+        return response_encoder.encode({"error": f"Validation error: {str(e)}"})
+    except Exception as e:
+        logger.error(f"Parallel stream search failed: {e}")
+        return response_encoder.encode({"error": str(e)})
+
+
+@mcp_server.tool()
+@tool_deadline
+async def batch(request: BatchRequest) -> str:
+    """
+    Run several searches, aggregations and stream lookups in one call.
+
+    PURPOSE: Collapse an investigation's independent tool calls into a single round trip. Operations run concurrently against Graylog and their results come back in request order.
+
+    INPUT FORMAT: JSON object with the following structure:
+    {
+        "operations": [                                          // REQUIRED: 1-50 operations
+            {"op": "search_logs", "params": {"query": "level:ERROR", "time_range": "1h"}},
+            {"op": "get_log_statistics", "params": {"query": "*", "aggregation_type": "terms", "field": "source"}},
+            {"op": "get_stream_info", "params": {"stream_id": "5abb3f2f7bb9fd00011595fe"}}
+        ],
+        "max_concurrency": 8                                     // OPTIONAL: Operations run at once
+    }
+
+    OPERATIONS (params are the same as the tool of the same name):
+    - search_logs, search_stream_logs, search_streams_parallel
+    - get_log_statistics, get_composite_statistics
+    - get_stream_info ({"stream_id": ...}), search_streams_by_name ({"stream_name": ...}), list_streams ({})
+
+    BEHAVIOR:
+    - Every operation is validated before any is run; if one is invalid, nothing runs and the invalid operations are listed
+    - A failing operation reports its error in its own slot without failing the batch
+
+    OUTPUT: JSON string with:
+    {
+        "results": [
+            {"op": "search_logs", "result": {...}},
+            {"op": "get_stream_info", "error": "404 Client Error"}
+        ],
+        "failed": 1
+    }
+    """
+    if isinstance(request, str):
+        return response_encoder.encode(
+            {"error": "Request must be a JSON object, not a string."}
+        )
+
+    # Validate every operation up front so a typo does not leave a partial run
+    prepared = []
+    invalid = []
+    for index, operation in enumerate(request.operations):
+        entry = BATCH_OPERATIONS.get(operation.op)
+        if entry is None:
+            invalid.append(
+                {
+                    "index": index,
+                    "op": operation.op,
+                    "error": f"Unknown operation. Valid: {sorted(BATCH_OPERATIONS)}",
+                }
+            )
+            continue
+        model, runner = entry
+        try:
+            op_request = model(**operation.params) if model else None
+        except ValueError as e:
+            invalid.append({"index": index, "op": operation.op, "error": str(e)})
+            continue
+        prepared.append((operation.op, runner, op_request))
+
+    if invalid:
+        return response_encoder.encode(
+            {"error": "Batch validation failed", "invalid_operations": invalid}
+        )
+
+    limit = request.max_concurrency or config.graylog.fanout_concurrency
+    semaphore = asyncio.Semaphore(min(limit, graylog_client.max_concurrency))
+
+    async def run(
+        op: str, runner: Callable[[Any], Awaitable[Dict[str, Any]]], op_request: Any
+    ) -> Dict[str, Any]:
+        async with semaphore:
+            try:
+                return {"op": op, "result": await runner(op_request)}
+            except Exception as e:
+                logger.error(f"Batch operation {op} failed: {e}")
+                return {"op": op, "error": str(e)}
+
+    results = await asyncio.gather(*(run(*item) for item in prepared))
+    return response_encoder.encode(
+        {"results": results, "failed": sum(1 for r in results if "error" in r)}
+    )
+
+
+@mcp_server.tool()
+@tool_deadline
+async def get_system_info() -> str:
     """
     Get Graylog system information and status.
 
@@ -544,16 +1495,18 @@ def get_system_info() -> str:
     - Cluster information (if applicable)
     """
     try:
-        system_info = graylog_client.get_system_info()
-        return json.dumps(system_info, indent=2)
+        system_info = await graylog_client.get_system_info()
+        return response_encoder.encode(system_info)
 
     except Exception as e:
         logger.error(f"Get system info failed: {e}")
-        return json.dumps({"error": str(e)}, indent=2)
+        return response_encoder.encode({"error": str(e)})
 
 
 @mcp_server.tool()
-def test_connection() -> str:
+@tool_deadline
+@interactive
+async def test_connection() -> str:
     """
     Test connection to Graylog server.
 
@@ -569,21 +1522,29 @@ def test_connection() -> str:
     }
     """
     try:
-        is_connected = graylog_client.test_connection()
-        return json.dumps(
-            {"connected": is_connected, "endpoint": config.graylog.endpoint}, indent=2
+        is_connected = await graylog_client.test_connection()
+        return response_encoder.encode(
+            {"connected": is_connected, "endpoint": config.graylog.endpoint}
         )
 
     except Exception as e:
         logger.error(f"Connection test failed: {e}")
-        return json.dumps(
-            {"connected": False, "error": str(e), "endpoint": config.graylog.endpoint},
-            indent=2,
+        return response_encoder.encode(
+            {"connected": False, "error": str(e), "endpoint": config.graylog.endpoint}
         )
 
 
 @mcp_server.tool()
-def get_error_logs(time_range: str = "1h", limit: int = 100) -> str:
+@tool_deadline
+async def get_error_logs(
+    time_range: str = "1h",
+    limit: int = 100,
+    max_message_bytes: Optional[int] = None,
+    max_output_bytes: Optional[int] = None,
+    max_tokens: Optional[int] = None,
+    cluster: bool = False,
+    max_scan: int = 10000,
+) -> str:
     """
     Get error logs from the last specified time range.
 
@@ -592,6 +1553,16 @@ def get_error_logs(time_range: str = "1h", limit: int = 100) -> str:
     INPUT:
     - time_range: OPTIONAL - Time range to search (default: "1h", examples: "30m", "24h", "7d")
     - limit: OPTIONAL - Maximum number of results (1-1000, default: 100)
+    - max_message_bytes: OPTIONAL - Truncate message bodies longer than this many bytes
+    - max_output_bytes: OPTIONAL - Output budget for messages in bytes
+    - max_tokens: OPTIONAL - Output budget for messages in LLM tokens
+
+    - cluster: OPTIONAL - Group errors by message template instead of listing them (default: false)
+    - max_scan: OPTIONAL - In cluster mode, maximum errors to scan (1-100000, default: 10000)
+
+    BUDGETED OUTPUT: With a budget, repeated messages are collapsed into one with a "_count", long bodies are truncated, and messages beyond the budget are omitted; the "budget" key reports what was dropped.
+
+    CLUSTER MODE: Numbers, UUIDs, IPs, hex values and timestamps are masked to compute a template per message. Up to max_scan errors are streamed page by page and grouped; the top "limit" clusters are returned, largest first, each with a template, count, exemplar message, first/last timestamp and sources.
 
     OUTPUT: JSON string containing error logs with fields:
     - message: Log message content
@@ -602,7 +1573,9 @@ def get_error_logs(time_range: str = "1h", limit: int = 100) -> str:
     try:
         # Validate parameters
         if limit < 1 or limit > 1000:
-            return json.dumps({"error": "Limit must be between 1 and 1000"}, indent=2)
+            return response_encoder.encode(
+                {"error": "Limit must be between 1 and 1000"}
+            )
 
         params = QueryParams(
             query="level:ERROR OR level:CRITICAL OR level:FATAL",
@@ -611,19 +1584,36 @@ def get_error_logs(time_range: str = "1h", limit: int = 100) -> str:
             fields=["message", "level", "source", "timestamp"],
         )
 
-        result = graylog_client.search_logs(params)
-        return json.dumps(result, indent=2)
+        if cluster:
+            if max_scan < 1 or max_scan > 100000:
+                return response_encoder.encode(
+                    {"error": "Max scan must be between 1 and 100000"}
+                )
+            result = await graylog_client.cluster_messages(
+                params, max_messages=max_scan, top=limit
+            )
+            for item in result["clusters"]:
+                item["exemplar"] = project_message(
+                    item["exemplar"], params.fields, max_message_bytes
+                )
+            return response_encoder.encode(result)
+
+        result = await graylog_client.search_logs(params)
+        result = slim_search_result(result, params.fields, max_message_bytes)
+        result = apply_budget(result, max_output_bytes, max_tokens)
+        return response_encoder.encode(result)
 
     except ValueError as e:
         logger.error(f"Validation error in get_error_logs: {e}")
-        return json.dumps({"error": f"Validation error: {str(e)}"}, indent=2)
+        return response_encoder.encode({"error": f"Validation error: {str(e)}"})
     except Exception as e:
         logger.error(f"Get error logs failed: {e}")
-        return json.dumps({"error": str(e)}, indent=2)
+        return response_encoder.encode({"error": str(e)})
 
 
 @mcp_server.tool()
-def get_log_count_by_level(time_range: str = "1h") -> str:
+@tool_deadline
+async def get_log_count_by_level(time_range: str = "1h") -> str:
     """
     Get log count aggregated by log level.
 
@@ -646,21 +1636,22 @@ def get_log_count_by_level(time_range: str = "1h") -> str:
     try:
         aggregation = AggregationParams(type="terms", field="level", size=10)
 
-        result = graylog_client.get_log_statistics(
+        result = await graylog_client.get_log_statistics(
             query="*", time_range=time_range, aggregation=aggregation
         )
-        return json.dumps(result, indent=2)
+        return response_encoder.encode(result)
 
     except ValueError as e:
         logger.error(f"Validation error in get_log_count_by_level: {e}")
-        return json.dumps({"error": f"Validation error: {str(e)}"}, indent=2)
+        return response_encoder.encode({"error": f"Validation error: {str(e)}"})
     except Exception as e:
         logger.error(f"Get log count by level failed: {e}")
-        return json.dumps({"error": str(e)}, indent=2)
+        return response_encoder.encode({"error": str(e)})
 
 
 @mcp_server.tool()
-def search_streams_by_name(stream_name: str) -> str:
+@tool_deadline
+async def search_streams_by_name(stream_name: str) -> str:
     """
     Search for Graylog streams by name or partial name.
 
@@ -687,45 +1678,24 @@ def search_streams_by_name(stream_name: str) -> str:
     """
     try:
         if not stream_name or not stream_name.strip():
-            return json.dumps({"error": "Stream name is required"}, indent=2)
-
-        all_streams = graylog_client.list_streams()
-
-        # Filter streams by name (case-insensitive)
-        matching_streams = []
-        search_term = stream_name.lower()
-
-        for stream in all_streams:
-            title = stream.get("title", "").lower()
-            if search_term in title:
-                matching_streams.append(
-                    {
-                        "id": stream.get("id"),
-                        "title": stream.get("title"),
-                        "description": stream.get("description"),
-                        "disabled": stream.get("disabled", False),
-                    }
-                )
+            return response_encoder.encode({"error": "Stream name is required"})
 
-        return json.dumps(
-            {
-                "search_term": stream_name,
-                "matches": matching_streams,
-                "total_matches": len(matching_streams),
-            },
-            indent=2,
+        return response_encoder.encode(
+            await _search_streams_by_name(StreamNameRequest(stream_name=stream_name))
         )
 
     except ValueError as e:
         logger.error(f"Validation error in search_streams_by_name: {e}")
-        return json.dumps({"error": f"Validation error: {str(e)}"}, indent=2)
+        return response_encoder.encode({"error": f"Validation error: {str(e)}"})
     except Exception as e:
         logger.error(f"Search streams by name failed: {e}")
-        return json.dumps({"error": str(e)}, indent=2)
+        return response_encoder.encode({"error": str(e)})
 
 
 @mcp_server.tool()
-def get_last_event_from_stream(stream_id: str, time_range: str = "1h") -> str:
+@tool_deadline
+@interactive
+async def get_last_event_from_stream(stream_id: str, time_range: str = "1h") -> str:
     """
     Get the last event from a specific Graylog stream.
 
@@ -748,25 +1718,27 @@ def get_last_event_from_stream(stream_id: str, time_range: str = "1h") -> str:
         "total_results": 1
     }
 
+    BEHAVIOR: Searches the newest GRAYLOG_TOPN_FIRST_WINDOW seconds of the range first and walks back in growing windows only while no event is found, so on a busy stream only the newest index is touched. total_results counts the windows searched, reported under "walk".
+
     USAGE: Use this to check if a stream is receiving logs or to get the latest activity.
     """
     try:
         if not stream_id or not stream_id.strip():
-            return json.dumps({"error": "Stream ID is required"}, indent=2)
+            return response_encoder.encode({"error": "Stream ID is required"})
 
         params = QueryParams(
             query="*", time_range=time_range, limit=1, stream_id=stream_id
         )
 
-        result = graylog_client.search_stream_logs(stream_id, params)
-        return json.dumps(result, indent=2)
+        result = await graylog_client.search_newest_first(params)
+        return response_encoder.encode(slim_search_result(result))
 
     except ValueError as e:
         logger.error(f"Validation error in get_last_event_from_stream: {e}")
-        return json.dumps({"error": f"Validation error: {str(e)}"}, indent=2)
+        return response_encoder.encode({"error": f"Validation error: {str(e)}"})
     except Exception as e:
         logger.error(f"Get last event from stream failed: {e}")
-        return json.dumps({"error": str(e)}, indent=2)
+        return response_encoder.encode({"error": str(e)})
 
 
 if __name__ == "__main__":
@@ -778,10 +1750,13 @@ if __name__ == "__main__":
     logger.info(f"Graylog endpoint: {config.graylog.endpoint}")
 
     # Test connection on startup
-    if graylog_client.test_connection():
+    if asyncio.run(graylog_client.test_connection()):
         logger.info("Successfully connected to Graylog")
     else:
         logger.warning("Failed to connect to Graylog - check configuration")
 
+    if config.graylog.pool_prewarm > 0:
+        graylog_client.client.warm_pool(config.graylog.pool_prewarm)
+
     # Run the FastMCP server over stdio (for MCP protocol)
     mcp_server.run()
@@ -0,0 +1,242 @@
+"""Result shaping for search responses returned to MCP clients."""
+
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+# Top-level search response keys kept in slimmed results
+RESULT_KEYS = (
+    "query",
+    "total_results",
+    "time",
+    "from",
+    "to",
+    "shards",
+    "partial",
+    "walk",
+)
+
+# Message fields whose bodies may be truncated
+TRUNCATED_FIELDS = ("message", "full_message")
+
+# Graylog-internal message field prefixes dropped when no fields are requested
+INTERNAL_FIELD_PREFIXES = ("gl2_",)
+
+TRUNCATION_MARKER = "...[truncated {} bytes]"
+
+# Fields that differ between otherwise identical messages
+VOLATILE_FIELDS = ("_id", "timestamp", "gl2_message_id")
+
+# Rough size of one LLM token in bytes of JSON output
+BYTES_PER_TOKEN = 4
+
+# Smallest body a message is truncated to when fitting a budget
+MIN_MESSAGE_BYTES = 120
+
+
+def truncate_text(text: str, max_bytes: int) -> str:
+    """
+    Truncate text to at most max_bytes UTF-8 bytes, appending a marker.
+
+    Args:
+        text: Text to truncate
+        max_bytes: Maximum encoded size of the kept prefix
+
+    Returns:
+        Original text if it fits, otherwise the longest prefix that fits on a
+        character boundary followed by a marker with the number of bytes cut
+    """
+    # Every character is at most 4 bytes, so short strings never need encoding
+    if len(text) * 4 <= max_bytes:
+        return text
+
+    encoded = text.encode("utf-8")
+    if len(encoded) <= max_bytes:
+        return text
+
+    kept = encoded[:max_bytes].decode("utf-8", "ignore")
+    return kept + TRUNCATION_MARKER.format(len(encoded) - len(kept.encode("utf-8")))
+
+
+def project_message(
+    message: Dict[str, Any],
+    fields: Optional[Iterable[str]] = None,
+    max_message_bytes: Optional[int] = None,
+) -> Dict[str, Any]:
+    """
+    Reduce a single log message to the fields the caller asked for.
+
+    Args:
+        message: Message fields, or a Graylog envelope ({"message": {...}, "index": ...})
+        fields: Fields to keep (default: all fields except Graylog internals)
+        max_message_bytes: Truncate message bodies longer than this
+
+    Returns:
+        New dictionary with the projected fields
+    """
+    if isinstance(message.get("message"), dict):
+        message = message["message"]
+
+    if fields:
+        projected = {field: message[field] for field in fields if field in message}
+    else:
+        projected = {
+            key: value
+            for key, value in message.items()
+            if not key.startswith(INTERNAL_FIELD_PREFIXES)
+        }
+
+    if max_message_bytes:
+        for field in TRUNCATED_FIELDS:
+            value = projected.get(field)
+            if isinstance(value, str):
+                projected[field] = truncate_text(value, max_message_bytes)
+
+    return projected
+
+
+def slim_search_result(
+    result: Dict[str, Any],
+    fields: Optional[List[str]] = None,
+    max_message_bytes: Optional[int] = None,
+) -> Dict[str, Any]:
+    """
+    Strip Graylog response metadata and project every message.
+
+    Drops per-message envelope data (index, highlight_ranges,
+    decoration_stats) and response internals (built_query, used_indices,
+    the field list). The input is not modified, so cached responses can be
+    shaped safely.
+
+    Args:
+        result: Raw search response from Graylog
+        fields: Fields to keep on each message (default: all non-internal)
+        max_message_bytes: Truncate message bodies longer than this
+
+    Returns:
+        Slimmed response with the kept top-level keys and projected messages
+    """
+    slimmed = {key: result[key] for key in RESULT_KEYS if key in result}
+    slimmed["messages"] = [
+        project_message(message, fields, max_message_bytes)
+        for message in result.get("messages", [])
+    ]
+    return slimmed
+
+
+def estimate_size(message: Dict[str, Any]) -> int:
+    """
+    Estimate the compact JSON size of a flat message in bytes.
+
+    Counts keys, values and punctuation without encoding the whole object.
+    """
+    size = 2
+    for key, value in message.items():
+        if isinstance(value, str):
+            value_size = len(value) if value.isascii() else len(value.encode("utf-8"))
+            size += len(key) + value_size + 6
+        else:
+            size += len(key) + len(str(value)) + 4
+    return size
+
+
+def dedupe_messages(
+    messages: Iterable[Dict[str, Any]],
+) -> List[Tuple[Dict[str, Any], int]]:
+    """
+    Collapse messages that differ only in volatile fields (ID, timestamp).
+
+    Args:
+        messages: Projected messages in result order
+
+    Returns:
+        List of (first occurrence, number of occurrences) in first-seen order
+    """
+    groups: Dict[Tuple[Tuple[str, str], ...], List[Any]] = {}
+    for message in messages:
+        key = tuple(
+            (field, str(value))
+            for field, value in sorted(message.items())
+            if field not in VOLATILE_FIELDS
+        )
+        group = groups.get(key)
+        if group is None:
+            groups[key] = [message, 1]
+        else:
+            group[1] += 1
+    return [(message, count) for message, count in groups.values()]
+
+
+def apply_budget(
+    result: Dict[str, Any],
+    max_output_bytes: Optional[int] = None,
+    max_tokens: Optional[int] = None,
+) -> Dict[str, Any]:
+    """
+    Fit a slimmed search result into an output size budget.
+
+    Repeated messages are collapsed into one message carrying a "_count".
+    Message bodies are truncated to an equal share of the budget (at least
+    MIN_MESSAGE_BYTES), then messages are kept in result order until the
+    budget is spent. A "budget" report lists what was collapsed, truncated
+    and omitted.
+
+    Args:
+        result: Output of slim_search_result (not modified)
+        max_output_bytes: Budget for the messages in bytes of compact JSON
+        max_tokens: Budget in LLM tokens (converted at BYTES_PER_TOKEN)
+
+    Returns:
+        New result with fitted messages, or result unchanged if no budget given
+    """
+    budget = max_output_bytes
+    if max_tokens:
+        token_bytes = max_tokens * BYTES_PER_TOKEN
+        budget = min(budget, token_bytes) if budget else token_bytes
+    if not budget:
+        return result
+
+    messages = result.get("messages", [])
+    groups = dedupe_messages(messages)
+    per_message = max(MIN_MESSAGE_BYTES, budget // max(len(groups), 1))
+
+    kept = []
+    used = 0
+    truncated = 0
+    omitted = 0
+    for position, (message, count) in enumerate(groups):
+        shaped = dict(message)
+        if count > 1:
+            shaped["_count"] = count
+
+        # Share what is left of this message's allowance between its bodies
+        bodies = [f for f in TRUNCATED_FIELDS if isinstance(shaped.get(f), str)]
+        if bodies:
+            other = estimate_size(
+                {k: v for k, v in shaped.items() if k not in TRUNCATED_FIELDS}
+            )
+            reserve = len(bodies) * (len(TRUNCATION_MARKER) + 16)
+            cap = max(MIN_MESSAGE_BYTES, (per_message - other - reserve) // len(bodies))
+            for field in bodies:
+                cut = truncate_text(shaped[field], cap)
+                if cut is not shaped[field]:
+                    shaped[field] = cut
+                    truncated += 1
+
+        size = estimate_size(shaped) + 1
+        if used + size > budget:
+            omitted = sum(c for _, c in groups[position:])
+            break
+        kept.append(shaped)
+        used += size
+
+    fitted = {key: value for key, value in result.items() if key != "messages"}
+    fitted["messages"] = kept
+    fitted["budget"] = {
+        "max_output_bytes": budget,
+        "used_bytes": used,
+        "messages_in": len(messages),
+        "messages_out": len(kept),
+        "duplicates_collapsed": len(messages) - len(groups),
+        "truncated_messages": truncated,
+        "omitted_messages": omitted,
+    }
+    return fitted
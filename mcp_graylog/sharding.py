@@ -0,0 +1,285 @@
+"""Splitting long time ranges into windows searched concurrently."""
+
+import contextvars
+import math
+from concurrent.futures import Executor, as_completed
+from datetime import datetime, timedelta, timezone
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Generator,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    TypeVar,
+    Union,
+)
+
+from .fanout import merge_by_timestamp
+from .timerange import format_timestamp, parse_timestamp
+
+T = TypeVar("T")
+
+# Aggregations whose per-window results merge exactly
+SHARDABLE_AGGREGATIONS = ("terms", "date_histogram", "stats")
+
+# Terms requested per window as a multiple of the final size, so a term
+# that is frequent overall but not in one window's top N still shows up
+TERMS_OVERSAMPLE = 3
+
+# Each window of a newest-first walk is this many times longer than the last
+WALK_GROWTH = 4
+
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+def _epoch_ms(value: str) -> int:
+    """Parse an ISO 8601 timestamp into epoch milliseconds."""
+    return round(parse_timestamp(value).timestamp() * 1000)
+
+
+def _format_ms(ms: int) -> str:
+    """Format epoch milliseconds as the UTC timestamp Graylog expects."""
+    return format_timestamp(EPOCH + timedelta(milliseconds=ms))
+
+
+def split_window(
+    from_: str, to: str, align_seconds: int = 86400
+) -> List[Tuple[str, str]]:
+    """
+    Split an absolute window at multiples of align_seconds since the epoch.
+
+    Graylog rotates indices on a schedule (daily by default), so aligned
+    windows let each request touch as few indices as possible. Graylog's
+    absolute ranges include both ends, so each window ends 1 ms before the
+    next one starts and a message on a boundary is counted once.
+
+    Args:
+        from_: Window start (ISO 8601)
+        to: Window end (ISO 8601)
+        align_seconds: Window length and alignment, in seconds
+
+    Returns:
+        Consecutive (from, to) windows covering the range, oldest first; the
+        first and last may be shorter than align_seconds
+    """
+    start = _epoch_ms(from_)
+    end = _epoch_ms(to)
+    align = align_seconds * 1000
+    bounds = [start]
+    # Skip a boundary 1 ms after the start, which would leave an empty window
+    boundary = ((start + 1) // align + 1) * align
+    while boundary < end:
+        bounds.append(boundary)
+        boundary += align
+    bounds.append(end)
+
+    windows = [(_format_ms(a), _format_ms(b - 1)) for a, b in zip(bounds, bounds[1:])]
+    windows[-1] = (windows[-1][0], _format_ms(end))
+    return windows
+
+
+def newest_first_windows(
+    from_: str, to: str, first_seconds: int, growth: int = WALK_GROWTH
+) -> Iterator[Tuple[str, str]]:
+    """
+    Walk an absolute window backwards from its end in growing windows.
+
+    As in split_window, each window ends 1 ms before the newer one starts,
+    since Graylog's absolute ranges include both ends.
+
+    Args:
+        from_: Window start (ISO 8601)
+        to: Window end (ISO 8601)
+        first_seconds: Length of the newest window
+        growth: Factor by which each older window is longer than the last
+
+    Returns:
+        Iterator of consecutive (from, to) windows, newest first, ending at
+        from_
+    """
+    start = _epoch_ms(from_)
+    edge = _epoch_ms(to)
+    last = edge
+    size = first_seconds * 1000
+    while edge > start:
+        begin = max(start, edge - size)
+        # Absorb a 1 ms remnant, which would leave an empty window
+        if begin - start == 1:
+            begin = start
+        yield _format_ms(begin), _format_ms(last)
+        edge = begin
+        last = begin - 1
+        size *= growth
+
+
+def iter_completed(
+    executor: Executor,
+    windows: List[Tuple[str, str]],
+    func: Callable[[str, str], T],
+) -> Generator[Tuple[Tuple[str, str], Union[T, Exception]], None, None]:
+    """
+    Run func over every window concurrently and yield results as they finish.
+
+    Each call runs in a copy of the caller's context, so it shares the
+    caller's deadline and request priority.
+
+    Args:
+        executor: Pool running the windows
+        windows: (from, to) windows
+        func: Function called with the window bounds
+
+    Returns:
+        Iterator of (window, result) in completion order; a window that
+        raised yields its exception instead of a result
+    """
+    futures = {}
+    for start, end in windows:
+        context = contextvars.copy_context()
+        futures[executor.submit(context.run, func, start, end)] = (start, end)
+    try:
+        for future in as_completed(futures):
+            try:
+                yield futures[future], future.result()
+            except Exception as e:
+                yield futures[future], e
+    finally:
+        for future in futures:
+            future.cancel()
+
+
+def merge_search_results(
+    results: List[Dict[str, Any]],
+    offset: int = 0,
+    limit: Optional[int] = None,
+    descending: bool = True,
+) -> Dict[str, Any]:
+    """
+    Merge per-window search results into one result.
+
+    Args:
+        results: Search responses, each asked for offset + limit messages
+            sorted by timestamp
+        offset: Messages to skip in the merged order
+        limit: Messages to return
+        descending: True for newest first
+
+    Returns:
+        Search response with the summed total_results and the merged page
+    """
+    end = None if limit is None else offset + limit
+    messages = merge_by_timestamp(
+        [result.get("messages", []) for result in results],
+        descending=descending,
+        limit=end,
+    )
+    return {
+        "messages": messages[offset:],
+        "total_results": sum(r.get("total_results") or 0 for r in results),
+    }
+
+
+def merge_terms(results: List[Dict[str, Any]], size: int) -> Dict[str, Any]:
+    """
+    Merge per-window terms aggregations.
+
+    Args:
+        results: Terms responses ("terms", "missing", "other", "total")
+        size: Number of terms to return
+
+    Returns:
+        Terms response with summed counts for the top size terms. "exact" is
+        True when every window returned all of its terms, so every count is
+        exact; otherwise a term missing from some window's top list may be
+        undercounted.
+    """
+    counts: Dict[str, int] = {}
+    for result in results:
+        for term, count in (result.get("terms") or {}).items():
+            counts[term] = counts.get(term, 0) + count
+
+    top = dict(sorted(counts.items(), key=lambda item: (-item[1], item[0]))[:size])
+    total = sum(r.get("total") or 0 for r in results)
+    missing = sum(r.get("missing") or 0 for r in results)
+    return {
+        "terms": top,
+        "missing": missing,
+        "other": max(0, total - missing - sum(top.values())),
+        "total": total,
+        "exact": all(not r.get("other") for r in results),
+    }
+
+
+def merge_histograms(results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Merge per-window date histograms by summing the counts of each bucket.
+
+    A bucket cut by a window boundary appears in both windows under the
+    same key, so summing keeps its count exact.
+    """
+    buckets: Dict[str, Any] = {}
+    for result in results:
+        for key, count in (result.get("results") or {}).items():
+            buckets[key] = buckets.get(key, 0) + count
+
+    merged = {k: v for k, v in results[0].items() if k not in ("results", "time")}
+    merged["results"] = dict(sorted(buckets.items()))
+    return merged
+
+
+def merge_stats(results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Merge per-window field statistics.
+
+    Counts, sums and sums of squares add up; min and max combine; the mean,
+    variance and standard deviation are recomputed from the totals, which
+    weights each window by its count.
+    """
+    present = [r for r in results if r.get("count")]
+    count = sum(r["count"] for r in present)
+    if not count:
+        return {"count": 0}
+
+    total = sum(r.get("sum") or 0 for r in present)
+    squares = sum(r.get("sum_of_squares") or 0 for r in present)
+    mean = total / count
+    variance = max(0.0, squares / count - mean * mean)
+    return {
+        "count": count,
+        "sum": total,
+        "sum_of_squares": squares,
+        "min": min(
+            (r["min"] for r in present if r.get("min") is not None), default=None
+        ),
+        "max": max(
+            (r["max"] for r in present if r.get("max") is not None), default=None
+        ),
+        "mean": mean,
+        "variance": variance,
+        "std_deviation": math.sqrt(variance),
+    }
+
+
+def merge_aggregations(
+    aggregation_type: str, results: List[Dict[str, Any]], size: int
+) -> Dict[str, Any]:
+    """
+    Merge per-window aggregation responses.
+
+    Args:
+        aggregation_type: One of SHARDABLE_AGGREGATIONS
+        results: Responses of the windows
+        size: Number of terms for terms aggregations
+
+    Returns:
+        Merged aggregation response
+    """
+    if aggregation_type == "terms":
+        return merge_terms(results, size)
+    if aggregation_type == "date_histogram":
+        return merge_histograms(results)
+    if aggregation_type == "stats":
+        return merge_stats(results)
+    raise ValueError(f"Aggregation type {aggregation_type} cannot be merged")
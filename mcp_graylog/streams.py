@@ -0,0 +1,215 @@
+"""Cached stream catalog with an in-memory title index."""
+
+import fnmatch
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+
+def title_trigrams(title: str) -> Set[str]:
+    """
+    Get the set of 3-character substrings of a lowercased title.
+
+    Args:
+        title: Lowercased stream title
+
+    Returns:
+        Set of trigrams (empty for titles shorter than 3 characters)
+    """
+    return {title[i : i + 3] for i in range(len(title) - 2)}
+
+
+class StreamIndex:
+    """Immutable snapshot of the stream list with lookup structures."""
+
+    def __init__(self, streams: List[Dict[str, Any]]):
+        self.streams = streams
+        self.by_id: Dict[str, Dict[str, Any]] = {}
+        self.titles: List[str] = []
+        self.trigrams: Dict[str, Set[int]] = {}
+
+        for position, stream in enumerate(streams):
+            if stream.get("id"):
+                self.by_id[stream["id"]] = stream
+            title = (stream.get("title") or "").lower()
+            self.titles.append(title)
+            for trigram in title_trigrams(title):
+                self.trigrams.setdefault(trigram, set()).add(position)
+
+    def search(self, term: str) -> List[Dict[str, Any]]:
+        """
+        Find streams whose title contains term (case-insensitive).
+
+        Terms of 3+ characters are narrowed through the trigram index before
+        the substring check; shorter terms scan the prebuilt lowercased titles.
+        """
+        term = term.lower()
+        candidates: Iterable[int]
+        if len(term) < 3:
+            candidates = range(len(self.titles))
+        else:
+            postings = []
+            for trigram in title_trigrams(term):
+                posting = self.trigrams.get(trigram)
+                if not posting:
+                    return []
+                postings.append(posting)
+            postings.sort(key=len)
+            candidates = sorted(set.intersection(*postings))
+
+        return [self.streams[i] for i in candidates if term in self.titles[i]]
+
+    def match(self, pattern: str) -> List[Dict[str, Any]]:
+        """Find streams whose title matches a shell-style pattern (case-insensitive)."""
+        pattern = pattern.lower()
+        return [
+            self.streams[i]
+            for i, title in enumerate(self.titles)
+            if fnmatch.fnmatchcase(title, pattern)
+        ]
+
+
+class StreamCatalog:
+    """
+    Cached copy of /api/streams kept fresh in the background.
+
+    Refreshes send If-None-Match / If-Modified-Since when Graylog supplied an
+    ETag or Last-Modified header, so an unchanged catalog costs a 304. Reads
+    are lock-free: each refresh swaps in a new StreamIndex snapshot.
+    """
+
+    def __init__(
+        self,
+        client: Any,
+        ttl: float = 120.0,
+        refresh_interval: float = 60.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.client = client
+        self.ttl = ttl
+        self.refresh_interval = refresh_interval
+        self._clock = clock
+        self._index: Optional[StreamIndex] = None
+        self._loaded_at: Optional[float] = None
+        self._etag: Optional[str] = None
+        self._last_modified: Optional[str] = None
+        self._refresh_lock = threading.Lock()
+        self._start_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.refreshes = 0
+        self.not_modified = 0
+
+    def is_fresh(self) -> bool:
+        """Return True if the catalog was loaded within its TTL."""
+        return (
+            self._index is not None
+            and self._loaded_at is not None
+            and self._clock() - self._loaded_at < self.ttl
+        )
+
+    def refresh(self, only_if_stale: bool = False) -> None:
+        """
+        Reload /api/streams, reusing the current snapshot on 304.
+
+        Args:
+            only_if_stale: Skip the request if another caller refreshed the
+                catalog while this one waited for the lock
+        """
+        with self._refresh_lock:
+            if only_if_stale and self.is_fresh():
+                return
+
+            headers = {}
+            if self._index is not None:
+                if self._etag:
+                    headers["If-None-Match"] = self._etag
+                if self._last_modified:
+                    headers["If-Modified-Since"] = self._last_modified
+
+            response = self.client._http_request(
+                "GET", "/api/streams", headers=headers or None
+            )
+            self.refreshes += 1
+
+            if response.status_code == 304 and self._index is not None:
+                self.not_modified += 1
+            else:
+                streams = response.json().get("streams", [])
+                self._index = StreamIndex(streams)
+                self._etag = response.headers.get("ETag")
+                self._last_modified = response.headers.get("Last-Modified")
+                logger.debug(f"Stream catalog loaded {len(streams)} streams")
+
+            self._loaded_at = self._clock()
+
+    def _current(self) -> StreamIndex:
+        """Return a fresh index snapshot, refreshing synchronously if stale."""
+        self._ensure_background_refresh()
+        if not self.is_fresh():
+            try:
+                self.refresh(only_if_stale=True)
+            except Exception as e:
+                if self._index is None:
+                    raise
+                logger.warning(f"Stream catalog refresh failed, serving stale: {e}")
+        index = self._index
+        if index is None:
+            raise RuntimeError("Stream catalog has not been loaded")
+        return index
+
+    def streams(self) -> List[Dict[str, Any]]:
+        """Return all streams from the catalog."""
+        return self._current().streams
+
+    def search(self, term: str) -> List[Dict[str, Any]]:
+        """Return streams whose title contains term (case-insensitive)."""
+        return self._current().search(term)
+
+    def match(self, pattern: str) -> List[Dict[str, Any]]:
+        """Return streams whose title matches a shell-style pattern."""
+        return self._current().match(pattern)
+
+    def get(self, stream_id: str) -> Optional[Dict[str, Any]]:
+        """Return a stream by ID if the catalog is fresh, otherwise None."""
+        index = self._index
+        if index is None or not self.is_fresh():
+            return None
+        return index.by_id.get(stream_id)
+
+    def _ensure_background_refresh(self) -> None:
+        """Start the background refresh thread on first use."""
+        if self.refresh_interval <= 0 or self._thread is not None:
+            return
+        with self._start_lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(
+                target=self._refresh_loop, name="stream-catalog", daemon=True
+            )
+            self._thread.start()
+
+    def _refresh_loop(self) -> None:
+        """Periodically refresh the catalog until stopped."""
+        while not self._stop.wait(self.refresh_interval):
+            try:
+                self.refresh()
+            except Exception as e:
+                logger.warning(f"Background stream catalog refresh failed: {e}")
+
+    def stop(self) -> None:
+        """Stop the background refresh thread."""
+        self._stop.set()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return catalog state and counters."""
+        index = self._index
+        return {
+            "streams": len(index.streams) if index else 0,
+            "fresh": self.is_fresh(),
+            "refreshes": self.refreshes,
+            "not_modified": self.not_modified,
+        }
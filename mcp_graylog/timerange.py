@@ -0,0 +1,183 @@
+"""Relative, absolute and keyword time ranges for Graylog searches."""
+
+import re
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+
+RELATIVE_UNITS = {"s": 1, "m": 60, "h": 3600, "d": 86400, "w": 604800}
+RELATIVE_PATTERN = re.compile(r"^(\d+)([smhdw])$")
+
+# Separator of an absolute "from..to" interval
+INTERVAL_SEPARATOR = ".."
+
+# Prefix of a Graylog keyword range, e.g. "keyword:yesterday"
+KEYWORD_PREFIX = "keyword:"
+
+TIME_RANGE_HELP = (
+    "Use relative (e.g., '1h'), an ISO 8601 interval "
+    "(e.g., '2024-01-01T10:00:00Z..2024-01-01T10:20:00Z'), an ISO 8601 start "
+    "time, or a keyword (e.g., 'keyword:yesterday')"
+)
+
+
+def parse_timestamp(value: str) -> datetime:
+    """
+    Parse an ISO 8601 timestamp.
+
+    Args:
+        value: Timestamp such as "2024-01-01T10:00:00Z"; without an offset
+            it is taken as UTC
+
+    Returns:
+        Timezone-aware datetime in UTC
+
+    Raises:
+        ValueError: If the value is not ISO 8601
+    """
+    moment = datetime.fromisoformat(value.strip().replace("Z", "+00:00"))
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return moment.astimezone(timezone.utc)
+
+
+def format_timestamp(moment: datetime) -> str:
+    """Format a datetime as the UTC timestamp Graylog expects."""
+    moment = moment.astimezone(timezone.utc)
+    return moment.strftime("%Y-%m-%dT%H:%M:%S.") + f"{moment.microsecond // 1000:03d}Z"
+
+
+def format_epoch(seconds: float) -> str:
+    """Format epoch seconds as the UTC timestamp Graylog expects."""
+    return format_timestamp(datetime.fromtimestamp(seconds, timezone.utc))
+
+
+def parse_time_range(
+    time_range: Optional[str], now: Optional[float] = None
+) -> Dict[str, Any]:
+    """
+    Parse a time range string into Graylog search parameters.
+
+    Args:
+        time_range: "15m" (relative), "<from>..<to>" (absolute ISO 8601
+            interval), "<from>" (absolute, from then until now) or
+            "keyword:<expression>" (Graylog keyword, e.g. "last monday")
+        now: Current wall-clock time for open-ended ranges, defaults to
+            time.time()
+
+    Returns:
+        {} for an empty range, {"range": seconds}, {"from": ..., "to": ...}
+        with normalized UTC timestamps, or {"keyword": expression}
+
+    Raises:
+        ValueError: If the range is not in one of these formats
+    """
+    if not time_range or not time_range.strip():
+        return {}
+    time_range = time_range.strip()
+
+    match = RELATIVE_PATTERN.match(time_range)
+    if match:
+        return {"range": int(match.group(1)) * RELATIVE_UNITS[match.group(2)]}
+
+    if time_range.startswith(KEYWORD_PREFIX):
+        keyword = time_range[len(KEYWORD_PREFIX) :].strip()
+        if not keyword:
+            raise ValueError("Keyword time range cannot be empty")
+        return {"keyword": keyword}
+
+    try:
+        if INTERVAL_SEPARATOR in time_range:
+            start, end = time_range.split(INTERVAL_SEPARATOR, 1)
+            from_ = parse_timestamp(start)
+            to = parse_timestamp(end)
+        else:
+            from_ = parse_timestamp(time_range)
+            to = datetime.fromtimestamp(
+                time.time() if now is None else now, timezone.utc
+            )
+    except ValueError:
+        raise ValueError(
+            f"Invalid time range format: {time_range}. {TIME_RANGE_HELP}"
+        ) from None
+
+    if from_ >= to:
+        raise ValueError(f"Time range {time_range} must start before it ends")
+    return {"from": format_timestamp(from_), "to": format_timestamp(to)}
+
+
+def check_time_range(time_range: str) -> str:
+    """Validate a time range for a request model, returning it unchanged."""
+    parse_time_range(time_range)
+    return time_range
+
+
+def range_type(parsed: Dict[str, Any]) -> str:
+    """Get the Graylog range type ("relative", "absolute" or "keyword")."""
+    if "keyword" in parsed:
+        return "keyword"
+    if "from" in parsed:
+        return "absolute"
+    return "relative"
+
+
+def span_seconds(parsed: Optional[Dict[str, Any]]) -> Optional[int]:
+    """
+    Get the length of a parsed time range.
+
+    Args:
+        parsed: Output of parse_time_range, or a Graylog "timerange" object
+
+    Returns:
+        Seconds, or None for keyword ranges and anything unrecognized
+    """
+    if not parsed:
+        return None
+    seconds = parsed.get("range")
+    if isinstance(seconds, int):
+        return seconds
+    if parsed.get("from") and parsed.get("to"):
+        try:
+            span = parse_timestamp(parsed["to"]) - parse_timestamp(parsed["from"])
+        except (TypeError, ValueError):
+            return None
+        return max(0, int(span.total_seconds()))
+    return None
+
+
+def pin_time_range(time_range: Optional[str], now: Optional[float] = None) -> str:
+    """
+    Fix a relative range to the absolute window it covers right now.
+
+    Paging through a relative range lets the window slide between pages, so
+    messages shift across offsets and are skipped or repeated. A pinned
+    "from..to" range keeps every page on the same window. A range of 0,
+    which Graylog reads as all messages, is pinned to start at the epoch.
+
+    Args:
+        time_range: Time range string (defaults to "1h")
+        now: Current wall-clock time, defaults to time.time()
+
+    Returns:
+        A "from..to" range for relative input, otherwise time_range unchanged
+    """
+    time_range = time_range or "1h"
+    parsed = parse_time_range(time_range)
+    if range_type(parsed) != "relative":
+        return time_range
+
+    end = time.time() if now is None else now
+    to = datetime.fromtimestamp(end, timezone.utc)
+    start = end - parsed["range"] if parsed["range"] else 0
+    from_ = datetime.fromtimestamp(start, timezone.utc)
+    return f"{format_timestamp(from_)}{INTERVAL_SEPARATOR}{format_timestamp(to)}"
+
+
+def views_timerange(parsed: Dict[str, Any]) -> Dict[str, Any]:
+    """Convert a parsed time range into a Views API "timerange" object."""
+    kind = range_type(parsed)
+    if kind == "relative":
+        return {"type": "relative", "range": parsed["range"]}
+    if kind == "absolute":
+        return {"type": "absolute", "from": parsed["from"], "to": parsed["to"]}
+    return {"type": "keyword", "keyword": parsed["keyword"]}
@@ -0,0 +1,238 @@
+"""Compile aggregations into a single Graylog Views search and split the results."""
+
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+VIEWS_SEARCH_ENDPOINT = "/api/views/search/sync"
+
+QUERY_ID = "query"
+
+# Series computed for each metric-only aggregation type
+SERIES_TYPES = {
+    "cardinality": ("card",),
+    "stats": ("count", "min", "max", "avg", "sum"),
+    "min": ("min",),
+    "max": ("max",),
+    "avg": ("avg",),
+    "sum": ("sum",),
+}
+
+# Aggregation types that group rows into buckets
+BUCKET_TYPES = ("terms", "date_histogram")
+
+# Legacy histogram interval names accepted by get_log_statistics
+INTERVAL_ALIASES = {
+    "minute": "1m",
+    "hour": "1h",
+    "day": "1d",
+    "week": "1w",
+    "month": "1M",
+    "quarter": "3M",
+    "year": "1y",
+}
+
+COUNT_SERIES = {"type": "count", "id": "count()"}
+
+
+def series_id(series_type: str, field: Optional[str]) -> str:
+    """Get the Graylog series ID, e.g. "card(source)"."""
+    return f"{series_type}({field or ''})"
+
+
+def _pivot(
+    search_type_id: str,
+    row_groups: List[Dict[str, Any]],
+    series: List[Dict[str, Any]],
+    sort: Optional[List[Dict[str, Any]]] = None,
+) -> Dict[str, Any]:
+    """Build a pivot search type."""
+    return {
+        "id": search_type_id,
+        "type": "pivot",
+        "row_groups": row_groups,
+        "column_groups": [],
+        "series": series,
+        "sort": sort or [],
+        "rollup": True,
+    }
+
+
+def build_views_search(
+    query: str,
+    timerange: Union[int, Dict[str, Any]],
+    metrics: Dict[str, Any],
+    stream_ids: Optional[List[str]] = None,
+) -> Tuple[Dict[str, Any], Dict[str, str]]:
+    """
+    Compile named aggregations into one Views search request.
+
+    terms and date_histogram aggregations each become a pivot with a row
+    group; all metric-only aggregations (cardinality, stats, min, max, avg,
+    sum) share a single pivot without row groups. Graylog executes every
+    pivot of the search in one request against the same time range.
+
+    Args:
+        query: Elasticsearch query string
+        timerange: Views "timerange" object, or a relative range in seconds
+        metrics: Mapping of result name to AggregationParams
+        stream_ids: Restrict the search to these streams
+
+    Returns:
+        Tuple of (request body, mapping of result name to search type ID)
+
+    Raises:
+        ValueError: If an aggregation type is not supported
+    """
+    search_types: List[Dict[str, Any]] = []
+    plan: Dict[str, str] = {}
+    shared_series: Dict[str, Dict[str, Any]] = {}
+
+    for position, (name, metric) in enumerate(metrics.items()):
+        if metric.type == "terms":
+            search_type_id = f"pivot-{position}"
+            row_group = {"type": "values", "field": metric.field, "limit": metric.size}
+            sort = [{"type": "series", "field": "count()", "direction": "Descending"}]
+            search_types.append(
+                _pivot(search_type_id, [row_group], [COUNT_SERIES], sort)
+            )
+        elif metric.type == "date_histogram":
+            search_type_id = f"pivot-{position}"
+            interval = metric.interval or "1h"
+            row_group = {
+                "type": "time",
+                "field": metric.field,
+                "interval": {
+                    "type": "timeunit",
+                    "timeunit": INTERVAL_ALIASES.get(interval, interval),
+                },
+            }
+            search_types.append(_pivot(search_type_id, [row_group], [COUNT_SERIES]))
+        elif metric.type in SERIES_TYPES:
+            search_type_id = "metrics"
+            for series_type in SERIES_TYPES[metric.type]:
+                sid = series_id(series_type, metric.field)
+                shared_series[sid] = {
+                    "type": series_type,
+                    "field": metric.field,
+                    "id": sid,
+                }
+        else:
+            raise ValueError(
+                f"Unsupported aggregation type: {metric.type}. "
+                f"Valid: {list(BUCKET_TYPES) + list(SERIES_TYPES)}"
+            )
+        plan[name] = search_type_id
+
+    if shared_series:
+        search_types.append(_pivot("metrics", [], list(shared_series.values())))
+
+    search_query: Dict[str, Any] = {
+        "id": QUERY_ID,
+        "query": {"type": "elasticsearch", "query_string": query},
+        "timerange": (
+            {"type": "relative", "range": timerange}
+            if isinstance(timerange, int)
+            else timerange
+        ),
+        "search_types": search_types,
+    }
+    if stream_ids:
+        search_query["filter"] = {
+            "type": "or",
+            "filters": [{"type": "stream", "id": sid} for sid in stream_ids],
+        }
+
+    return {"queries": [search_query], "parameters": []}, plan
+
+
+def _row_values(row: Dict[str, Any]) -> Dict[str, Any]:
+    """Map series ID to value for one pivot row."""
+    return {
+        value["key"][-1]: value.get("value")
+        for value in row.get("values", [])
+        if value.get("key")
+    }
+
+
+def _leaf_counts(pivot: Dict[str, Any]) -> Dict[str, Any]:
+    """Map each leaf row key to its count."""
+    return {
+        str(row["key"][0]): _row_values(row).get("count()")
+        for row in pivot.get("rows", [])
+        if row.get("source") == "leaf" and row.get("key")
+    }
+
+
+def _split_metric(metric: Any, pivot: Dict[str, Any]) -> Dict[str, Any]:
+    """Convert one pivot result into the output for a single aggregation."""
+    result: Dict[str, Any] = {"type": metric.type, "field": metric.field}
+
+    if metric.type == "terms":
+        result["terms"] = _leaf_counts(pivot)
+        result["total"] = pivot.get("total")
+    elif metric.type == "date_histogram":
+        result["interval"] = metric.interval or "1h"
+        result["results"] = _leaf_counts(pivot)
+        result["total"] = pivot.get("total")
+    else:
+        rows = pivot.get("rows", [])
+        totals = next((r for r in rows if not r.get("key")), rows[0] if rows else {})
+        values = _row_values(totals)
+        if metric.type == "cardinality":
+            result["cardinality"] = values.get(series_id("card", metric.field))
+        elif metric.type == "stats":
+            for series_type in SERIES_TYPES["stats"]:
+                result[series_type] = values.get(series_id(series_type, metric.field))
+        else:
+            result["value"] = values.get(series_id(metric.type, metric.field))
+
+    return result
+
+
+def split_views_result(
+    response: Dict[str, Any], metrics: Dict[str, Any], plan: Dict[str, str]
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Split a Views search response back into one result per aggregation.
+
+    Args:
+        response: Response from the Views search endpoint
+        metrics: Mapping of result name to AggregationParams
+        plan: Mapping of result name to search type ID from build_views_search
+
+    Returns:
+        Mapping of result name to its aggregation result. A search type that
+        Graylog could not compute yields {"error": ...} for its aggregations.
+    """
+    query_result = response.get("results", {}).get(QUERY_ID, {})
+    search_types = query_result.get("search_types", {})
+    errors = {
+        error.get("search_type_id"): error.get("description", "Search type failed")
+        for error in query_result.get("errors", []) + response.get("errors", [])
+        if isinstance(error, dict)
+    }
+
+    split: Dict[str, Dict[str, Any]] = {}
+    for name, metric in metrics.items():
+        search_type_id = plan[name]
+        pivot = search_types.get(search_type_id)
+        if pivot is None:
+            split[name] = {
+                "type": metric.type,
+                "field": metric.field,
+                "error": errors.get(search_type_id)
+                or errors.get(None)
+                or "No result returned",
+            }
+        else:
+            split[name] = _split_metric(metric, pivot)
+    return split
+
+
+def views_total(response: Dict[str, Any]) -> Optional[int]:
+    """Get the number of matching messages from any pivot of the response."""
+    search_types = response.get("results", {}).get(QUERY_ID, {}).get("search_types", {})
+    for search_type in search_types.values():
+        total = search_type.get("total")
+        if isinstance(total, int):
+            return total
+    return None
@@ -0,0 +1,19 @@
+"""Shared test fixtures."""
+
+import pytest
+
+
+class FakeClock:
+    """Manually advanced clock."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    """Create a fake clock starting at 0."""
+    return FakeClock()
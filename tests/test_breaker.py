@@ -0,0 +1,142 @@
+"""Tests for the circuit breakers."""
+
+import pytest
+
+from mcp_graylog.breaker import (
+    CircuitBreaker,
+    CircuitBreakers,
+    CircuitOpenError,
+    endpoint_class,
+)
+
+
+def make_breaker(now: list, **kwargs) -> CircuitBreaker:
+    """Build a breaker on a controllable clock."""
+    settings = {"window": 4, "min_calls": 4, "open_seconds": 30.0}
+    settings.update(kwargs)
+    return CircuitBreaker("search", clock=lambda: now[0], **settings)
+
+
+def call(breaker: CircuitBreaker, success: bool = True, duration: float = 0.1):
+    """Pass one call through the breaker."""
+    breaker.before_call()
+    breaker.record(success, duration)
+
+
+class TestEndpointClass:
+    """Test mapping endpoints to breaker classes."""
+
+    def test_classes(self):
+        """Test search, streams and system endpoints."""
+        assert endpoint_class("/api/search/universal/relative") == "search"
+        assert endpoint_class("/api/views/search/sync") == "search"
+        assert endpoint_class("/api/streams/abc") == "streams"
+        assert endpoint_class("/api/system") == "system"
+
+
+class TestCircuitBreaker:
+    """Test breaker state transitions."""
+
+    def test_opens_on_failure_rate(self):
+        """Test that the breaker opens and fast-fails once failures dominate."""
+        now = [0.0]
+        breaker = make_breaker(now, failure_rate=0.5)
+
+        call(breaker, success=True)
+        call(breaker, success=True)
+        call(breaker, success=False)
+        assert breaker.state == "closed"
+        call(breaker, success=False)
+
+        assert breaker.state == "open"
+        with pytest.raises(CircuitOpenError, match="search endpoints"):
+            breaker.before_call()
+        assert breaker.stats()["rejected"] == 1
+
+    def test_opens_on_slow_calls(self):
+        """Test that successful but slow calls also open the breaker."""
+        now = [0.0]
+        breaker = make_breaker(now, slow_call_seconds=5.0, slow_call_rate=0.75)
+
+        for _ in range(3):
+            call(breaker, duration=10.0)
+        call(breaker, duration=0.1)
+
+        assert breaker.state == "open"
+
+    def test_needs_min_calls(self):
+        """Test that a few early failures do not open the breaker."""
+        now = [0.0]
+        breaker = make_breaker(now)
+
+        for _ in range(3):
+            call(breaker, success=False)
+
+        assert breaker.state == "closed"
+
+    def test_half_open_probes_close_breaker(self):
+        """Test that successful probes after the wait close the breaker."""
+        now = [0.0]
+        breaker = make_breaker(now, half_open_probes=2)
+        for _ in range(4):
+            call(breaker, success=False)
+
+        now[0] = 30.0
+        assert breaker.state == "half_open"
+        breaker.before_call()
+        breaker.before_call()
+        # Only half_open_probes calls are let through at a time
+        with pytest.raises(CircuitOpenError):
+            breaker.before_call()
+
+        breaker.record(True, 0.1)
+        breaker.record(True, 0.1)
+        assert breaker.state == "closed"
+
+    def test_released_probe_is_given_back(self):
+        """Test a probe released without a call lets another caller probe."""
+        now = [0.0]
+        breaker = make_breaker(now, half_open_probes=1)
+        for _ in range(4):
+            call(breaker, success=False)
+
+        now[0] = 30.0
+        breaker.before_call()
+        breaker.release()
+        call(breaker)
+
+        assert breaker.state == "closed"
+
+    def test_failed_probe_reopens(self):
+        """Test that a failed probe opens the breaker for another period."""
+        now = [0.0]
+        breaker = make_breaker(now)
+        for _ in range(4):
+            call(breaker, success=False)
+
+        now[0] = 30.0
+        call(breaker, success=False)
+
+        assert breaker.state == "open"
+        assert breaker.stats()["times_opened"] == 2
+        now[0] = 59.0
+        assert breaker.state == "open"
+
+
+class TestCircuitBreakers:
+    """Test the per-class breaker registry."""
+
+    def test_classes_are_independent(self):
+        """Test that an open search breaker does not block streams."""
+        breakers = CircuitBreakers(window=2, min_calls=2)
+        search = breakers.for_endpoint("/api/search/universal/relative")
+        for _ in range(2):
+            call(search, success=False)
+
+        with pytest.raises(CircuitOpenError):
+            breakers.for_endpoint("/api/views/search/sync").before_call()
+        breakers.for_endpoint("/api/streams").before_call()
+
+        stats = breakers.stats()
+        assert stats["search"]["state"] == "open"
+        assert stats["streams"]["state"] == "closed"
@@ -0,0 +1,385 @@
+"""Tests for response caching."""
+
+import os
+import threading
+import time
+from unittest.mock import Mock, patch
+
+import pytest
+
+from mcp_graylog.cache import (
+    CacheBackend,
+    DiskBackend,
+    ResponseCache,
+    SingleFlight,
+    SQLiteBackend,
+    make_cache_backend,
+    make_cache_key,
+    resolve_compression,
+)
+from mcp_graylog.deadline import DeadlineExceeded, deadline
+
+
+class TestMakeCacheKey:
+    """Test cases for make_cache_key function."""
+
+    def test_key_ignores_param_order_and_none(self):
+        """Test equivalent payloads produce the same key."""
+        key_a = make_cache_key("GET", "/api/x", params={"a": 1, "b": 2, "c": None})
+        key_b = make_cache_key("get", "/api/x", params={"b": 2, "a": 1})
+        assert key_a == key_b
+
+    def test_key_normalizes_field_order(self):
+        """Test field lists are order-insensitive."""
+        key_a = make_cache_key("GET", "/api/x", params={"fields": "message,level"})
+        key_b = make_cache_key("GET", "/api/x", params={"fields": "level,message"})
+        assert key_a == key_b
+
+    def test_relative_range_aligned_to_bucket(self):
+        """Test relative ranges within one bucket share a key."""
+        params = {"query": "*", "range": 3600}
+        key_a = make_cache_key(
+            "GET", "/api/x", params=params, bucket_seconds=30, now=60
+        )
+        key_b = make_cache_key(
+            "GET", "/api/x", params=params, bucket_seconds=30, now=89
+        )
+        key_c = make_cache_key(
+            "GET", "/api/x", params=params, bucket_seconds=30, now=90
+        )
+        assert key_a == key_b
+        assert key_a != key_c
+
+    def test_different_queries_differ(self):
+        """Test different payloads produce different keys."""
+        key_a = make_cache_key("POST", "/api/x", data={"query": "a"})
+        key_b = make_cache_key("POST", "/api/x", data={"query": "b"})
+        assert key_a != key_b
+
+
+class TestResponseCache:
+    """Test cases for ResponseCache."""
+
+    @pytest.fixture
+    def cache(self, clock):
+        """Create a small cache for testing."""
+        return ResponseCache(
+            max_entries=2, ttls={"search": 10, "aggregation": 60}, clock=clock
+        )
+
+    def test_hit_and_miss_counters(self, cache):
+        """Test hits and misses are counted."""
+        assert cache.get("k") is None
+        cache.set("k", {"v": 1}, "search")
+        assert cache.get("k") == {"v": 1}
+
+        stats = cache.stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["hit_ratio"] == 0.5
+
+    def test_entries_expire_per_namespace_ttl(self, cache, clock):
+        """Test entries expire according to their namespace TTL."""
+        cache.set("search", 1, "search")
+        cache.set("agg", 2, "aggregation")
+        clock.now = 11
+
+        assert cache.get("search") is None
+        assert cache.get("agg") == 2
+
+    def test_lru_eviction(self, cache):
+        """Test least recently used entries are evicted first."""
+        cache.set("a", 1, "search")
+        cache.set("b", 2, "search")
+        cache.get("a")
+        cache.set("c", 3, "search")
+
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+        assert cache.get("c") == 3
+        assert cache.stats()["evictions"] == 1
+
+    def test_disabled_namespace(self, cache):
+        """Test namespaces without a TTL are not cached."""
+        assert cache.is_enabled("search") is True
+        assert cache.is_enabled("streams") is False
+
+        cache.set("k", 1, "streams")
+        assert cache.get("k") is None
+
+
+class TestSQLiteBackend:
+    """Test cases for the shared SQLite backend."""
+
+    def test_entries_shared_between_connections(self, tmp_path):
+        """Test an entry written by one worker is read by another."""
+        path = str(tmp_path / "cache.sqlite")
+        writer = SQLiteBackend(path)
+        reader = SQLiteBackend(path)
+
+        writer.set("k", {"messages": [1, 2]}, ttl=30)
+
+        assert reader.get("k") == {"messages": [1, 2]}
+        assert writer.get("missing") is None
+
+    def test_expiry_and_lru_eviction(self, clock, tmp_path):
+        """Test expired entries are dropped and the least recently used evicted."""
+        backend = SQLiteBackend(str(tmp_path / "c.sqlite"), max_entries=2, clock=clock)
+        backend.set("a", 1, ttl=100)
+        clock.now = 1
+        backend.set("b", 2, ttl=5)
+        clock.now = 2
+        backend.get("a")
+
+        clock.now = 10
+        assert backend.get("b") is None
+
+        clock.now = 11
+        backend.set("c", 3, ttl=100)
+        clock.now = 12
+        assert backend.set("d", 4, ttl=100) == 1
+        assert backend.get("a") is None
+        assert backend.stats()["size"] == 2
+
+    def test_reads_touch_coarsely(self, clock, tmp_path):
+        """Test reads only write their use time back after TOUCH_SECONDS."""
+        backend = SQLiteBackend(str(tmp_path / "c.sqlite"), max_entries=2, clock=clock)
+        backend.set("a", 1, ttl=1000)
+        clock.now = 1
+        backend.set("b", 2, ttl=1000)
+
+        clock.now = 30
+        backend.get("a")
+        backend.set("c", 3, ttl=1000)
+        # The recent read did not refresh "a", so it was still the oldest
+        assert backend.get("a") is None
+
+        clock.now = 100
+        backend.get("b")
+        backend.set("d", 4, ttl=1000)
+        assert backend.get("b") == 2
+        assert backend.get("c") is None
+
+
+class TestDiskBackend:
+    """Test cases for the compressed disk backend."""
+
+    def test_round_trip_compressed(self, tmp_path):
+        """Test values survive compression and are shared via the directory."""
+        value = {"messages": [{"message": "error " * 100}]}
+        DiskBackend(str(tmp_path), compression="zlib").set("k", value, ttl=30)
+
+        other = DiskBackend(str(tmp_path), compression="none")
+        assert other.get("k") == value
+        assert other.stats()["bytes"] < len("error " * 100)
+
+    def test_expired_entry_removed(self, clock, tmp_path):
+        """Test expired files are deleted on read."""
+        backend = DiskBackend(str(tmp_path), clock=clock)
+        backend.set("k", 1, ttl=5)
+        clock.now = 6
+
+        assert backend.get("k") is None
+        assert backend.stats()["size"] == 0
+
+    def test_size_based_eviction(self, tmp_path):
+        """Test the oldest entries are removed beyond max_bytes."""
+        backend = DiskBackend(str(tmp_path), max_bytes=200, compression="none")
+        backend.set("a", "x" * 80, ttl=30)
+        os.utime(backend._path("a"), (1, 1))
+        evicted = backend.set("b", "y" * 80, ttl=30) + backend.set(
+            "c", "z" * 80, ttl=30
+        )
+
+        assert evicted == 1
+        assert backend.get("a") is None
+        assert backend.get("c") == "z" * 80
+        assert backend.stats()["bytes"] <= 200
+
+    def test_directory_scanned_only_when_needed(self, clock, tmp_path):
+        """Test writes under max_bytes do not rescan the directory."""
+        backend = DiskBackend(str(tmp_path), compression="none", clock=clock)
+        scans = []
+        entries = backend._entries
+        backend._entries = lambda: scans.append(1) or entries()
+
+        for i in range(20):
+            backend.set(f"k{i}", i, ttl=30)
+        assert len(scans) == 1
+
+        clock.now = backend.RESCAN_SECONDS
+        backend.set("late", 1, ttl=100)
+        assert len(scans) == 2
+
+        backend.max_bytes = 1
+        backend.set("over", 1, ttl=100)
+        assert len(scans) == 3
+        assert backend.stats()["size"] == 0
+
+
+class TestCacheBackends:
+    """Test cases for choosing and using cache backends."""
+
+    def test_backend_is_abstract(self):
+        """Test backends must implement the storage methods."""
+        with pytest.raises(TypeError):
+            CacheBackend()
+
+    def test_missing_compression_falls_back_to_zlib(self):
+        """Test an unavailable codec falls back to zlib."""
+        with patch("mcp_graylog.cache.zstandard", None):
+            name, compress, decompress = resolve_compression("zstd")
+        assert name == "zlib"
+        assert decompress(compress(b"data")) == b"data"
+
+    def test_make_cache_backend(self, tmp_path):
+        """Test backends are created by name."""
+        assert make_cache_backend("memory").name == "memory"
+        assert make_cache_backend("disk", path=str(tmp_path)).name == "disk"
+        with pytest.raises(ValueError, match="Invalid cache backend"):
+            make_cache_backend("redis")
+
+    def test_response_cache_over_shared_backend(self, tmp_path):
+        """Test ResponseCache counts hits on a shared backend."""
+        backend = SQLiteBackend(str(tmp_path / "cache.sqlite"))
+        cache = ResponseCache(ttls={"search": 30}, backend=backend)
+        cache.set("k", {"v": 1}, "search")
+
+        assert cache.get("k") == {"v": 1}
+        stats = cache.stats()
+        assert stats["backend"] == "sqlite"
+        assert stats["hits"] == 1
+
+    def test_backend_errors_are_misses(self):
+        """Test a failing backend degrades to uncached requests."""
+        backend = Mock(name="backend")
+        backend.name = "sqlite"
+        backend.get.side_effect = OSError("disk I/O error")
+        backend.set.side_effect = OSError("disk I/O error")
+        cache = ResponseCache(ttls={"search": 30}, backend=backend)
+
+        cache.set("k", 1, "search")
+        assert cache.get("k") is None
+        assert cache.errors == 2
+        assert cache.misses == 1
+
+
+class TestSingleFlight:
+    """Test cases for SingleFlight."""
+
+    def _run_concurrently(self, single_flight, func, callers=5):
+        """Call single_flight.do from several threads and collect outcomes."""
+        outcomes = []
+
+        def worker():
+            try:
+                outcomes.append(single_flight.do("key", func))
+            except Exception as e:
+                outcomes.append(e)
+
+        threads = [threading.Thread(target=worker) for _ in range(callers)]
+        for thread in threads:
+            thread.start()
+        return threads, outcomes
+
+    def test_concurrent_calls_share_one_execution(self):
+        """Test identical concurrent calls run the function once."""
+        single_flight = SingleFlight()
+        release = threading.Event()
+        calls = []
+
+        def func():
+            calls.append(1)
+            release.wait(5)
+            return {"streams": []}
+
+        threads, outcomes = self._run_concurrently(single_flight, func)
+        while single_flight.stats()["coalesced"] < 4:
+            time.sleep(0.01)
+        release.set()
+        for thread in threads:
+            thread.join(5)
+
+        assert len(calls) == 1
+        assert outcomes == [{"streams": []}] * 5
+        assert single_flight.stats() == {
+            "in_flight": 0,
+            "executions": 1,
+            "coalesced": 4,
+        }
+
+    def test_errors_shared_with_waiters(self):
+        """Test waiters receive the leader's exception."""
+        single_flight = SingleFlight()
+        release = threading.Event()
+
+        def func():
+            release.wait(5)
+            raise RuntimeError("Graylog unavailable")
+
+        threads, outcomes = self._run_concurrently(single_flight, func, callers=3)
+        while single_flight.stats()["coalesced"] < 2:
+            time.sleep(0.01)
+        release.set()
+        for thread in threads:
+            thread.join(5)
+
+        assert len(outcomes) == 3
+        assert all(isinstance(o, RuntimeError) for o in outcomes)
+
+    def test_waiter_keeps_own_deadline(self):
+        """Test a waiter gives up at its own deadline instead of the leader's."""
+        single_flight = SingleFlight()
+        release = threading.Event()
+        leader = threading.Thread(
+            target=single_flight.do, args=("key", lambda: release.wait(5))
+        )
+        leader.start()
+        while single_flight.stats()["in_flight"] < 1:
+            time.sleep(0.01)
+
+        started = time.monotonic()
+        with deadline(0.05):
+            with pytest.raises(DeadlineExceeded, match="identical"):
+                single_flight.do("key", lambda: "unused")
+        release.set()
+        leader.join(5)
+
+        assert time.monotonic() - started < 1
+
+    def test_waiter_retries_after_leader_deadline(self):
+        """Test a waiter runs the call itself when the leader ran out of time."""
+        single_flight = SingleFlight()
+        release = threading.Event()
+
+        def hurried():
+            release.wait(5)
+            raise DeadlineExceeded()
+
+        threads, leader_outcome = self._run_concurrently(
+            single_flight, hurried, callers=1
+        )
+        while single_flight.stats()["in_flight"] < 1:
+            time.sleep(0.01)
+
+        waiter_outcome = []
+        waiter = threading.Thread(
+            target=lambda: waiter_outcome.append(single_flight.do("key", lambda: 7))
+        )
+        waiter.start()
+        while single_flight.stats()["coalesced"] < 1:
+            time.sleep(0.01)
+        release.set()
+        threads[0].join(5)
+        waiter.join(5)
+
+        assert isinstance(leader_outcome[0], DeadlineExceeded)
+        assert waiter_outcome == [7]
+
+    def test_sequential_calls_not_coalesced(self):
+        """Test calls that do not overlap each execute."""
+        single_flight = SingleFlight()
+
+        assert single_flight.do("key", lambda: 1) == 1
+        assert single_flight.do("key", lambda: 2) == 2
+        assert single_flight.stats()["coalesced"] == 0
@@ -1,10 +1,64 @@
 """Tests for Graylog client."""
 
+import asyncio
+
 import pytest
+import requests
 from unittest.mock import Mock, patch
 from datetime import datetime, timedelta
 
-from mcp_graylog.client import GraylogClient, QueryParams, AggregationParams
+from mcp_graylog.breaker import CircuitOpenError
+from mcp_graylog.deadline import DeadlineExceeded, deadline, time_remaining
+from mcp_graylog.client import (
+    AsyncGraylogClient,
+    GraylogClient,
+    QueryParams,
+    AggregationParams,
+)
+from mcp_graylog.timerange import span_seconds
+
+# Elasticsearch's default index.max_result_window
+RESULT_WINDOW = 10000
+
+
+class FakeUniversalSearch:
+    """Absolute universal search over stored messages, rejecting deep offsets."""
+
+    def __init__(self, count, per_millisecond=3):
+        start = datetime(2024, 1, 1)
+        self.messages = []
+        for i in range(count):
+            moment = start + timedelta(milliseconds=i // per_millisecond)
+            timestamp = moment.strftime("%Y-%m-%dT%H:%M:%S.%f")[:-3] + "Z"
+            self.messages.append(
+                {
+                    "message": {
+                        "_id": str(i),
+                        "message": f"job {i} failed",
+                        "timestamp": timestamp,
+                    }
+                }
+            )
+
+    def __call__(self, method, endpoint, params=None, data=None):
+        offset, limit = params["offset"], params["limit"]
+        if offset + limit > RESULT_WINDOW:
+            raise requests.exceptions.HTTPError(
+                "500 Server Error: Result window is too large"
+            )
+        matching = [
+            m
+            for m in self.messages
+            if params["from"] <= m["message"]["timestamp"] <= params["to"]
+        ]
+        matching.sort(
+            key=lambda m: m["message"]["timestamp"],
+            reverse=params["sort"] == "timestamp:desc",
+        )
+        return {
+            "messages": matching[offset : offset + limit],
+            "total_results": len(matching),
+        }
 
 
 class TestGraylogClient:
@@ -49,17 +103,23 @@ class TestGraylogClient:
         assert result == {}
 
     def test_parse_time_range_iso_format(self, client):
-        """Test parsing ISO 8601 time range format."""
-        iso_time = "2024-01-01T00:00:00Z"
-        result = client._parse_time_range(iso_time)
-        assert "range" in result
-        assert result["range"] == iso_time
+        """Test parsing an ISO 8601 interval into an absolute range."""
+        result = client._parse_time_range(
+            "2024-01-01T10:00:00Z..2024-01-01T12:20:00+02:00"
+        )
+        assert result == {
+            "from": "2024-01-01T10:00:00.000Z",
+            "to": "2024-01-01T10:20:00.000Z",
+        }
+
+    def test_parse_time_range_keyword(self, client):
+        """Test parsing a keyword time range."""
+        assert client._parse_time_range("keyword:yesterday") == {"keyword": "yesterday"}
 
     def test_parse_time_range_invalid_format(self, client):
-        """Test parsing invalid time range format."""
-        result = client._parse_time_range("invalid")
-        assert "range" in result
-        assert result["range"] == "invalid"
+        """Test invalid time ranges are rejected instead of sent to Graylog."""
+        with pytest.raises(ValueError, match="Invalid time range format"):
+            client._parse_time_range("invalid")
 
     @patch("requests.Session.request")
     def test_make_request_success(self, mock_request, client):
@@ -83,6 +143,68 @@ class TestGraylogClient:
         with pytest.raises(Exception):
             client._make_request("GET", "/api/test")
 
+    @patch("requests.Session.request")
+    def test_make_request_retries_transient_failure(self, mock_request, client):
+        """Test that a 503 on a GET is retried before succeeding."""
+        mock_sleep = Mock()
+        client.retry_policy._sleep = mock_sleep
+        unavailable = Mock(status_code=503, headers={"Retry-After": "1"})
+        ok = Mock(status_code=200, headers={"Content-Type": "application/json"})
+        ok.json.return_value = {"test": "data"}
+        mock_request.side_effect = [unavailable, ok]
+
+        result = client._make_request("GET", "/api/test")
+
+        assert result == {"test": "data"}
+        assert mock_request.call_count == 2
+        mock_sleep.assert_called_once_with(1.0)
+        assert client.retry_policy.stats()["retries"] == 1
+
+    @patch("requests.Session.request")
+    def test_open_breaker_fails_fast(self, mock_request, client):
+        """Test that an open circuit breaker rejects requests without sending them."""
+        client.retry_policy.max_attempts = 1
+        mock_request.side_effect = requests.exceptions.ConnectionError("refused")
+        breaker = client.breakers.for_endpoint("/api/streams")
+        for _ in range(breaker.min_calls):
+            with pytest.raises(requests.exceptions.ConnectionError):
+                client._make_request("GET", "/api/streams")
+
+        mock_request.reset_mock()
+        with pytest.raises(CircuitOpenError):
+            client._make_request("GET", "/api/streams")
+        mock_request.assert_not_called()
+
+    @patch("requests.Session.request")
+    def test_deadline_timeouts_do_not_trip_breaker(self, mock_request, client):
+        """Test timeouts caused by a caller's short deadline are not failures."""
+        client.retry_policy.max_attempts = 1
+        mock_request.side_effect = requests.exceptions.ReadTimeout("timed out")
+        breaker = client.breakers.for_endpoint("/api/streams")
+
+        for _ in range(breaker.min_calls):
+            with deadline(5):
+                with pytest.raises(requests.exceptions.Timeout):
+                    client._make_request("GET", "/api/streams")
+
+        assert breaker.stats()["state"] == "closed"
+        assert breaker.stats()["window_calls"] == 0
+
+    @patch("requests.Session.request")
+    def test_open_breaker_does_not_spend_rate_limit(self, mock_request, client):
+        """Test an open circuit fails before queueing for a rate limit token."""
+        client.retry_policy.max_attempts = 1
+        mock_request.side_effect = requests.exceptions.ConnectionError("refused")
+        breaker = client.breakers.for_endpoint("/api/streams")
+        for _ in range(breaker.min_calls):
+            with pytest.raises(requests.exceptions.ConnectionError):
+                client._make_request("GET", "/api/streams")
+
+        acquired = client.rate_limiters.light.stats()["acquired"]
+        with pytest.raises(CircuitOpenError):
+            client._make_request("GET", "/api/streams")
+        assert client.rate_limiters.light.stats()["acquired"] == acquired
+
     @patch.object(GraylogClient, "_make_request")
     def test_search_logs(self, mock_make_request, client):
         """Test search logs functionality."""
@@ -116,6 +238,571 @@ class TestGraylogClient:
         request_params = call_args[1]["params"]  # Get the params argument
         assert "range" in request_params  # Should have range parameter
 
+    @patch.object(GraylogClient, "_make_request")
+    def test_search_logs_uses_cache(self, mock_make_request, client):
+        """Test identical searches are served from the response cache."""
+        mock_make_request.return_value = {"messages": [], "total_results": 0}
+
+        params = QueryParams(query="test query", time_range="1h", limit=10)
+        client.search_logs(params)
+        client.search_logs(params.model_copy())
+
+        mock_make_request.assert_called_once()
+        assert client.cache.stats()["hits"] == 1
+
+    @patch.object(GraylogClient, "_make_request")
+    def test_iter_pages_follows_offsets(self, mock_make_request, client):
+        """Test paged search advances the offset until results run out."""
+        mock_make_request.side_effect = [
+            {
+                "messages": [{"message": {"id": i}} for i in range(3)],
+                "total_results": 7,
+            },
+            {
+                "messages": [{"message": {"id": i}} for i in range(3)],
+                "total_results": 7,
+            },
+            {"messages": [{"message": {"id": 0}}], "total_results": 7},
+        ]
+
+        params = QueryParams(query="*", time_range="1h")
+        pages = list(client.iter_pages(params, page_size=3))
+
+        assert [len(page) for page in pages] == [3, 3, 1]
+        offsets = [c[1]["params"]["offset"] for c in mock_make_request.call_args_list]
+        assert offsets == [0, 3, 6]
+
+    @pytest.mark.parametrize("direction", ["desc", "asc"])
+    def test_iter_pages_past_result_window(self, client, direction):
+        """Test paging by time returns every message beyond max_result_window."""
+        graylog = FakeUniversalSearch(25000)
+        params = QueryParams(
+            query="*",
+            time_range="2024-01-01T00:00:00Z..2024-01-01T01:00:00Z",
+            sort_direction=direction,
+        )
+
+        with patch.object(GraylogClient, "_make_request", side_effect=graylog):
+            pages = list(client.iter_pages(params, page_size=1000))
+
+        messages = [m["message"] for page in pages for m in page]
+        assert len(messages) == 25000
+        assert len({m["_id"] for m in messages}) == 25000
+        timestamps = [m["timestamp"] for m in messages]
+        assert timestamps == sorted(timestamps, reverse=direction == "desc")
+
+    @patch.object(GraylogClient, "_make_request")
+    def test_iter_pages_keyword_continues_by_time(self, mock_make_request, client):
+        """Test a keyword search pages on within the window Graylog resolved."""
+        page = [
+            {"message": {"timestamp": "2024-01-01T10:00:00.002Z"}},
+            {"message": {"timestamp": "2024-01-01T10:00:00.001Z"}},
+            {"message": {"timestamp": "2024-01-01T10:00:00.001Z"}},
+        ]
+        mock_make_request.side_effect = [
+            {
+                "messages": page,
+                "total_results": 5,
+                "from": "2024-01-01T00:00:00.000Z",
+                "to": "2024-01-02T00:00:00.000Z",
+            },
+            {"messages": page[-1:], "total_results": 3},
+        ]
+
+        params = QueryParams(query="*", time_range="keyword:yesterday")
+        list(client.iter_pages(params, page_size=3))
+
+        endpoints = [c[0][1] for c in mock_make_request.call_args_list]
+        assert endpoints == [
+            "/api/search/universal/keyword",
+            "/api/search/universal/absolute",
+        ]
+        second = mock_make_request.call_args[1]["params"]
+        assert second["from"] == "2024-01-01T00:00:00.000Z"
+        assert second["to"] == "2024-01-01T10:00:00.001Z"
+        assert second["offset"] == 2
+
+    @patch.object(GraylogClient, "_make_request")
+    def test_iter_pages_requests_timestamp(self, mock_make_request, client):
+        """Test paging sorts by timestamp and always fetches it."""
+        mock_make_request.return_value = {"messages": [], "total_results": 0}
+
+        params = QueryParams(query="*", fields=["message"], sort="source")
+        list(client.iter_pages(params))
+
+        request_params = mock_make_request.call_args[1]["params"]
+        assert request_params["sort"] == "timestamp:desc"
+        assert request_params["fields"] == "message,timestamp"
+
+    @patch.object(GraylogClient, "_make_request")
+    def test_iter_pages_pins_relative_window(self, mock_make_request, client):
+        """Test every page of a relative search covers the same absolute window."""
+        mock_make_request.side_effect = [
+            {"messages": [{}, {}], "total_results": 3},
+            {"messages": [{}], "total_results": 3},
+        ]
+
+        list(client.iter_pages(QueryParams(query="*", time_range="1h"), page_size=2))
+
+        calls = mock_make_request.call_args_list
+        assert {c[0][1] for c in calls} == {"/api/search/universal/absolute"}
+        windows = {(c[1]["params"]["from"], c[1]["params"]["to"]) for c in calls}
+        assert len(windows) == 1
+        assert all("range" not in c[1]["params"] for c in calls)
+
+    @patch.object(GraylogClient, "_make_request")
+    def test_search_logs_routes_by_range_type(self, mock_make_request, client):
+        """Test absolute and keyword ranges use their own endpoints."""
+        mock_make_request.return_value = {"messages": [], "total_results": 0}
+
+        client.search_logs(
+            QueryParams(
+                query="*", time_range="2024-01-01T10:00:00Z..2024-01-01T10:20:00Z"
+            )
+        )
+        endpoint = mock_make_request.call_args[0][1]
+        params = mock_make_request.call_args[1]["params"]
+        assert endpoint == "/api/search/universal/absolute"
+        assert params["from"] == "2024-01-01T10:00:00.000Z"
+        assert params["to"] == "2024-01-01T10:20:00.000Z"
+        assert "range" not in params
+
+        client.search_logs(QueryParams(query="*", time_range="keyword:yesterday"))
+        assert mock_make_request.call_args[0][1] == "/api/search/universal/keyword"
+        assert mock_make_request.call_args[1]["params"]["keyword"] == "yesterday"
+
+    @patch.object(GraylogClient, "_make_request")
+    def test_search_logs_splits_long_range(self, mock_make_request, client):
+        """Test a long oldest-first search runs as daily windows merged by timestamp."""
+        mock_make_request.side_effect = lambda *a, **kw: {
+            "messages": [{"message": {"timestamp": kw["params"]["from"]}}],
+            "total_results": 5,
+        }
+
+        result = client.search_logs(
+            QueryParams(
+                query="*",
+                time_range="2024-01-01T12:00:00Z..2024-01-04T12:00:00Z",
+                limit=2,
+                sort_direction="asc",
+            )
+        )
+
+        calls = mock_make_request.call_args_list
+        windows = sorted((c[1]["params"]["from"], c[1]["params"]["to"]) for c in calls)
+        assert windows == [
+            ("2024-01-01T12:00:00.000Z", "2024-01-01T23:59:59.999Z"),
+            ("2024-01-02T00:00:00.000Z", "2024-01-02T23:59:59.999Z"),
+            ("2024-01-03T00:00:00.000Z", "2024-01-03T23:59:59.999Z"),
+            ("2024-01-04T00:00:00.000Z", "2024-01-04T12:00:00.000Z"),
+        ]
+        assert result["total_results"] == 20
+        assert [m["message"]["timestamp"] for m in result["messages"]] == [
+            "2024-01-01T12:00:00.000Z",
+            "2024-01-02T00:00:00.000Z",
+        ]
+        assert result["shards"] == {"windows": 4, "failed": []}
+
+    @patch.object(GraylogClient, "_make_request")
+    def test_search_logs_split_reports_failed_windows(self, mock_make_request, client):
+        """Test a failing window is reported while the others are returned."""
+
+        def respond(*args, **kwargs):
+            if kwargs["params"]["from"].startswith("2024-01-02"):
+                raise Exception("Graylog API error: 500")
+            return {"messages": [], "total_results": 1}
+
+        mock_make_request.side_effect = respond
+
+        result = client.search_logs(
+            QueryParams(
+                query="*",
+                time_range="2024-01-01T00:00:00Z..2024-01-04T00:00:00Z",
+                sort_direction="asc",
+            )
+        )
+
+        assert result["total_results"] == 2
+        assert [w["from"] for w in result["shards"]["failed"]] == [
+            "2024-01-02T00:00:00.000Z"
+        ]
+        assert result["partial"] is True
+
+    @patch.object(GraylogClient, "_make_request")
+    def test_search_logs_split_counts_boundary_once(self, mock_make_request, client):
+        """Test a message exactly on a window boundary is counted in one window."""
+        timestamps = [
+            "2024-01-01T12:00:00.000Z",
+            "2024-01-02T00:00:00.000Z",
+            "2024-01-03T00:00:00.000Z",
+        ]
+
+        def respond(*args, **kwargs):
+            # Graylog's absolute ranges include both ends
+            params = kwargs["params"]
+            matches = [t for t in timestamps if params["from"] <= t <= params["to"]]
+            return {
+                "messages": [{"message": {"timestamp": t}} for t in matches],
+                "total_results": len(matches),
+            }
+
+        mock_make_request.side_effect = respond
+
+        result = client.search_logs(
+            QueryParams(
+                query="*",
+                time_range="2024-01-01T00:00:00Z..2024-01-04T00:00:00Z",
+                sort_direction="asc",
+            )
+        )
+
+        assert result["total_results"] == 3
+        assert [m["message"]["timestamp"] for m in result["messages"]] == timestamps
+
+    @patch.object(GraylogClient, "_make_request")
+    def test_search_logs_walks_newest_first(self, mock_make_request, client):
+        """Test a small newest-first search stops once the newest windows fill it."""
+        mock_make_request.side_effect = [
+            {"messages": [{"message": {"id": "a"}}], "total_results": 1},
+            {"messages": [{"message": {"id": "b"}}] * 2, "total_results": 7},
+        ]
+
+        result = client.search_logs(
+            QueryParams(
+                query="*",
+                time_range="2024-01-01T00:00:00Z..2024-01-08T00:00:00Z",
+                limit=3,
+            )
+        )
+
+        calls = mock_make_request.call_args_list
+        windows = [(c[1]["params"]["from"], c[1]["params"]["to"]) for c in calls]
+        assert windows == [
+            ("2024-01-07T23:45:00.000Z", "2024-01-08T00:00:00.000Z"),
+            ("2024-01-07T22:45:00.000Z", "2024-01-07T23:44:59.999Z"),
+        ]
+        assert [c[1]["params"]["limit"] for c in calls] == [3, 2]
+        assert len(result["messages"]) == 3
+        assert result["total_results"] == 8
+        assert result["walk"] == {
+            "windows": 2,
+            "searched_from": "2024-01-07T22:45:00.000Z",
+            "complete": False,
+        }
+
+    @patch.object(GraylogClient, "_make_request")
+    def test_search_newest_first_exhausts_range(self, mock_make_request, client):
+        """Test a walk finding too few messages covers the whole range."""
+        mock_make_request.return_value = {"messages": [], "total_results": 0}
+
+        result = client.search_newest_first(
+            QueryParams(query="*", time_range="1h", limit=1, stream_id="s1")
+        )
+
+        calls = mock_make_request.call_args_list
+        assert len(calls) == 2
+        assert all(c[1]["params"]["streams"] == ["s1"] for c in calls)
+        assert result["messages"] == []
+        assert result["walk"]["complete"] is True
+
+    @patch.object(GraylogClient, "_make_request")
+    def test_search_newest_first_all_messages(self, mock_make_request, client):
+        """Test a range of 0 (all messages) is searched in one request."""
+        mock_make_request.return_value = {"messages": [], "total_results": 0}
+
+        client.search_newest_first(QueryParams(query="*", time_range="0h", limit=1))
+
+        mock_make_request.assert_called_once()
+        assert mock_make_request.call_args[1]["params"]["range"] == 0
+
+    @patch.object(GraylogClient, "_make_request")
+    def test_iter_sharded_search_yields_windows(self, mock_make_request, client):
+        """Test every window of a long search is yielded with its messages."""
+        mock_make_request.return_value = {"messages": [{}], "total_results": 1}
+
+        windows = list(
+            client.iter_sharded_search(
+                QueryParams(
+                    query="*", time_range="2024-01-01T00:00:00Z..2024-01-04T00:00:00Z"
+                )
+            )
+        )
+
+        assert sorted(w["from"] for w in windows) == [
+            "2024-01-01T00:00:00.000Z",
+            "2024-01-02T00:00:00.000Z",
+            "2024-01-03T00:00:00.000Z",
+        ]
+        assert all(w["messages"] == [{}] for w in windows)
+
+    @patch.object(GraylogClient, "_make_request")
+    def test_iter_messages_respects_max_messages(self, mock_make_request, client):
+        """Test message iteration stops at max_messages."""
+        mock_make_request.side_effect = lambda *a, **kw: {
+            "messages": [{"message": {}}] * kw["params"]["limit"],
+            "total_results": 100,
+        }
+
+        params = QueryParams(query="*", time_range="1h")
+        messages = list(client.iter_messages(params, page_size=4, max_messages=10))
+
+        assert len(messages) == 10
+        limits = [c[1]["params"]["limit"] for c in mock_make_request.call_args_list]
+        assert limits == [4, 4, 2]
+
+    @patch("mcp_graylog.client.GraylogClient._make_request")
+    def test_get_composite_statistics_single_request(self, mock_make_request, client):
+        """Test several metrics are computed with one Views search."""
+        mock_make_request.return_value = {
+            "results": {
+                "query": {
+                    "search_types": {
+                        "metrics": {
+                            "total": 10,
+                            "rows": [
+                                {
+                                    "key": [],
+                                    "values": [{"key": ["max(took)"], "value": 5}],
+                                }
+                            ],
+                        }
+                    }
+                }
+            }
+        }
+        metrics = {
+            "slowest": AggregationParams(type="max", field="took"),
+        }
+
+        result = client.get_composite_statistics("*", "1h", metrics)
+
+        mock_make_request.assert_called_once()
+        assert mock_make_request.call_args[0][:2] == (
+            "POST",
+            "/api/views/search/sync",
+        )
+        assert result["total_results"] == 10
+        assert result["metrics"]["slowest"]["value"] == 5
+
+    @patch("mcp_graylog.client.GraylogClient._make_request")
+    def test_probe_search_counts_without_messages(self, mock_make_request, client):
+        """Test a probe returns the total and a breakdown from one Views search."""
+        mock_make_request.return_value = {
+            "results": {
+                "query": {
+                    "search_types": {
+                        "pivot-0": {
+                            "total": 42,
+                            "rows": [
+                                {
+                                    "key": ["nginx"],
+                                    "source": "leaf",
+                                    "values": [{"key": ["count()"], "value": 40}],
+                                },
+                                {
+                                    "key": ["api"],
+                                    "source": "leaf",
+                                    "values": [{"key": ["count()"], "value": 2}],
+                                },
+                            ],
+                        }
+                    }
+                }
+            }
+        }
+        params = QueryParams(query="level:3", time_range="1h", stream_id="s1")
+
+        result = client.probe_search(params)
+
+        mock_make_request.assert_called_once()
+        body = mock_make_request.call_args[1]["data"]
+        search_types = body["queries"][0]["search_types"]
+        assert [t["type"] for t in search_types] == ["pivot"]
+        assert result["total_results"] == 42
+        assert result["breakdown"] == {
+            "field": "source",
+            "terms": {"nginx": 40, "api": 2},
+        }
+
+    @patch("mcp_graylog.client.GraylogClient._make_request")
+    def test_get_composite_statistics_absolute_range(self, mock_make_request, client):
+        """Test absolute time ranges become an absolute Views timerange."""
+        mock_make_request.return_value = {"results": {}}
+        metrics = {"m": AggregationParams(type="max", field="took")}
+
+        client.get_composite_statistics(
+            "*", "2024-01-01T10:00:00Z..2024-01-01T10:20:00Z", metrics
+        )
+
+        body = mock_make_request.call_args[1]["data"]
+        assert body["queries"][0]["timerange"] == {
+            "type": "absolute",
+            "from": "2024-01-01T10:00:00.000Z",
+            "to": "2024-01-01T10:20:00.000Z",
+        }
+
+    @patch("mcp_graylog.client.GraylogClient._make_request")
+    def test_cluster_messages_streams_pages(self, mock_make_request, client):
+        """Test clustering scans pages and groups messages by template."""
+        stored = [{"message": {"message": f"job {i} failed"}} for i in range(6)]
+        mock_make_request.side_effect = lambda *a, **kw: {
+            "messages": stored[
+                kw["params"]["offset"] : kw["params"]["offset"] + kw["params"]["limit"]
+            ],
+            "total_results": len(stored),
+        }
+
+        params = QueryParams(query="level:ERROR", time_range="1h")
+        result = client.cluster_messages(params, max_messages=6, top=5)
+
+        assert result["total_messages"] == 6
+        assert result["clusters"][0]["template"] == "job <NUM> failed"
+        assert result["clusters"][0]["count"] == 6
+
+    @patch.object(GraylogClient, "_make_request")
+    def test_cluster_messages_all_time(self, mock_make_request, client):
+        """Test clustering over all messages pages from the epoch onwards."""
+        mock_make_request.return_value = {
+            "messages": [{"message": {"message": "job 7 failed"}}],
+            "total_results": 1,
+        }
+
+        params = QueryParams(query="level:ERROR", time_range="0s")
+        result = client.cluster_messages(params)
+
+        assert result["total_messages"] == 1
+        request_params = mock_make_request.call_args[1]["params"]
+        assert request_params["from"] == "1970-01-01T00:00:00.000Z"
+
+    @patch.object(GraylogClient, "_make_request")
+    def test_cluster_messages_partial_at_deadline(self, mock_make_request, client):
+        """Test clustering returns what it has when the deadline passes."""
+        page = {
+            "messages": [{"message": {"message": "job 7 failed"}}] * 1000,
+            "total_results": 5000,
+        }
+        mock_make_request.side_effect = [page, DeadlineExceeded()]
+
+        params = QueryParams(query="level:ERROR", time_range="1h")
+        result = client.cluster_messages(params, max_messages=5000)
+
+        assert result["partial"] is True
+        assert result["total_messages"] == 1000
+
+    @patch.object(GraylogClient, "_make_request")
+    def test_cluster_messages_partial_on_page_error(self, mock_make_request, client):
+        """Test a failing later page keeps the clusters built so far."""
+        page = {
+            "messages": [{"message": {"message": "job 7 failed"}}] * 1000,
+            "total_results": 50000,
+        }
+        mock_make_request.side_effect = [
+            page,
+            requests.exceptions.HTTPError("500 Server Error: max_result_window"),
+        ]
+
+        params = QueryParams(query="level:ERROR", time_range="1h")
+        result = client.cluster_messages(params, max_messages=50000)
+
+        assert result["partial"] is True
+        assert result["total_messages"] == 1000
+        assert "max_result_window" in result["error"]
+
+    def test_cluster_messages_past_result_window(self, client):
+        """Test clustering scans beyond Elasticsearch's result window."""
+        graylog = FakeUniversalSearch(25000)
+        params = QueryParams(
+            query="level:ERROR",
+            time_range="2024-01-01T00:00:00Z..2024-01-01T01:00:00Z",
+        )
+
+        with patch.object(GraylogClient, "_make_request", side_effect=graylog):
+            result = client.cluster_messages(params, max_messages=100000)
+
+        assert "partial" not in result
+        assert result["total_messages"] == 25000
+        assert result["clusters"][0]["template"] == "job <NUM> failed"
+        assert result["clusters"][0]["count"] == 25000
+
+    def test_request_timeout_per_class_and_deadline(self, client):
+        """Test timeouts follow the endpoint class and shrink to the deadline."""
+        client.timeouts = {
+            "search": (5.0, 60.0),
+            "streams": (5.0, 15.0),
+            "system": (5.0, 10.0),
+        }
+        assert client._request_timeout("/api/system") == (5.0, 10.0)
+        assert client._request_timeout("/api/streams") == (5.0, 15.0)
+
+        with deadline(2):
+            connect, read = client._request_timeout("/api/search/universal/relative")
+        assert connect <= 2 and read <= 2
+
+        with deadline(0.001):
+            import time
+
+            time.sleep(0.01)
+            with pytest.raises(DeadlineExceeded):
+                client._request_timeout("/api/search/universal/relative")
+
+    @patch("requests.Session.request")
+    def test_iter_export_rows_streams_csv(self, mock_request, client):
+        """Test CSV exports are parsed into row batches."""
+        import io
+
+        body = b'timestamp,source,message\n1,web,"multi\nline"\n2,web,ok\n3,db,ok\n'
+        mock_response = Mock()
+        mock_response.status_code = 200
+        mock_response.headers = {"Content-Type": "text/csv"}
+        mock_response.raw = io.BytesIO(body)
+        mock_response.raise_for_status.return_value = None
+        mock_request.return_value = mock_response
+
+        batches = list(client.iter_export_rows("*", "24h", batch_size=2))
+
+        assert [len(batch) for batch in batches] == [2, 1]
+        assert batches[0][0] == {
+            "timestamp": "1",
+            "source": "web",
+            "message": "multi\nline",
+        }
+        call_kwargs = mock_request.call_args[1]
+        assert call_kwargs["stream"] is True
+        assert call_kwargs["json"]["timerange"] == {"type": "relative", "range": 86400}
+        assert call_kwargs["json"]["fields_in_order"] == [
+            "timestamp",
+            "source",
+            "message",
+        ]
+        mock_response.close.assert_called_once()
+
+    @patch("requests.Session.request")
+    def test_export_to_file(self, mock_request, client, tmp_path):
+        """Test exports are copied to a file in chunks."""
+        mock_response = Mock()
+        mock_response.status_code = 200
+        mock_response.headers = {"Content-Type": "text/csv"}
+        mock_response.iter_content.return_value = [b"timestamp,message\n", b"1,ok\n"]
+        mock_response.raise_for_status.return_value = None
+        mock_request.return_value = mock_response
+
+        path = str(tmp_path / "export.csv")
+        result = client.export_to_file(path, "*", "1h", fields=["timestamp", "message"])
+
+        assert result == {"path": path, "bytes": 23}
+        with open(path) as f:
+            assert f.read() == "timestamp,message\n1,ok\n"
+
+    def test_export_keyword_range(self, client):
+        """Test exports pass keyword ranges to the Views API."""
+        body = client._build_export_request("*", "keyword:yesterday")
+        assert body["timerange"] == {"type": "keyword", "keyword": "yesterday"}
+
+    def test_export_rejects_invalid_range(self, client):
+        """Test exports reject unrecognized time ranges."""
+        with pytest.raises(ValueError, match="Invalid time range format"):
+            list(client.iter_export_rows("*", "yesterday-ish"))
+
     def test_search_logs_empty_query(self, client):
         """Test search logs with empty query raises ValueError."""
         params = QueryParams(query="", time_range="1h", limit=10)
@@ -135,6 +822,82 @@ class TestGraylogClient:
         assert result == {"buckets": []}
         mock_make_request.assert_called_once()
 
+    @patch.object(GraylogClient, "_make_request")
+    def test_get_log_statistics_histogram_fetches_tail(self, mock_make_request, client):
+        """Test repeated date histograms only request the open tail."""
+        mock_make_request.return_value = {"results": {}}
+        aggregation = AggregationParams(
+            type="date_histogram", field="timestamp", interval="5m"
+        )
+
+        client.get_log_statistics("level:ERROR", "24h", aggregation)
+        client.get_log_statistics("level:ERROR", "24h", aggregation)
+
+        calls = mock_make_request.call_args_list
+        assert {c[0][1] for c in calls} == {
+            "/api/search/universal/absolute/date_histogram"
+        }
+        spans = [span_seconds(c[1]["data"]) for c in calls]
+        assert spans[0] == 86400
+        assert spans[1] <= 300 + 60 + 300
+
+    @patch.object(GraylogClient, "_make_request")
+    def test_get_log_statistics_splits_terms(self, mock_make_request, client):
+        """Test terms over a long range are oversampled per window and merged."""
+        mock_make_request.return_value = {
+            "terms": {"ERROR": 3, "WARN": 1},
+            "missing": 0,
+            "other": 0,
+            "total": 4,
+        }
+        aggregation = AggregationParams(type="terms", field="level", size=1)
+
+        result = client.get_log_statistics("*", "7d", aggregation)
+
+        calls = mock_make_request.call_args_list
+        assert len(calls) >= 7
+        assert {c[0][1] for c in calls} == {"/api/search/universal/absolute/terms"}
+        assert {c[1]["data"]["size"] for c in calls} == {3}
+        assert result["terms"] == {"ERROR": 3 * len(calls)}
+        assert result["other"] == len(calls)
+        assert result["exact"] is True
+
+    @patch.object(GraylogClient, "_make_request")
+    def test_get_log_statistics_split_failure_is_inexact(
+        self, mock_make_request, client
+    ):
+        """Test terms missing a failed window are reported partial and inexact."""
+
+        def respond(*args, **kwargs):
+            if kwargs["data"]["from"].startswith("2024-01-02"):
+                raise requests.RequestException("Connection reset")
+            return {"terms": {"ERROR": 3}, "missing": 0, "other": 0, "total": 3}
+
+        mock_make_request.side_effect = respond
+        aggregation = AggregationParams(type="terms", field="level", size=5)
+
+        result = client.get_log_statistics(
+            "*", "2024-01-01T00:00:00Z..2024-01-04T00:00:00Z", aggregation
+        )
+
+        assert result["terms"] == {"ERROR": 6}
+        assert result["partial"] is True
+        assert result["exact"] is False
+        assert len(result["shards"]["failed"]) == 1
+
+    @patch.object(GraylogClient, "_make_request")
+    def test_get_log_statistics_all_time_histogram(self, mock_make_request, client):
+        """Test a histogram over all messages bypasses the incremental cache."""
+        mock_make_request.return_value = {"results": {"60": 5}}
+        aggregation = AggregationParams(
+            type="date_histogram", field="timestamp", interval="minute"
+        )
+
+        result = client.get_log_statistics("*", "0h", aggregation)
+
+        assert result["results"] == {"60": 5}
+        assert mock_make_request.call_args[1]["data"]["range"] == 0
+
     def test_get_log_statistics_empty_query(self, client):
         """Test get log statistics with empty query raises ValueError."""
         aggregation = AggregationParams(type="terms", field="level", size=10)
@@ -171,6 +934,22 @@ class TestGraylogClient:
         assert result == {"id": "1", "title": "Test Stream"}
         mock_make_request.assert_called_once_with("GET", "/api/streams/1")
 
+    @patch.object(GraylogClient, "_make_request")
+    def test_get_stream_info_from_fresh_catalog(self, mock_make_request, client):
+        """Test get stream info is served from a fresh stream catalog."""
+        with patch.object(
+            client.stream_catalog, "get", return_value={"id": "1", "title": "Cached"}
+        ):
+            result = client.get_stream_info("1")
+
+        assert result == {"id": "1", "title": "Cached"}
+        mock_make_request.assert_not_called()
+
+    def test_search_streams_by_name_empty(self, client):
+        """Test search streams by name with empty name raises ValueError."""
+        with pytest.raises(ValueError, match="Stream name is required"):
+            client.search_streams_by_name("  ")
+
     def test_get_stream_info_empty_id(self, client):
         """Test get stream info with empty ID raises ValueError."""
         with pytest.raises(ValueError, match="Stream ID is required"):
@@ -240,6 +1019,157 @@ class TestGraylogClient:
             assert params.query == "*"
 
 
+class TestAsyncGraylogClient:
+    """Test cases for AsyncGraylogClient."""
+
+    @pytest.fixture
+    def async_client(self):
+        """Create an AsyncGraylogClient instance for testing."""
+        client = AsyncGraylogClient(max_concurrency=4)
+        yield client
+        client.close()
+
+    def test_connection_pool_is_bounded(self, async_client):
+        """Test the session uses a bounded keep-alive pool."""
+        adapter = async_client.client.session.get_adapter("http://localhost:9000")
+        assert adapter._pool_block is True
+        assert adapter._pool_maxsize == 20
+
+    def test_search_logs_delegates(self, async_client):
+        """Test search logs runs the blocking client call."""
+        params = QueryParams(query="test query", time_range="1h", limit=10)
+        with patch.object(
+            async_client.client, "search_logs", return_value={"messages": []}
+        ) as mock_search_logs:
+            result = asyncio.run(async_client.search_logs(params))
+
+        assert result == {"messages": []}
+        mock_search_logs.assert_called_once_with(params)
+
+    def test_list_streams_delegates(self, async_client):
+        """Test list streams runs the blocking client call."""
+        with patch.object(
+            async_client.client, "_make_request", return_value={"streams": []}
+        ):
+            result = asyncio.run(async_client.list_streams())
+
+        assert result == []
+
+    def test_concurrent_calls_overlap(self, async_client):
+        """Test concurrent calls are in flight at the same time."""
+        import threading
+
+        barrier = threading.Barrier(4, timeout=5)
+
+        def fake_get_stream_info(stream_id):
+            barrier.wait()
+            return {"id": stream_id}
+
+        async def fan_out():
+            return await asyncio.gather(
+                *(async_client.get_stream_info(str(i)) for i in range(4))
+            )
+
+        with patch.object(
+            async_client.client, "get_stream_info", side_effect=fake_get_stream_info
+        ):
+            result = asyncio.run(fan_out())
+
+        assert [r["id"] for r in result] == ["0", "1", "2", "3"]
+
+    def test_resolve_streams(self, async_client):
+        """Test stream IDs, patterns and partial titles resolve to IDs."""
+        stream_id = "5abb3f2f7bb9fd00011595fe"
+        catalog = async_client.client.stream_catalog
+        with patch.object(
+            catalog, "match", return_value=[{"id": "a"}, {"id": "b"}]
+        ), patch.object(catalog, "search", side_effect=[[{"id": "b"}], []]):
+            resolved, unmatched = async_client.client.resolve_streams(
+                [stream_id, "nginx-*", "pay", "missing"]
+            )
+
+        assert resolved == [stream_id, "a", "b"]
+        assert unmatched == ["missing"]
+
+    def test_search_streams_parallel_merges_and_reports_failures(self, async_client):
+        """Test per-stream results are merged by time and failures reported."""
+        results = {
+            "a": {
+                "total_results": 2,
+                "messages": [
+                    {"message": {"timestamp": "2024-01-01T12:00:03.000Z"}},
+                    {"message": {"timestamp": "2024-01-01T12:00:01.000Z"}},
+                ],
+            },
+            "b": {
+                "total_results": 1,
+                "messages": [{"message": {"timestamp": "2024-01-01T12:00:02.000Z"}}],
+            },
+        }
+
+        def fake_search_logs(params):
+            assert params.sort == "timestamp"
+            if params.stream_id == "c":
+                raise RuntimeError("500 Server Error")
+            return results[params.stream_id]
+
+        params = QueryParams(query="level:ERROR", time_range="1h", limit=10)
+        with patch.object(
+            async_client.client,
+            "resolve_streams",
+            return_value=(["a", "b", "c"], ["nope"]),
+        ), patch.object(
+            async_client.client, "search_logs", side_effect=fake_search_logs
+        ):
+            result = asyncio.run(
+                async_client.search_streams_parallel(params, ["x"], max_concurrency=2)
+            )
+
+        assert [m["stream_id"] for m in result["messages"]] == ["a", "b", "a"]
+        assert result["total_results"] == 3
+        assert result["failed_streams"] == 1
+        assert result["streams"][2] == {
+            "stream_id": "c",
+            "error": "500 Server Error",
+        }
+        assert result["unmatched"] == ["nope"]
+
+    def test_run_keeps_deadline(self, async_client):
+        """Test calls on the worker pool see the caller's deadline."""
+
+        async def call():
+            with deadline(30):
+                return await async_client._run(time_remaining)
+
+        assert asyncio.run(call()) is not None
+
+    def test_search_streams_parallel_partial_at_deadline(self, async_client):
+        """Test streams cut off by the deadline mark the result partial."""
+
+        def fake_search_logs(params):
+            if params.stream_id == "slow":
+                raise DeadlineExceeded()
+            return {"total_results": 0, "messages": []}
+
+        params = QueryParams(query="*", time_range="1h", limit=10)
+        with patch.object(
+            async_client.client,
+            "resolve_streams",
+            return_value=(["fast", "slow"], []),
+        ), patch.object(
+            async_client.client, "search_logs", side_effect=fake_search_logs
+        ):
+            result = asyncio.run(async_client.search_streams_parallel(params, ["x"]))
+
+        assert result["partial"] is True
+        assert result["failed_streams"] == 1
+
+    def test_errors_propagate(self, async_client):
+        """Test exceptions from the blocking client reach the caller."""
+        with pytest.raises(ValueError, match="Stream ID is required"):
+            asyncio.run(async_client.get_stream_info(""))
+
+
 class TestQueryParams:
     """Test cases for QueryParams."""
 
@@ -0,0 +1,92 @@
+"""Tests for message template clustering."""
+
+from mcp_graylog.clustering import MessageClusterer, mask_message
+
+
+class TestMaskMessage:
+    """Test masking of variable tokens."""
+
+    def test_masks_uuid_and_numbers(self):
+        """Test UUIDs and numbers are replaced with placeholders."""
+        text = "timeout after 3000ms request_id=9f1c2b3a-4d5e-4f60-8a7b-1c2d3e4f5a6b"
+        assert mask_message(text) == "timeout after <NUM>ms request_id=<UUID>"
+
+    def test_masks_ip_addresses(self):
+        """Test IPv4 and IPv6 addresses are masked."""
+        assert mask_message("connect 10.0.12.1 failed") == "connect <IP> failed"
+        assert mask_message("bind fe80::1 failed") == "bind <IP> failed"
+
+    def test_masks_hex_and_timestamps(self):
+        """Test hex values and embedded timestamps are masked."""
+        text = "at 2024-01-01T12:00:00.123Z ptr=0x7ffe12 commit deadbeef12"
+        assert mask_message(text) == "at <TS> ptr=<HEX> commit <HEX>"
+
+    def test_keeps_words_and_scoped_names(self):
+        """Test plain words and C++-style scopes are left alone."""
+        text = "std::vector out of range in decade"
+        assert mask_message(text) == text
+
+    def test_truncates_before_masking(self):
+        """Test only the first max_chars characters form the template."""
+        assert mask_message("error " + "x" * 100, max_chars=8) == "error xx"
+
+
+class TestMessageClusterer:
+    """Test streaming message clustering."""
+
+    def test_groups_messages_by_template(self):
+        """Test messages differing only in IDs share a cluster."""
+        clusterer = MessageClusterer()
+        clusterer.add_all(
+            [
+                {"message": "job 1 failed", "timestamp": "2024-01-01T10:00:00Z"},
+                {"message": "job 22 failed", "timestamp": "2024-01-01T09:00:00Z"},
+                {"message": "job 3 failed", "timestamp": "2024-01-01T11:00:00Z"},
+                {"message": "disk full", "timestamp": "2024-01-01T10:30:00Z"},
+            ]
+        )
+
+        result = clusterer.result()
+
+        assert result["total_messages"] == 4
+        assert result["total_clusters"] == 2
+        top = result["clusters"][0]
+        assert top["template"] == "job <NUM> failed"
+        assert top["count"] == 3
+        assert top["exemplar"]["message"] == "job 1 failed"
+        assert top["first_timestamp"] == "2024-01-01T09:00:00Z"
+        assert top["last_timestamp"] == "2024-01-01T11:00:00Z"
+
+    def test_unwraps_envelopes_and_collects_sources(self):
+        """Test Graylog envelopes are unwrapped and sources capped."""
+        clusterer = MessageClusterer(max_sources=2)
+        for source in ["web-03", "web-01", "web-02", "web-01"]:
+            clusterer.add(
+                {"index": "graylog_1", "message": {"message": "boom", "source": source}}
+            )
+
+        cluster = clusterer.result()["clusters"][0]
+
+        assert cluster["count"] == 4
+        assert cluster["sources"] == ["web-01", "web-03"]
+
+    def test_max_clusters_counts_overflow(self):
+        """Test new templates beyond max_clusters are counted as unclustered."""
+        clusterer = MessageClusterer(max_clusters=1)
+        clusterer.add_all([{"message": "a"}, {"message": "b"}, {"message": "a"}])
+
+        result = clusterer.result()
+
+        assert result["total_clusters"] == 1
+        assert result["unclustered_messages"] == 1
+        assert result["clusters"][0]["count"] == 2
+
+    def test_top_limits_clusters(self):
+        """Test result(top) returns only the largest clusters."""
+        clusterer = MessageClusterer()
+        clusterer.add_all([{"message": m} for m in ["a", "b", "b", "c", "c", "c"]])
+
+        result = clusterer.result(top=2)
+
+        assert [c["template"] for c in result["clusters"]] == ["c", "b"]
+        assert result["total_clusters"] == 3
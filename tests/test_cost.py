@@ -0,0 +1,99 @@
+"""Tests for the query cost estimator."""
+
+from mcp_graylog.cost import (
+    estimate_query_cost,
+    format_range,
+    query_weight,
+    range_seconds,
+    rewrite_within_budget,
+)
+
+
+class TestQueryWeight:
+    """Test scoring Lucene constructs."""
+
+    def test_selective_query(self):
+        """Test plain field terms are cheap."""
+        assert query_weight("level:ERROR AND source:nginx") == (1.0, [])
+
+    def test_match_all(self):
+        """Test the unbounded '*' query."""
+        weight, reasons = query_weight("*")
+        assert weight == 3.0
+        assert "unbounded" in reasons[0]
+
+    def test_leading_wildcard_and_regex(self):
+        """Test leading wildcards and regular expressions are expensive."""
+        assert query_weight("message:*error*")[0] == 20.0
+        assert query_weight("message:/time.?out/")[0] == 20.0
+
+    def test_cheap_constructs(self):
+        """Test trailing wildcards, fuzzy terms and phrases."""
+        assert query_weight("source:web*")[0] == 2.0
+        assert query_weight("message:timeuot~2")[0] == 3.0
+        assert query_weight('message:"*not a wildcard*"')[0] == 1.0
+        assert query_weight("timestamp:[2024-01-01 TO 2024-01-02]")[0] == 1.0
+
+    def test_exists_query(self):
+        """Test field:* is not counted as a wildcard."""
+        assert query_weight("level:ERROR AND trace_id:*")[0] == 1.0
+
+
+class TestEstimateQueryCost:
+    """Test the overall cost score."""
+
+    def test_baseline(self):
+        """Test a selective 1 hour search scores 1."""
+        assert estimate_query_cost("level:ERROR", "1h", 50).score == 1.0
+
+    def test_expensive_search(self):
+        """Test a week-long leading wildcard search with a large limit."""
+        cost = estimate_query_cost("message:*error*", "7d", 1000)
+
+        assert cost.score == 168 * 20 * 10
+        assert len(cost.reasons) == 3
+
+    def test_all_messages_range(self):
+        """Test a relative range of 0 is scored as unbounded, not as an hour."""
+        cost = estimate_query_cost("message:*error*", "0h", 1000)
+
+        assert cost.range_seconds == 365 * 86400
+        assert cost.score > estimate_query_cost("message:*error*", "7d", 1000).score
+        assert "time range of 0 searches all messages" in cost.reasons
+
+    def test_range_helpers(self):
+        """Test range lengths and relative range formatting."""
+        assert range_seconds("15m") == 900
+        assert range_seconds("2024-01-01T10:00:00Z..2024-01-01T10:20:00Z") == 1200
+        assert range_seconds("keyword:yesterday") is None
+        assert format_range(7200) == "2h"
+        assert format_range(90) == "90s"
+
+
+class TestRewriteWithinBudget:
+    """Test rewriting searches to fit the maximum cost."""
+
+    def test_lowers_limit_then_narrows_range(self):
+        """Test the limit is cut to the base limit before the range shrinks."""
+        cost = estimate_query_cost("message:*error*", "7d", 1000)
+
+        time_range, limit = rewrite_within_budget(cost, "7d", 1000, 2000)
+
+        assert limit == 100
+        assert time_range == "100h"
+        assert estimate_query_cost("message:*error*", time_range, limit).score <= 2000
+
+    def test_limit_alone_can_be_enough(self):
+        """Test the range is kept when lowering the limit suffices."""
+        cost = estimate_query_cost("*", "7d", 1000)
+
+        assert rewrite_within_budget(cost, "7d", 1000, 1008) == ("7d", 200)
+
+    def test_absolute_range_is_kept(self):
+        """Test absolute ranges are never replaced by relative ones."""
+        cost = estimate_query_cost("message:*x*", "2024-01-01T00:00:00Z", 100)
+
+        assert rewrite_within_budget(cost, "2024-01-01T00:00:00Z", 100, 1) == (
+            "2024-01-01T00:00:00Z",
+            100,
+        )
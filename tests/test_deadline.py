@@ -0,0 +1,80 @@
+"""Tests for tool call deadlines."""
+
+import asyncio
+import time
+
+import pytest
+
+from mcp_graylog.deadline import (
+    DeadlineExceeded,
+    deadline,
+    deadline_expired,
+    detached,
+    time_remaining,
+    with_deadline,
+)
+from mcp_graylog.pagination import prefetch
+
+
+class TestDeadline:
+    """Test setting and reading deadlines."""
+
+    def test_no_deadline_by_default(self):
+        """Test that nothing is limited outside of a deadline block."""
+        assert time_remaining() is None
+        assert not deadline_expired()
+
+    def test_nested_deadline_never_extends(self):
+        """Test that an inner block can only shorten the budget."""
+        with deadline(10):
+            with deadline(100):
+                assert time_remaining() <= 10
+            with deadline(1):
+                assert time_remaining() <= 1
+        assert time_remaining() is None
+
+    def test_expired(self):
+        """Test that a spent budget reports zero time left."""
+        with deadline(0.01):
+            time.sleep(0.02)
+            assert time_remaining() == 0.0
+            assert deadline_expired()
+
+    def test_disabled_deadline(self):
+        """Test that zero leaves calls unlimited."""
+        with deadline(0):
+            assert time_remaining() is None
+
+    def test_with_deadline_decorator(self):
+        """Test that each decorated call gets its own budget."""
+
+        @with_deadline(lambda: 30)
+        async def tool():
+            return time_remaining()
+
+        left = asyncio.run(tool())
+        assert 29 < left <= 30
+        assert time_remaining() is None
+
+    def test_prefetch_shares_deadline(self):
+        """Test that the prefetch thread sees the caller's deadline."""
+
+        def pages():
+            yield time_remaining()
+
+        with deadline(30):
+            assert list(prefetch(pages(), depth=1))[0] is not None
+
+    def test_detached_runs_without_deadline(self):
+        """Test that detached iterators ignore the caller's deadline."""
+
+        def pages():
+            yield time_remaining()
+
+        with deadline(30):
+            assert list(detached(pages())) == [None]
+
+    def test_exception_message(self):
+        """Test the default error message."""
+        with pytest.raises(DeadlineExceeded, match="Deadline exceeded"):
+            raise DeadlineExceeded()
@@ -0,0 +1,83 @@
+"""Tests for tool response encoding."""
+
+import json
+from datetime import datetime
+
+import pytest
+
+from mcp_graylog import encoding
+from mcp_graylog.encoding import ResponseEncoder, resolve_backend
+
+AVAILABLE_BACKENDS = [
+    name
+    for name, module in (
+        ("orjson", encoding.orjson),
+        ("msgspec", encoding.msgspec),
+        ("json", json),
+    )
+    if module is not None
+]
+
+RESULT = {
+    "messages": [{"message": {"message": "Ошибка: timeout", "level": 3}}],
+    "total_results": 1,
+}
+
+
+class TestResolveBackend:
+    """Test cases for resolve_backend function."""
+
+    def test_auto_prefers_fast_backend(self):
+        """Test auto resolves to the first installed backend."""
+        name, _ = resolve_backend("auto")
+        assert name == AVAILABLE_BACKENDS[0]
+
+    def test_invalid_backend(self):
+        """Test unknown backend names are rejected."""
+        with pytest.raises(ValueError, match="Invalid JSON backend"):
+            resolve_backend("yaml")
+
+    def test_missing_backend_falls_back(self, monkeypatch):
+        """Test a backend that is not installed falls back to json."""
+        monkeypatch.setattr(encoding, "msgspec", None)
+        name, _ = resolve_backend("msgspec")
+        assert name == "json"
+
+
+class TestResponseEncoder:
+    """Test cases for ResponseEncoder."""
+
+    @pytest.mark.parametrize("backend", AVAILABLE_BACKENDS)
+    def test_compact_output(self, backend):
+        """Test compact output has no insignificant whitespace."""
+        output = ResponseEncoder(backend=backend).encode(RESULT)
+
+        assert json.loads(output) == RESULT
+        assert "\n" not in output
+        assert ", " not in output and ": " not in output.replace("Ошибка: ", "")
+
+    @pytest.mark.parametrize("backend", AVAILABLE_BACKENDS)
+    def test_pretty_output(self, backend):
+        """Test pretty output is indented."""
+        output = ResponseEncoder(backend=backend, pretty=True).encode(RESULT)
+
+        assert json.loads(output) == RESULT
+        assert '\n  "messages"' in output
+
+    def test_non_ascii_kept_verbatim(self):
+        """Test non-ASCII text is not escaped."""
+        output = ResponseEncoder(backend="json").encode(RESULT)
+        assert "Ошибка" in output
+
+    @pytest.mark.parametrize("backend", AVAILABLE_BACKENDS)
+    def test_unsupported_values_stringified(self, backend):
+        """Test values without a JSON type are encoded as strings."""
+        output = ResponseEncoder(backend=backend).encode({"at": datetime(2024, 1, 1)})
+        assert json.loads(output)["at"].startswith("2024-01-01")
+
+    def test_compact_is_smaller_than_pretty(self):
+        """Test compact output is smaller than indented output."""
+        result = {"messages": [{"message": dict(RESULT)} for _ in range(50)]}
+        compact = ResponseEncoder(backend="json").encode(result)
+        pretty = ResponseEncoder(backend="json", pretty=True).encode(result)
+        assert len(compact) < len(pretty) * 0.8
@@ -0,0 +1,43 @@
+"""Tests for merging concurrently fetched results."""
+
+from mcp_graylog.fanout import merge_by_timestamp, message_timestamp
+
+
+def envelope(timestamp):
+    """Create a Graylog message envelope with a timestamp."""
+    return {"index": "graylog_0", "message": {"timestamp": timestamp}}
+
+
+class TestMergeByTimestamp:
+    """Test k-way timestamp merging."""
+
+    def test_message_timestamp(self):
+        """Test timestamps are read from envelopes and flat messages."""
+        assert message_timestamp(envelope("2024-01-01T00:00:00.000Z")) == (
+            "2024-01-01T00:00:00.000Z"
+        )
+        assert message_timestamp({"timestamp": "t"}) == "t"
+        assert message_timestamp({"message": "text"}) == ""
+
+    def test_merge_descending(self):
+        """Test newest-first lists merge into one newest-first list."""
+        first = [envelope("2024-01-01T00:00:05Z"), envelope("2024-01-01T00:00:01Z")]
+        second = [envelope("2024-01-01T00:00:04Z"), envelope("2024-01-01T00:00:02Z")]
+
+        merged = merge_by_timestamp([first, second])
+
+        assert [message_timestamp(m)[-3:-1] for m in merged] == [
+            "05",
+            "04",
+            "02",
+            "01",
+        ]
+
+    def test_merge_ascending_with_limit(self):
+        """Test oldest-first merging stops at the limit."""
+        first = [{"timestamp": "1"}, {"timestamp": "4"}]
+        second = [{"timestamp": "2"}, {"timestamp": "3"}]
+
+        merged = merge_by_timestamp([first, second], descending=False, limit=3)
+
+        assert [m["timestamp"] for m in merged] == ["1", "2", "3"]
@@ -0,0 +1,130 @@
+"""Tests for incremental date histograms."""
+
+from mcp_graylog.histogram import HistogramCache, bucket_epoch, interval_seconds
+
+
+class FakeGraylog:
+    """
+    Histogram source with one message per second, recording requested spans.
+
+    Its own clock runs lag seconds ahead of the caller's, as if requests
+    arrived late or the clocks were skewed.
+    """
+
+    def __init__(self, clock, interval, lag=0.0):
+        self.clock = clock
+        self.interval = interval
+        self.lag = lag
+        self.requests = []
+
+    def __call__(self, start, end):
+        self.requests.append(round(end - start))
+        end = min(end, self.clock.now + self.lag)
+        results = {}
+        bucket = start // self.interval * self.interval
+        while bucket < end:
+            covered = min(bucket + self.interval, end) - max(bucket, start)
+            results[str(int(bucket))] = int(covered)
+            bucket += self.interval
+        return {"results": results, "interval": "minute", "time": 5}
+
+
+class TestHelpers:
+    """Test interval and bucket key parsing."""
+
+    def test_interval_seconds(self):
+        """Test fixed intervals are converted and calendar intervals are not."""
+        assert interval_seconds("5m") == 300
+        assert interval_seconds("minute") == 60
+        assert interval_seconds("month") is None
+        assert interval_seconds(None) is None
+
+    def test_bucket_epoch(self):
+        """Test epoch and ISO 8601 bucket keys are parsed."""
+        assert bucket_epoch("1700000000") == 1700000000
+        assert bucket_epoch("1970-01-01T00:01:00.000Z") == 60
+        assert bucket_epoch("yesterday") is None
+
+
+class TestHistogramCache:
+    """Test closed bucket reuse."""
+
+    def test_second_poll_fetches_only_tail(self, clock):
+        """Test a repeated poll reuses closed buckets and fetches the tail."""
+        clock.now = 36000.0
+        graylog = FakeGraylog(clock, 60)
+        cache = HistogramCache(settle_seconds=60, clock=clock)
+
+        first = cache.fetch("k", 3600, 60, graylog)
+        clock.now += 300
+        second = cache.fetch("k", 3600, 60, graylog)
+
+        assert graylog.requests == [3600, 360]
+        assert len(first["results"]) == 60
+        assert len(second["results"]) == 60
+        assert second["incremental"]["reused_buckets"] == 54
+        assert set(second["results"].values()) == {60}
+        assert list(second["results"]) == sorted(second["results"], key=int)
+        assert cache.stats()["tail_fetches"] == 1
+
+    def test_results_match_full_fetch(self, clock):
+        """Test incremental results equal a fresh full computation."""
+        clock.now = 36030.0
+        graylog = FakeGraylog(clock, 60)
+        cache = HistogramCache(settle_seconds=60, clock=clock)
+        cache.fetch("k", 3600, 60, graylog)
+
+        clock.now += 125
+        incremental = cache.fetch("k", 3600, 60, graylog)
+        fresh = HistogramCache(settle_seconds=60, clock=clock).fetch(
+            "k", 3600, 60, graylog
+        )
+
+        assert incremental["results"] == fresh["results"]
+
+    def test_lagging_server_clock(self, clock):
+        """Test closed buckets stay complete when Graylog's clock runs ahead."""
+        clock.now = 36000.0
+        graylog = FakeGraylog(clock, 60, lag=0.3)
+        cache = HistogramCache(settle_seconds=60, clock=clock)
+
+        cache.fetch("k", 3600, 60, graylog)
+        for _ in range(5):
+            clock.now += 90.5
+            polled = cache.fetch("k", 3600, 60, graylog)
+
+        closed = list(polled["results"].values())[:-2]
+        assert set(closed) == {60}
+
+    def test_wider_range_refetches(self, clock):
+        """Test a range reaching before the cached buckets is fetched in full."""
+        clock.now = 36000.0
+        graylog = FakeGraylog(clock, 60)
+        cache = HistogramCache(clock=clock)
+
+        cache.fetch("k", 600, 60, graylog)
+        cache.fetch("k", 3600, 60, graylog)
+
+        assert graylog.requests == [600, 3600]
+
+    def test_retention_evicts_old_buckets(self, clock):
+        """Test buckets older than the retention horizon are dropped."""
+        clock.now = 36000.0
+        graylog = FakeGraylog(clock, 60)
+        cache = HistogramCache(retention=1800, clock=clock)
+
+        cache.fetch("k", 1800, 60, graylog)
+        clock.now += 900
+        cache.fetch("other", 60, 60, graylog)
+
+        assert cache.stats()["buckets"] == 14
+        reached_back = cache.fetch("k", 2400, 60, graylog)
+        assert reached_back["incremental"]["fetched_seconds"] == 2400
+
+    def test_unparseable_keys_pass_through(self, clock):
+        """Test responses with unknown bucket keys are returned unchanged."""
+        cache = HistogramCache(clock=clock)
+        response = {"results": {"not-a-time": 1}}
+
+        assert cache.fetch("k", 3600, 60, lambda start, end: response) is response
+        assert cache.stats()["series"] == 0
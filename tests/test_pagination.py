@@ -0,0 +1,123 @@
+"""Tests for prefetching iterators and search cursors."""
+
+import threading
+import time
+
+import pytest
+
+from mcp_graylog.deadline import deadline
+from mcp_graylog.pagination import CursorStore, prefetch
+
+
+class TestPrefetch:
+    """Test cases for prefetch function."""
+
+    def test_preserves_order(self):
+        """Test items are yielded in source order."""
+        assert list(prefetch(iter(range(10)), depth=3)) == list(range(10))
+
+    def test_zero_depth_is_passthrough(self):
+        """Test depth 0 iterates inline."""
+        assert list(prefetch([1, 2, 3], depth=0)) == [1, 2, 3]
+
+    def test_source_errors_propagate(self):
+        """Test exceptions from the source reach the consumer."""
+
+        def source():
+            yield 1
+            raise RuntimeError("page fetch failed")
+
+        items = prefetch(source(), depth=2)
+        assert next(items) == 1
+        with pytest.raises(RuntimeError, match="page fetch failed"):
+            next(items)
+
+    def test_buffer_is_bounded(self):
+        """Test the producer stays at most depth items ahead."""
+        produced = []
+        ahead = threading.Event()
+
+        def source():
+            for i in range(100):
+                produced.append(i)
+                if len(produced) >= 4:
+                    ahead.set()
+                yield i
+
+        items = prefetch(source(), depth=2)
+        assert next(items) == 0
+        ahead.wait(2)
+        # one consumed, two buffered, one blocked waiting for space
+        assert len(produced) <= 4
+        items.close()
+
+
+class TestCursorStore:
+    """Test cases for CursorStore."""
+
+    @pytest.fixture
+    def store(self, clock):
+        """Create a cursor store for testing."""
+        return CursorStore(ttl=60, max_cursors=2, clock=clock)
+
+    def test_take_resumes_iterator(self, store):
+        """Test successive takes continue where the last one stopped."""
+        token = store.open(iter(range(5)))
+
+        batch, token, total = store.take(token, 2)
+        assert batch == [0, 1]
+        assert total == 2
+
+        batch, token, total = store.take(token, 2)
+        assert batch == [2, 3]
+
+        batch, token, total = store.take(token, 2)
+        assert batch == [4]
+        assert token is None
+        assert total == 5
+
+    def test_exhausted_cursor_is_removed(self, store):
+        """Test exhausted cursors cannot be resumed."""
+        token = store.open(iter([1]))
+        store.take(token, 10)
+
+        with pytest.raises(KeyError):
+            store.take(token, 10)
+
+    def test_take_stops_waiting_at_deadline(self, store):
+        """Test a take blocked on a slow page returns at the deadline."""
+        release = threading.Event()
+
+        def source():
+            yield 1
+            release.wait(5)
+            yield 2
+
+        token = store.open(source())
+        started = time.monotonic()
+        with deadline(0.1):
+            batch, token, total = store.take(token, 2)
+
+        assert time.monotonic() - started < 1
+        assert batch == [1]
+        assert token is not None
+        release.set()
+        assert store.take(token, 2)[0] == [2]
+
+    def test_idle_cursor_expires(self, store, clock):
+        """Test idle cursors expire after the TTL."""
+        token = store.open(iter(range(5)))
+        clock.now = 61
+
+        with pytest.raises(KeyError):
+            store.take(token, 1)
+
+    def test_oldest_cursor_dropped_at_capacity(self, store):
+        """Test the oldest cursor is dropped when the store is full."""
+        first = store.open(iter(range(5)))
+        store.open(iter(range(5)))
+        store.open(iter(range(5)))
+
+        assert store.stats()["open_cursors"] == 2
+        with pytest.raises(KeyError):
+            store.take(first, 1)
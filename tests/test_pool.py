@@ -0,0 +1,88 @@
+"""Tests for the instrumented connection pool."""
+
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+from mcp_graylog.pool import PooledHTTPAdapter
+
+
+class OkHandler(BaseHTTPRequestHandler):
+    """Keep-alive handler answering every GET with a small JSON body."""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        body = b"{}"
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server_url():
+    """Run a local HTTP server for the duration of a test."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), OkHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def make_session(adapter):
+    """Create a session routed through the adapter."""
+    session = requests.Session()
+    session.mount("http://", adapter)
+    return session
+
+
+class TestPooledHTTPAdapter:
+    """Test cases for PooledHTTPAdapter."""
+
+    def test_connections_are_reused(self, server_url):
+        """Test sequential requests share one keep-alive connection."""
+        adapter = PooledHTTPAdapter(pool_maxsize=4)
+        session = make_session(adapter)
+
+        for _ in range(3):
+            session.get(server_url + "/api").raise_for_status()
+
+        stats = adapter.stats()
+        assert stats["created"] == 1
+        assert stats["reused"] == 2
+        assert stats["in_use"] == 0
+        assert stats["idle"] == 1
+
+    def test_idle_connections_are_evicted(self, server_url):
+        """Test connections idle past the timeout are replaced."""
+        adapter = PooledHTTPAdapter(pool_maxsize=4, idle_timeout=0.05)
+        session = make_session(adapter)
+
+        session.get(server_url + "/api")
+        time.sleep(0.1)
+        session.get(server_url + "/api")
+
+        stats = adapter.stats()
+        assert stats["evicted_idle"] == 1
+        assert stats["created"] == 2
+        assert stats["reused"] == 0
+
+    def test_warm_opens_idle_connections(self, server_url):
+        """Test pre-warming leaves connected sockets in the pool."""
+        adapter = PooledHTTPAdapter(pool_maxsize=4)
+        session = make_session(adapter)
+
+        assert adapter.warm(session, server_url, 10) == 4
+        assert adapter.stats()["idle"] == 4
+
+        session.get(server_url + "/api")
+        assert adapter.stats()["reused"] == 1
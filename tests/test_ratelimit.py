@@ -0,0 +1,117 @@
+"""Tests for client-side rate limiting."""
+
+import threading
+import time
+
+import pytest
+
+from mcp_graylog.deadline import DeadlineExceeded, deadline
+from mcp_graylog.ratelimit import (
+    INTERACTIVE,
+    NORMAL,
+    RateLimiter,
+    RateLimiters,
+    request_range,
+)
+
+
+class TestRequestRange:
+    """Test reading the time range of a request."""
+
+    def test_legacy_params(self):
+        """Test the range query parameter of the legacy search API."""
+        assert request_range({"query": "*", "range": 3600}, None) == 3600
+
+    def test_views_body(self):
+        """Test Views searches with one or several queries."""
+        assert request_range(None, {"timerange": {"range": 60}}) == 60
+        body = {"queries": [{"timerange": {"range": 60}}, {"timerange": {"range": 90}}]}
+        assert request_range(None, body) == 90
+
+    def test_absolute_range(self):
+        """Test absolute ranges count their span."""
+        params = {"from": "2024-01-01T10:00:00.000Z", "to": "2024-01-01T10:20:00.000Z"}
+        assert request_range(params, None) == 1200
+        body = {"timerange": dict(params, type="absolute")}
+        assert request_range(None, body) == 1200
+
+    def test_no_relative_range(self):
+        """Test requests without a relative range."""
+        assert request_range({"range": "2024-01-01T00:00:00Z"}, None) is None
+        assert request_range(None, None) is None
+
+
+class TestRateLimiter:
+    """Test the priority token bucket."""
+
+    def test_burst_then_rate(self):
+        """Test that requests beyond the burst wait for a token."""
+        limiter = RateLimiter("light", rate=50.0, burst=2)
+
+        assert limiter.acquire() == 0.0
+        assert limiter.acquire() == 0.0
+        assert limiter.acquire() > 0.0
+
+        stats = limiter.stats()
+        assert stats["acquired"] == 3
+        assert stats["delayed"] == 1
+        assert stats["queued"] == 0
+
+    def test_disabled(self):
+        """Test that a rate of 0 never waits."""
+        limiter = RateLimiter("heavy", rate=0.0)
+        for _ in range(10):
+            assert limiter.acquire() == 0.0
+
+    def test_interactive_requests_go_first(self):
+        """Test that an interactive waiter is admitted before earlier bulk ones."""
+        limiter = RateLimiter("heavy", rate=5.0, burst=1)
+        limiter.acquire()
+        order = []
+
+        def take(name, priority):
+            limiter.acquire(priority)
+            order.append(name)
+
+        bulk = threading.Thread(target=take, args=("bulk", NORMAL))
+        bulk.start()
+        time.sleep(0.05)
+        urgent = threading.Thread(target=take, args=("urgent", INTERACTIVE))
+        urgent.start()
+        time.sleep(0.02)
+        assert limiter.stats()["queued"] == 2
+
+        bulk.join()
+        urgent.join()
+        assert order == ["urgent", "bulk"]
+        assert limiter.stats()["max_queued"] == 2
+
+    def test_deadline_while_queued(self):
+        """Test that a queued request gives up at its deadline."""
+        limiter = RateLimiter("heavy", rate=0.5, burst=1)
+        limiter.acquire()
+
+        with deadline(0.05):
+            with pytest.raises(DeadlineExceeded, match="rate limit"):
+                limiter.acquire()
+
+        assert limiter.stats()["queued"] == 0
+
+
+class TestRateLimiters:
+    """Test classifying requests as heavy or light."""
+
+    def test_for_request(self):
+        """Test long searches are heavy and everything else light."""
+        limiters = RateLimiters(
+            heavy=RateLimiter("heavy", rate=1.0),
+            light=RateLimiter("light", rate=1.0),
+            heavy_range=21600,
+        )
+        search = "/api/search/universal/relative"
+
+        assert limiters.for_request(search, {"range": 604800}, None).name == "heavy"
+        assert limiters.for_request(search, {"range": 300}, None).name == "light"
+        assert limiters.for_request(search, {"range": 0}, None).name == "heavy"
+        assert limiters.for_request("/api/streams", None, None).name == "light"
+        assert limiters.for_request("/api/system", None, None).name == "light"
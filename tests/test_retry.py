@@ -0,0 +1,165 @@
+"""Tests for the retry policy."""
+
+from unittest.mock import Mock
+
+import pytest
+import requests
+
+from mcp_graylog.deadline import deadline
+from mcp_graylog.retry import RetryBudget, RetryPolicy, parse_retry_after
+
+
+def make_response(status: int, retry_after: str = None) -> Mock:
+    """Build a mock response with an optional Retry-After header."""
+    response = Mock()
+    response.status_code = status
+    response.headers = {"Retry-After": retry_after} if retry_after else {}
+    return response
+
+
+def make_policy(**kwargs) -> tuple:
+    """Build a policy that records sleeps instead of sleeping."""
+    sleeps = []
+    kwargs.setdefault("rng", lambda: 1.0)
+    policy = RetryPolicy(sleep=sleeps.append, **kwargs)
+    return policy, sleeps
+
+
+class TestParseRetryAfter:
+    """Test Retry-After parsing."""
+
+    def test_seconds(self):
+        """Test a delay in seconds."""
+        assert parse_retry_after("3") == 3.0
+
+    def test_http_date(self):
+        """Test an HTTP date relative to now."""
+        now = 1760000000.0
+        assert parse_retry_after("Thu, 09 Oct 2025 08:53:40 GMT", now=now) == 20.0
+
+    def test_missing_or_invalid(self):
+        """Test absent and unparseable values."""
+        assert parse_retry_after(None) is None
+        assert parse_retry_after("soon") is None
+
+
+class TestRetryBudget:
+    """Test the retry token bucket."""
+
+    def test_exhausts_and_refills(self):
+        """Test that tokens run out and refill over time."""
+        now = [0.0]
+        budget = RetryBudget(capacity=2, refill_rate=1.0, clock=lambda: now[0])
+
+        assert budget.try_acquire()
+        assert budget.try_acquire()
+        assert not budget.try_acquire()
+
+        now[0] = 1.0
+        assert budget.try_acquire()
+        assert not budget.try_acquire()
+
+
+class TestRetryPolicy:
+    """Test retrying transient failures."""
+
+    def test_retries_transient_status(self):
+        """Test that a 503 is retried until the request succeeds."""
+        policy, sleeps = make_policy()
+        send = Mock(side_effect=[make_response(503), make_response(200)])
+
+        response = policy.call("GET", send)
+
+        assert response.status_code == 200
+        assert send.call_count == 2
+        assert len(sleeps) == 1
+        assert policy.stats()["retries"] == 1
+        assert policy.stats()["recovered"] == 1
+
+    def test_full_jitter_backoff(self):
+        """Test that the delay is a random fraction of the capped exponential."""
+        policy, _ = make_policy(backoff_base=0.5, backoff_max=3.0, rng=lambda: 0.5)
+
+        assert policy.backoff(1) == 0.5
+        assert policy.backoff(2) == 1.0
+        assert policy.backoff(5) == 1.5
+
+    def test_retries_connection_errors(self):
+        """Test that connection errors are retried and re-raised when exhausted."""
+        policy, sleeps = make_policy(max_attempts=3)
+        send = Mock(side_effect=requests.exceptions.ConnectionError("reset"))
+
+        with pytest.raises(requests.exceptions.ConnectionError):
+            policy.call("GET", send)
+
+        assert send.call_count == 3
+        assert len(sleeps) == 2
+        assert policy.stats()["exhausted"] == 1
+
+    def test_returns_last_response_when_exhausted(self):
+        """Test that the final failed response is returned to the caller."""
+        policy, _ = make_policy(max_attempts=2)
+        send = Mock(side_effect=[make_response(502), make_response(504)])
+
+        assert policy.call("GET", send).status_code == 504
+
+    def test_non_idempotent_methods_are_not_retried(self):
+        """Test that POST requests are sent once."""
+        policy, sleeps = make_policy()
+        send = Mock(return_value=make_response(503))
+
+        assert policy.call("POST", send).status_code == 503
+        assert send.call_count == 1
+        assert sleeps == []
+
+    def test_client_errors_are_not_retried(self):
+        """Test that non-transient statuses are returned immediately."""
+        policy, _ = make_policy()
+        send = Mock(return_value=make_response(400))
+
+        assert policy.call("GET", send).status_code == 400
+        assert send.call_count == 1
+
+    def test_honors_retry_after(self):
+        """Test that Retry-After replaces the computed backoff."""
+        policy, sleeps = make_policy(backoff_max=5.0)
+        send = Mock(side_effect=[make_response(429, "2"), make_response(200)])
+
+        policy.call("GET", send)
+
+        assert sleeps == [2.0]
+        assert policy.stats()["retry_after_honored"] == 1
+
+    def test_long_retry_after_is_not_waited_for(self):
+        """Test that a Retry-After beyond backoff_max gives up immediately."""
+        policy, sleeps = make_policy(backoff_max=5.0)
+        send = Mock(return_value=make_response(503, "120"))
+
+        assert policy.call("GET", send).status_code == 503
+        assert send.call_count == 1
+        assert sleeps == []
+
+    def test_budget_stops_retry_storm(self):
+        """Test that retries stop once the shared budget is empty."""
+        budget = RetryBudget(capacity=1, refill_rate=0.0)
+        policy, _ = make_policy(max_attempts=5, budget=budget)
+        send = Mock(return_value=make_response(503))
+
+        policy.call("GET", send)
+        policy.call("GET", send)
+
+        # One retry for the first call, none for the second
+        assert send.call_count == 3
+        stats = policy.stats()
+        assert stats["retries"] == 1
+        assert stats["budget_denied"] == 2
+
+    def test_does_not_sleep_past_deadline(self):
+        """Test that a retry that would end after the deadline is skipped."""
+        policy, sleeps = make_policy(backoff_max=5.0)
+        send = Mock(side_effect=[make_response(429, "3"), make_response(200)])
+
+        with deadline(1):
+            assert policy.call("GET", send).status_code == 429
+
+        assert sleeps == []
@@ -0,0 +1,235 @@
+"""Tests for MCP server tools."""
+
+import asyncio
+import json
+from unittest.mock import AsyncMock, patch
+
+from mcp_graylog import server
+from mcp_graylog.server import BatchOperation, BatchRequest
+
+
+class TestBatch:
+    """Test cases for the batch tool."""
+
+    def test_invalid_operations_run_nothing(self):
+        """Test validation errors are reported before anything runs."""
+        request = BatchRequest(
+            operations=[
+                BatchOperation(op="list_streams"),
+                BatchOperation(op="drop_index"),
+                BatchOperation(op="search_logs", params={"query": ""}),
+            ]
+        )
+        with patch.object(
+            server.graylog_client, "list_streams", new=AsyncMock()
+        ) as mock_list_streams:
+            result = json.loads(asyncio.run(server.batch(request)))
+
+        mock_list_streams.assert_not_called()
+        assert result["error"] == "Batch validation failed"
+        assert [e["index"] for e in result["invalid_operations"]] == [1, 2]
+
+    def test_results_in_order_with_partial_failure(self):
+        """Test results keep request order and failures stay per operation."""
+        request = BatchRequest(
+            operations=[
+                BatchOperation(op="get_stream_info", params={"stream_id": "missing"}),
+                BatchOperation(op="list_streams"),
+                BatchOperation(op="get_stream_info", params={"stream_id": "s1"}),
+            ]
+        )
+
+        async def fake_get_stream_info(stream_id):
+            if stream_id == "missing":
+                raise RuntimeError("404 Client Error")
+            return {"id": stream_id}
+
+        with patch.object(
+            server.graylog_client,
+            "get_stream_info",
+            new=AsyncMock(side_effect=fake_get_stream_info),
+        ), patch.object(
+            server.graylog_client,
+            "list_streams",
+            new=AsyncMock(return_value=[{"id": "s1"}]),
+        ):
+            result = json.loads(asyncio.run(server.batch(request)))
+
+        assert result["failed"] == 1
+        assert result["results"] == [
+            {"op": "get_stream_info", "error": "404 Client Error"},
+            {"op": "list_streams", "result": {"streams": [{"id": "s1"}]}},
+            {"op": "get_stream_info", "result": {"id": "s1"}},
+        ]
+
+
+class TestQueryCostGate:
+    """Test cases for gating expensive searches."""
+
+    def test_expensive_search_is_rewritten(self):
+        """Test a search above the maximum cost runs with a narrower range."""
+        request = server.SearchLogsRequest(
+            query="message:*error*", time_range="7d", limit=1000
+        )
+        mock_search = AsyncMock(return_value={"messages": [], "total_results": 0})
+        with patch.object(server.graylog_client, "search_logs", new=mock_search):
+            result = json.loads(asyncio.run(server.search_logs(request)))
+
+        # Lowering the limit brings the cost under the maximum, so the range stays
+        params = mock_search.call_args[0][0]
+        assert params.limit == 595
+        assert params.time_range == "7d"
+        assert result["query_cost"]["rewritten"] == {"limit": {"from": 1000, "to": 595}}
+
+    def test_range_is_narrowed_when_needed(self):
+        """Test the time range shrinks once the limit is at its floor."""
+        request = server.SearchLogsRequest(
+            query="message:/err.*/", time_range="60d", limit=100
+        )
+        mock_search = AsyncMock(return_value={"messages": [], "total_results": 0})
+        with patch.object(server.graylog_client, "search_logs", new=mock_search):
+            result = json.loads(asyncio.run(server.search_logs(request)))
+
+        assert mock_search.call_args[0][0].time_range == "1000h"
+        assert result["query_cost"]["rewritten"]["time_range"] == {
+            "from": "60d",
+            "to": "1000h",
+        }
+
+    def test_expensive_search_is_rejected(self):
+        """Test reject mode returns an error without searching."""
+        request = server.SearchLogsRequest(
+            query="message:*error*", time_range="7d", limit=1000
+        )
+        mock_search = AsyncMock()
+        with patch.object(
+            server.config.graylog, "query_cost_action", "reject"
+        ), patch.object(server.graylog_client, "search_logs", new=mock_search):
+            result = json.loads(asyncio.run(server.search_logs(request)))
+
+        mock_search.assert_not_called()
+        assert "too expensive" in result["error"]
+
+    def test_expensive_search_is_probed(self):
+        """Test probe mode counts the matches instead of fetching messages."""
+        request = server.SearchLogsRequest(
+            query="message:*error*", time_range="7d", limit=1000
+        )
+        probe = {
+            "query": "message:*error*",
+            "time_range": "7d",
+            "total_results": 900,
+            "breakdown": {"field": "source", "terms": {"nginx": 900}},
+        }
+        mock_probe = AsyncMock(return_value=probe)
+        mock_search = AsyncMock()
+        with patch.object(
+            server.config.graylog, "query_cost_action", "probe"
+        ), patch.object(
+            server.graylog_client, "probe_search", new=mock_probe
+        ), patch.object(
+            server.graylog_client, "search_logs", new=mock_search
+        ):
+            result = json.loads(asyncio.run(server.search_logs(request)))
+
+        mock_probe.assert_called_once()
+        mock_search.assert_not_called()
+        assert result["total_results"] == 900
+        assert result["messages_fetched"] is False
+        assert result["query_cost"]["probed"] is True
+
+    def test_all_messages_range_is_gated(self):
+        """Test a range of 0 (all messages) is not mistaken for a cheap search."""
+        request = server.SearchLogsRequest(
+            query="message:*error*", time_range="0h", limit=1000
+        )
+        mock_search = AsyncMock()
+        with patch.object(
+            server.config.graylog, "query_cost_action", "reject"
+        ), patch.object(server.graylog_client, "search_logs", new=mock_search):
+            result = json.loads(asyncio.run(server.search_logs(request)))
+
+        mock_search.assert_not_called()
+        assert "all messages" in result["error"]
+
+    def test_cheap_search_is_untouched(self):
+        """Test cheap searches get no cost report."""
+        request = server.SearchLogsRequest(query="level:ERROR", time_range="1h")
+        mock_search = AsyncMock(return_value={"messages": [], "total_results": 0})
+        with patch.object(server.graylog_client, "search_logs", new=mock_search):
+            result = json.loads(asyncio.run(server.search_logs(request)))
+
+        assert "query_cost" not in result
+
+
+class TestProbeMode:
+    """Test cases for count-first search_logs probes."""
+
+    def test_large_count_skips_message_fetch(self):
+        """Test messages are not fetched when the count is above the threshold."""
+        request = server.SearchLogsRequest(query="level:3", probe=True)
+        probe = {
+            "query": "level:3",
+            "time_range": "1h",
+            "total_results": 500,
+            "breakdown": {"field": "source", "terms": {"nginx": 500}},
+        }
+        mock_search = AsyncMock()
+        with patch.object(
+            server.graylog_client, "probe_search", new=AsyncMock(return_value=probe)
+        ), patch.object(server.graylog_client, "search_logs", new=mock_search):
+            result = json.loads(asyncio.run(server.search_logs(request)))
+
+        mock_search.assert_not_called()
+        assert result["total_results"] == 500
+        assert result["messages"] == []
+        assert result["messages_fetched"] is False
+        assert result["breakdown"]["terms"] == {"nginx": 500}
+        assert "fetch threshold of 50" in result["hint"]
+
+    def test_small_count_fetches_messages(self):
+        """Test messages are fetched when the count is within the threshold."""
+        request = server.SearchLogsRequest(
+            query="level:3", probe=True, fetch_threshold=10
+        )
+        probe = {
+            "query": "level:3",
+            "time_range": "1h",
+            "total_results": 2,
+            "breakdown": {"field": "source", "terms": {"api": 2}},
+        }
+        mock_search = AsyncMock(
+            return_value={"messages": [{"message": {"message": "boom"}}] * 2}
+        )
+        with patch.object(
+            server.graylog_client, "probe_search", new=AsyncMock(return_value=probe)
+        ), patch.object(server.graylog_client, "search_logs", new=mock_search):
+            result = json.loads(asyncio.run(server.search_logs(request)))
+
+        mock_search.assert_called_once()
+        assert len(result["messages"]) == 2
+        assert result["messages_fetched"] is True
+        assert result["breakdown"]["terms"] == {"api": 2}
+
+
+class TestLastEvent:
+    """Test cases for get_last_event_from_stream."""
+
+    def test_walks_newest_first(self):
+        """Test the last event is fetched with a newest-first walk."""
+        result = {
+            "messages": [{"message": {"message": "last"}}],
+            "total_results": 9,
+            "walk": {"windows": 1, "searched_from": "x", "complete": False},
+        }
+        mock_walk = AsyncMock(return_value=result)
+        with patch.object(server.graylog_client, "search_newest_first", new=mock_walk):
+            response = json.loads(
+                asyncio.run(server.get_last_event_from_stream("stream-1", "7d"))
+            )
+
+        params = mock_walk.call_args[0][0]
+        assert params.stream_id == "stream-1"
+        assert params.limit == 1
+        assert response["messages"] == [{"message": "last"}]
+        assert response["walk"]["windows"] == 1
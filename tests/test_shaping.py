@@ -0,0 +1,158 @@
+"""Tests for search result shaping."""
+
+import copy
+
+from mcp_graylog.shaping import (
+    apply_budget,
+    project_message,
+    slim_search_result,
+    truncate_text,
+)
+
+ENVELOPE = {
+    "highlight_ranges": {},
+    "index": "graylog_42",
+    "decoration_stats": None,
+    "message": {
+        "_id": "abc",
+        "timestamp": "2024-01-01T12:00:00.000Z",
+        "source": "web-01",
+        "level": 3,
+        "message": "upstream timed out",
+        "gl2_message_id": "01H",
+        "gl2_source_input": "input-1",
+    },
+}
+
+RESULT = {
+    "query": "level:ERROR",
+    "built_query": "{...}",
+    "used_indices": [{"index_name": "graylog_42"}],
+    "fields": ["timestamp", "source", "level", "message"],
+    "time": 12,
+    "total_results": 1,
+    "from": "2024-01-01T11:00:00.000Z",
+    "to": "2024-01-01T12:00:00.000Z",
+    "messages": [ENVELOPE],
+}
+
+
+class TestTruncateText:
+    """Test cases for truncate_text function."""
+
+    def test_short_text_unchanged(self):
+        """Test text within the limit is returned as-is."""
+        assert truncate_text("short", 100) == "short"
+
+    def test_long_text_truncated_with_marker(self):
+        """Test long text is cut and marked with the dropped byte count."""
+        assert truncate_text("a" * 50, 10) == "a" * 10 + "...[truncated 40 bytes]"
+
+    def test_multibyte_boundary(self):
+        """Test truncation never splits a multi-byte character."""
+        result = truncate_text("é" * 10, 5)
+        assert result == "éé...[truncated 16 bytes]"
+
+
+class TestProjectMessage:
+    """Test cases for project_message function."""
+
+    def test_unwraps_envelope_and_drops_internals(self):
+        """Test envelopes are unwrapped and gl2_ fields removed."""
+        projected = project_message(ENVELOPE)
+
+        assert "index" not in projected
+        assert "gl2_message_id" not in projected
+        assert projected["source"] == "web-01"
+
+    def test_enforces_requested_fields(self):
+        """Test only requested fields are kept."""
+        projected = project_message(ENVELOPE, fields=["message", "level", "missing"])
+        assert projected == {"message": "upstream timed out", "level": 3}
+
+    def test_truncates_message_body(self):
+        """Test message bodies are truncated."""
+        projected = project_message(ENVELOPE, fields=["message"], max_message_bytes=8)
+        assert projected["message"] == "upstream...[truncated 10 bytes]"
+
+
+class TestSlimSearchResult:
+    """Test cases for slim_search_result function."""
+
+    def test_strips_response_metadata(self):
+        """Test response internals are removed and summary keys kept."""
+        slimmed = slim_search_result(RESULT, fields=["message"])
+
+        assert slimmed == {
+            "query": "level:ERROR",
+            "total_results": 1,
+            "time": 12,
+            "from": "2024-01-01T11:00:00.000Z",
+            "to": "2024-01-01T12:00:00.000Z",
+            "messages": [{"message": "upstream timed out"}],
+        }
+
+    def test_does_not_modify_input(self):
+        """Test the raw (possibly cached) response is left untouched."""
+        original = copy.deepcopy(RESULT)
+        slim_search_result(RESULT, fields=["message"], max_message_bytes=4)
+        assert RESULT == original
+
+
+class TestApplyBudget:
+    """Test cases for apply_budget function."""
+
+    @staticmethod
+    def make_result(messages):
+        """Wrap messages in a slimmed search result."""
+        return {"total_results": len(messages), "messages": messages}
+
+    def test_no_budget_returns_result(self):
+        """Test results pass through when no budget is given."""
+        result = self.make_result([{"message": "a"}])
+        assert apply_budget(result) is result
+
+    def test_collapses_duplicates(self):
+        """Test messages differing only in timestamp/ID are counted."""
+        messages = [
+            {"_id": str(i), "timestamp": f"t{i}", "message": "timeout"}
+            for i in range(5)
+        ] + [{"_id": "x", "timestamp": "t9", "message": "refused"}]
+
+        fitted = apply_budget(self.make_result(messages), max_output_bytes=10000)
+
+        assert [m["message"] for m in fitted["messages"]] == ["timeout", "refused"]
+        assert fitted["messages"][0]["_count"] == 5
+        assert "_count" not in fitted["messages"][1]
+        assert fitted["budget"]["duplicates_collapsed"] == 4
+        assert fitted["budget"]["omitted_messages"] == 0
+
+    def test_truncates_to_share_of_budget(self):
+        """Test long bodies are cut to an equal share of the budget."""
+        messages = [{"message": f"{i} " + "x" * 5000} for i in range(4)]
+
+        fitted = apply_budget(self.make_result(messages), max_output_bytes=2000)
+
+        assert len(fitted["messages"]) == 4
+        assert all(len(m["message"]) < 600 for m in fitted["messages"])
+        assert fitted["budget"]["truncated_messages"] == 4
+        assert fitted["budget"]["used_bytes"] <= 2000
+
+    def test_omits_messages_over_budget(self):
+        """Test messages beyond the budget are omitted and reported."""
+        messages = [{"message": f"distinct message {i}"} for i in range(100)]
+
+        fitted = apply_budget(self.make_result(messages), max_tokens=100)
+
+        budget = fitted["budget"]
+        assert budget["max_output_bytes"] == 400
+        assert budget["used_bytes"] <= 400
+        assert budget["messages_out"] == len(fitted["messages"])
+        assert budget["messages_out"] + budget["omitted_messages"] == 100
+
+    def test_smallest_budget_wins(self):
+        """Test the tighter of bytes and tokens budgets applies."""
+        fitted = apply_budget(
+            self.make_result([]), max_output_bytes=1000, max_tokens=100
+        )
+        assert fitted["budget"]["max_output_bytes"] == 400
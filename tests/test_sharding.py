@@ -0,0 +1,201 @@
+"""Tests for splitting long searches into windows."""
+
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from mcp_graylog.sharding import (
+    iter_completed,
+    merge_aggregations,
+    merge_histograms,
+    merge_search_results,
+    merge_stats,
+    merge_terms,
+    newest_first_windows,
+    split_window,
+)
+
+
+class TestSplitWindow:
+    """Test splitting an absolute range at aligned boundaries."""
+
+    def test_aligned_days(self):
+        """Test the first and last windows are cut at day boundaries."""
+        windows = split_window("2024-01-01T18:00:00Z", "2024-01-03T06:00:00Z")
+
+        assert windows == [
+            ("2024-01-01T18:00:00.000Z", "2024-01-01T23:59:59.999Z"),
+            ("2024-01-02T00:00:00.000Z", "2024-01-02T23:59:59.999Z"),
+            ("2024-01-03T00:00:00.000Z", "2024-01-03T06:00:00.000Z"),
+        ]
+
+    def test_within_one_window(self):
+        """Test a range inside one aligned window is not split."""
+        windows = split_window("2024-01-01T01:00:00Z", "2024-01-01T02:00:00Z")
+
+        assert windows == [("2024-01-01T01:00:00.000Z", "2024-01-01T02:00:00.000Z")]
+
+    def test_hourly(self):
+        """Test a custom alignment."""
+        windows = split_window("2024-01-01T00:00:00Z", "2024-01-01T03:00:00Z", 3600)
+
+        assert len(windows) == 3
+        assert windows[1] == ("2024-01-01T01:00:00.000Z", "2024-01-01T01:59:59.999Z")
+
+    def test_boundary_in_one_window(self):
+        """Test inclusive windows never share a timestamp."""
+        windows = split_window("2024-01-01T12:00:00Z", "2024-01-04T00:00:00Z")
+
+        boundary = "2024-01-02T00:00:00.000Z"
+        assert sum(1 for a, b in windows if a <= boundary <= b) == 1
+        assert all(a < b for a, b in windows)
+
+    def test_no_empty_window_after_start(self):
+        """Test a start 1 ms before a boundary does not produce an empty window."""
+        windows = split_window("2024-01-01T23:59:59.999Z", "2024-01-04T00:00:00Z")
+
+        assert windows[0] == ("2024-01-01T23:59:59.999Z", "2024-01-02T23:59:59.999Z")
+        assert all(a < b for a, b in windows)
+
+
+class TestNewestFirstWindows:
+    """Test walking back from the end of a range."""
+
+    def test_geometric_growth(self):
+        """Test windows grow by the growth factor and stop at the start."""
+        windows = list(
+            newest_first_windows("2024-01-01T00:00:00Z", "2024-01-01T01:00:00Z", 300)
+        )
+
+        assert windows == [
+            ("2024-01-01T00:55:00.000Z", "2024-01-01T01:00:00.000Z"),
+            ("2024-01-01T00:35:00.000Z", "2024-01-01T00:54:59.999Z"),
+            ("2024-01-01T00:00:00.000Z", "2024-01-01T00:34:59.999Z"),
+        ]
+
+    def test_no_empty_window_at_start(self):
+        """Test a 1 ms remnant at the start is absorbed into the last window."""
+        windows = list(
+            newest_first_windows(
+                "2024-01-01T00:54:59.999Z", "2024-01-01T01:00:00Z", 300
+            )
+        )
+
+        assert windows == [("2024-01-01T00:54:59.999Z", "2024-01-01T01:00:00.000Z")]
+
+
+class TestIterCompleted:
+    """Test running windows concurrently."""
+
+    def test_results_and_errors(self):
+        """Test every window yields its result or its exception."""
+
+        def func(from_, to):
+            if from_ == "b":
+                raise RuntimeError("boom")
+            return from_ + to
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            results = dict(iter_completed(executor, [("a", "1"), ("b", "2")], func))
+
+        assert results[("a", "1")] == "a1"
+        assert isinstance(results[("b", "2")], RuntimeError)
+
+    def test_context_is_copied(self):
+        """Test windows see the caller's context variables."""
+        var = contextvars.ContextVar("var", default=None)
+        token = var.set("caller")
+        try:
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                results = list(
+                    iter_completed(executor, [("a", "b")], lambda f, t: var.get())
+                )
+        finally:
+            var.reset(token)
+
+        assert results == [(("a", "b"), "caller")]
+
+
+class TestMerge:
+    """Test merging the results of windows."""
+
+    def test_search_results(self):
+        """Test messages are merged by timestamp and totals summed."""
+        results = [
+            {
+                "messages": [
+                    {"message": {"timestamp": "2024-01-02T02:00:00.000Z"}},
+                    {"message": {"timestamp": "2024-01-02T01:00:00.000Z"}},
+                ],
+                "total_results": 10,
+            },
+            {
+                "messages": [{"message": {"timestamp": "2024-01-01T05:00:00.000Z"}}],
+                "total_results": 4,
+            },
+        ]
+
+        merged = merge_search_results(results, offset=1, limit=2)
+
+        assert merged["total_results"] == 14
+        assert [m["message"]["timestamp"] for m in merged["messages"]] == [
+            "2024-01-02T01:00:00.000Z",
+            "2024-01-01T05:00:00.000Z",
+        ]
+
+    def test_terms(self):
+        """Test term counts are summed and other terms accounted for."""
+        results = [
+            {"terms": {"a": 5, "b": 3}, "missing": 1, "other": 0, "total": 9},
+            {"terms": {"b": 4, "c": 1}, "missing": 0, "other": 2, "total": 7},
+        ]
+
+        merged = merge_terms(results, size=2)
+
+        assert merged["terms"] == {"b": 7, "a": 5}
+        assert merged["missing"] == 1
+        assert merged["total"] == 16
+        assert merged["other"] == 3
+        assert merged["exact"] is False
+
+    def test_histograms(self):
+        """Test a bucket cut by a window boundary is summed."""
+        results = [
+            {"interval": "hour", "results": {"100": 2, "200": 3}, "time": 5},
+            {"interval": "hour", "results": {"200": 1, "300": 4}, "time": 7},
+        ]
+
+        merged = merge_histograms(results)
+
+        assert merged == {
+            "interval": "hour",
+            "results": {"100": 2, "200": 4, "300": 4},
+        }
+
+    def test_stats(self):
+        """Test statistics are combined as if computed in one request."""
+        left, right = [1.0, 2.0, 3.0], [10.0]
+
+        def stats(values):
+            return {
+                "count": len(values),
+                "sum": sum(values),
+                "sum_of_squares": sum(v * v for v in values),
+                "min": min(values),
+                "max": max(values),
+            }
+
+        merged = merge_stats([stats(left), stats(right), {"count": 0}])
+
+        assert merged["count"] == 4
+        assert merged["min"] == 1.0
+        assert merged["max"] == 10.0
+        assert merged["mean"] == pytest.approx(4.0)
+        assert merged["variance"] == pytest.approx(12.5)
+        assert merged["std_deviation"] == pytest.approx(12.5**0.5)
+
+    def test_unsupported_aggregation(self):
+        """Test aggregations without an exact merge are rejected."""
+        with pytest.raises(ValueError, match="cardinality"):
+            merge_aggregations("cardinality", [], 10)
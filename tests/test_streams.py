@@ -0,0 +1,133 @@
+"""Tests for the stream catalog."""
+
+from unittest.mock import Mock
+
+import pytest
+
+from mcp_graylog.streams import StreamCatalog, StreamIndex, title_trigrams
+
+STREAMS = [
+    {"id": "1", "title": "nginx_access_logs"},
+    {"id": "2", "title": "Nginx Error Logs"},
+    {"id": "3", "title": "1c_eventlog"},
+    {"id": "4", "title": "api"},
+]
+
+
+def make_response(streams=None, status_code=200, headers=None):
+    """Create a mock /api/streams response."""
+    response = Mock()
+    response.status_code = status_code
+    response.headers = headers or {}
+    response.json.return_value = {"streams": streams or []}
+    return response
+
+
+class TestStreamIndex:
+    """Test cases for StreamIndex."""
+
+    @pytest.fixture
+    def index(self):
+        """Create an index over the sample streams."""
+        return StreamIndex(STREAMS)
+
+    def test_title_trigrams(self):
+        """Test trigram extraction."""
+        assert title_trigrams("api") == {"api"}
+        assert title_trigrams("ab") == set()
+        assert title_trigrams("nginx") == {"ngi", "gin", "inx"}
+
+    def test_search_case_insensitive(self, index):
+        """Test search matches titles regardless of case."""
+        result = index.search("NGINX")
+        assert [s["id"] for s in result] == ["1", "2"]
+
+    def test_search_substring(self, index):
+        """Test search matches inside titles."""
+        assert [s["id"] for s in index.search("error")] == ["2"]
+        assert [s["id"] for s in index.search("eventlog")] == ["3"]
+
+    def test_search_short_term(self, index):
+        """Test terms shorter than a trigram fall back to a scan."""
+        assert [s["id"] for s in index.search("1c")] == ["3"]
+
+    def test_search_trigram_false_positive(self, index):
+        """Test trigram candidates are verified with a substring check."""
+        assert index.search("nginx_error") == []
+
+    def test_by_id(self, index):
+        """Test lookup by stream ID."""
+        assert index.by_id["4"]["title"] == "api"
+
+    def test_match_pattern(self, index):
+        """Test shell-style patterns match whole titles case-insensitively."""
+        assert [s["id"] for s in index.match("nginx*")] == ["1", "2"]
+        assert [s["id"] for s in index.match("*logs")] == ["1", "2"]
+        assert index.match("ngin") == []
+
+
+class TestStreamCatalog:
+    """Test cases for StreamCatalog."""
+
+    @pytest.fixture
+    def client(self):
+        """Create a mock Graylog client."""
+        client = Mock()
+        client._http_request.return_value = make_response(
+            STREAMS, headers={"ETag": '"v1"'}
+        )
+        return client
+
+    @pytest.fixture
+    def catalog(self, client, clock):
+        """Create a catalog without background refresh."""
+        return StreamCatalog(client, ttl=60, refresh_interval=0, clock=clock)
+
+    def test_search_loads_once(self, catalog, client):
+        """Test repeated searches reuse the cached catalog."""
+        catalog.search("nginx")
+        catalog.search("api")
+
+        client._http_request.assert_called_once_with(
+            "GET", "/api/streams", headers=None
+        )
+
+    def test_stale_catalog_revalidates_with_etag(self, catalog, client, clock):
+        """Test stale catalogs send If-None-Match and keep data on 304."""
+        catalog.search("nginx")
+        clock.now = 61
+        client._http_request.return_value = make_response(status_code=304)
+
+        result = catalog.search("nginx")
+
+        assert len(result) == 2
+        client._http_request.assert_called_with(
+            "GET", "/api/streams", headers={"If-None-Match": '"v1"'}
+        )
+        assert catalog.stats()["not_modified"] == 1
+        assert catalog.is_fresh() is True
+
+    def test_get_only_when_fresh(self, catalog, clock):
+        """Test lookups by ID are only served from a fresh catalog."""
+        assert catalog.get("1") is None
+
+        catalog.streams()
+        assert catalog.get("1")["title"] == "nginx_access_logs"
+
+        clock.now = 61
+        assert catalog.get("1") is None
+
+    def test_refresh_failure_serves_stale(self, catalog, client, clock):
+        """Test a failed refresh keeps serving the previous snapshot."""
+        catalog.streams()
+        clock.now = 61
+        client._http_request.side_effect = Exception("Connection failed")
+
+        assert len(catalog.streams()) == 4
+
+    def test_initial_load_failure_raises(self, catalog, client):
+        """Test errors propagate when no snapshot exists yet."""
+        client._http_request.side_effect = Exception("Connection failed")
+
+        with pytest.raises(Exception, match="Connection failed"):
+            catalog.search("nginx")
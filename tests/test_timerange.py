@@ -0,0 +1,103 @@
+"""Tests for time range parsing."""
+
+import pytest
+
+from mcp_graylog.timerange import (
+    parse_time_range,
+    pin_time_range,
+    range_type,
+    span_seconds,
+    views_timerange,
+)
+
+# 2024-01-01T12:00:00Z
+NOW = 1704110400.0
+
+
+class TestParseTimeRange:
+    """Test parsing relative, absolute and keyword ranges."""
+
+    def test_relative(self):
+        """Test relative ranges become seconds."""
+        assert parse_time_range("15m") == {"range": 900}
+        assert parse_time_range("2w") == {"range": 1209600}
+
+    def test_interval(self):
+        """Test a from..to interval is normalized to UTC milliseconds."""
+        parsed = parse_time_range("2024-01-01T10:00:00+01:00..2024-01-01T09:20:00")
+        assert parsed == {
+            "from": "2024-01-01T09:00:00.000Z",
+            "to": "2024-01-01T09:20:00.000Z",
+        }
+        assert range_type(parsed) == "absolute"
+        assert span_seconds(parsed) == 1200
+
+    def test_start_time_until_now(self):
+        """Test a single timestamp searches from then until now."""
+        parsed = parse_time_range("2024-01-01T11:00:00Z", now=NOW)
+        assert parsed == {
+            "from": "2024-01-01T11:00:00.000Z",
+            "to": "2024-01-01T12:00:00.000Z",
+        }
+
+    def test_keyword(self):
+        """Test keyword ranges are passed through."""
+        parsed = parse_time_range("keyword:last monday")
+        assert parsed == {"keyword": "last monday"}
+        assert range_type(parsed) == "keyword"
+        assert span_seconds(parsed) is None
+
+    def test_invalid(self):
+        """Test unrecognized, reversed and empty keyword ranges are rejected."""
+        with pytest.raises(ValueError, match="Invalid time range format"):
+            parse_time_range("1 hour")
+        with pytest.raises(ValueError, match="must start before"):
+            parse_time_range("2024-01-02T00:00:00Z..2024-01-01T00:00:00Z")
+        with pytest.raises(ValueError, match="cannot be empty"):
+            parse_time_range("keyword:")
+
+    def test_empty(self):
+        """Test empty ranges parse to nothing."""
+        assert parse_time_range("") == {}
+        assert parse_time_range(None) == {}
+
+
+class TestPinTimeRange:
+    """Test fixing relative ranges to absolute windows."""
+
+    def test_relative_is_pinned(self):
+        """Test a relative range becomes the window ending now."""
+        assert (
+            pin_time_range("1h", now=NOW)
+            == "2024-01-01T11:00:00.000Z..2024-01-01T12:00:00.000Z"
+        )
+
+    def test_all_messages_range_starts_at_epoch(self):
+        """Test a range of 0 is pinned to every message up to now."""
+        pinned = pin_time_range("0s", now=NOW)
+
+        assert pinned == "1970-01-01T00:00:00.000Z..2024-01-01T12:00:00.000Z"
+        assert parse_time_range(pinned)["from"] == "1970-01-01T00:00:00.000Z"
+
+    def test_other_ranges_unchanged(self):
+        """Test absolute and keyword ranges are kept."""
+        assert pin_time_range("keyword:yesterday") == "keyword:yesterday"
+        window = "2024-01-01T10:00:00Z..2024-01-01T10:20:00Z"
+        assert pin_time_range(window) == window
+
+
+class TestViewsTimerange:
+    """Test Views API timerange objects."""
+
+    def test_each_type(self):
+        """Test every range type maps to a Views timerange."""
+        assert views_timerange({"range": 60}) == {"type": "relative", "range": 60}
+        assert views_timerange({"from": "a", "to": "b"}) == {
+            "type": "absolute",
+            "from": "a",
+            "to": "b",
+        }
+        assert views_timerange({"keyword": "today"}) == {
+            "type": "keyword",
+            "keyword": "today",
+        }
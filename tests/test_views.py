@@ -0,0 +1,133 @@
+"""Tests for compiling aggregations into Views searches."""
+
+import pytest
+
+from mcp_graylog.client import AggregationParams
+from mcp_graylog.views import build_views_search, split_views_result, views_total
+
+METRICS = {
+    "by_level": AggregationParams(type="terms", field="level", size=5),
+    "per_hour": AggregationParams(
+        type="date_histogram", field="timestamp", interval="hour"
+    ),
+    "hosts": AggregationParams(type="cardinality", field="source"),
+    "took": AggregationParams(type="stats", field="took_ms"),
+}
+
+RESPONSE = {
+    "results": {
+        "query": {
+            "search_types": {
+                "pivot-0": {
+                    "total": 120,
+                    "rows": [
+                        {
+                            "key": ["6"],
+                            "source": "leaf",
+                            "values": [{"key": ["count()"], "value": 100}],
+                        },
+                        {
+                            "key": ["3"],
+                            "source": "leaf",
+                            "values": [{"key": ["count()"], "value": 20}],
+                        },
+                        {
+                            "key": [],
+                            "source": "non-leaf",
+                            "values": [{"key": ["count()"], "value": 120}],
+                        },
+                    ],
+                },
+                "metrics": {
+                    "total": 120,
+                    "rows": [
+                        {
+                            "key": [],
+                            "source": "leaf",
+                            "values": [
+                                {"key": ["card(source)"], "value": 7},
+                                {"key": ["count(took_ms)"], "value": 90},
+                                {"key": ["min(took_ms)"], "value": 1},
+                                {"key": ["max(took_ms)"], "value": 900},
+                                {"key": ["avg(took_ms)"], "value": 42.5},
+                                {"key": ["sum(took_ms)"], "value": 3825},
+                            ],
+                        }
+                    ],
+                },
+            },
+            "errors": [{"search_type_id": "pivot-1", "description": "Field not found"}],
+        }
+    }
+}
+
+
+class TestBuildViewsSearch:
+    """Test request compilation."""
+
+    def test_one_query_with_shared_metrics_pivot(self):
+        """Test bucket aggregations get a pivot each and metrics share one."""
+        body, plan = build_views_search("*", 86400, METRICS, ["s1"])
+
+        query = body["queries"][0]
+        assert query["timerange"] == {"type": "relative", "range": 86400}
+        assert query["filter"]["filters"] == [{"type": "stream", "id": "s1"}]
+        assert [t["id"] for t in query["search_types"]] == [
+            "pivot-0",
+            "pivot-1",
+            "metrics",
+        ]
+        assert plan == {
+            "by_level": "pivot-0",
+            "per_hour": "pivot-1",
+            "hosts": "metrics",
+            "took": "metrics",
+        }
+
+    def test_row_groups_and_series(self):
+        """Test terms, histogram and metric series are compiled."""
+        body, _ = build_views_search("*", 3600, METRICS)
+        terms, histogram, metrics = body["queries"][0]["search_types"]
+
+        assert terms["row_groups"] == [{"type": "values", "field": "level", "limit": 5}]
+        assert histogram["row_groups"][0]["interval"] == {
+            "type": "timeunit",
+            "timeunit": "1h",
+        }
+        assert [s["id"] for s in metrics["series"]] == [
+            "card(source)",
+            "count(took_ms)",
+            "min(took_ms)",
+            "max(took_ms)",
+            "avg(took_ms)",
+            "sum(took_ms)",
+        ]
+        assert "filter" not in body["queries"][0]
+
+    def test_unsupported_type(self):
+        """Test unknown aggregation types are rejected."""
+        with pytest.raises(ValueError, match="Unsupported aggregation type"):
+            build_views_search(
+                "*", 60, {"x": AggregationParams(type="median", field="f")}
+            )
+
+
+class TestSplitViewsResult:
+    """Test splitting responses back into metrics."""
+
+    def test_split(self):
+        """Test each metric is read from its pivot."""
+        _, plan = build_views_search("*", 3600, METRICS)
+        split = split_views_result(RESPONSE, METRICS, plan)
+
+        assert split["by_level"]["terms"] == {"6": 100, "3": 20}
+        assert split["by_level"]["total"] == 120
+        assert split["hosts"]["cardinality"] == 7
+        assert split["took"]["avg"] == 42.5
+        assert split["took"]["count"] == 90
+        assert split["per_hour"]["error"] == "Field not found"
+
+    def test_views_total(self):
+        """Test the message count is read from any pivot."""
+        assert views_total(RESPONSE) == 120
+        assert views_total({}) is None